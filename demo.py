@@ -7,11 +7,9 @@ from PySide6.QtWidgets import (
     QGridLayout,
 )
 
-from src.basicSliderVerification import VerificationFlyout as NormalVerificationFlyout
-from src.figureSliderVerification import VerificationFlyout as FigureVerificationFlyout
-from src.circleSliderVerification import VerificationFlyout as CircleVerificationFlyout
-from src.textClickVerification import VerificationFlyout as TextClickVerificationFlyout
-from src.iconClickVerification import VerificationFlyout as IconClickVerificationFlyout
+import src
+from src.components.images import RANDOM_IMAGE_URL
+from src.components.network import preconnect
 
 
 class Demo(QWidget):
@@ -44,32 +42,35 @@ class Demo(QWidget):
 
     def showNormalVer(self):
 
-        a = NormalVerificationFlyout.create(target=self.sender(), parent=self)
+        a = src.create("basic", target=self.sender(), parent=self)
         a.success.connect(lambda: print("普通滑动验证码验证成功"))
 
     def showFigureVer(self):
 
-        a = FigureVerificationFlyout.create(target=self.sender(), parent=self)
+        a = src.create("figure", target=self.sender(), parent=self)
         a.success.connect(lambda: print("形状滑动验证码验证成功"))
 
     def showCircleVer(self):
 
-        a = CircleVerificationFlyout.create(target=self.sender(), parent=self)
+        a = src.create("circle", target=self.sender(), parent=self)
         a.success.connect(lambda: print("圆形滑动验证码验证成功"))
 
     def showTextClickVer(self):
 
-        a = TextClickVerificationFlyout.create(target=self.sender(), parent=self)
+        a = src.create("textClick", target=self.sender(), parent=self)
         a.success.connect(lambda: print("文字点选验证码验证成功"))
 
     def showIconClickVer(self):
 
-        a = IconClickVerificationFlyout.create(target=self.sender(), parent=self)
+        a = src.create("iconClick", target=self.sender(), parent=self)
         a.success.connect(lambda: print("图标点选验证码验证成功"))
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    preconnect(RANDOM_IMAGE_URL)
+    for kind in src.KINDS:
+        src.prewarm(kind)
     demo = Demo()
     demo.show()
     sys.exit(app.exec())
@@ -0,0 +1,4 @@
+# 顶层包只导入类型注册表，不导入 PySide6；各验证码类型在 create() 时按需导入
+from .registry import KINDS, create, flyoutClass, prewarm, registerKind
+
+__all__ = ["KINDS", "create", "flyoutClass", "prewarm", "registerKind"]
@@ -1,33 +1,19 @@
-import sys
-import time
-import random
 from random import randint
-from math import sqrt
 from typing import List
 
-from PySide6.QtWidgets import (
-    QApplication,
-    QWidget,
-    QLabel,
-    QSlider,
-    QStyle,
-    QStyleOptionSlider,
-    QMessageBox,
-    QVBoxLayout,
-    QHBoxLayout,
-)
+from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import (
     Qt,
     QPropertyAnimation,
     QEasingCurve,
-    Signal,
     QPoint,
-    QSize,
     QRectF,
     QRect,
     Property,
 )
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor, QFont, QPen, QPainterPath
+from PySide6.QtGui import QPixmap, QPainter, QColor, QPen, QPainterPath
+
+from src.components.dirty import drawDirtyRects, touchesCorners, updateMoved
 
 
 class VerificationImage(QWidget):
@@ -63,10 +49,11 @@ class VerificationImage(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        path = QPainterPath()
-        rect = QRectF(0, 0, self._width, self._height)
-        path.addRoundedRect(rect, 5, 5)
-        painter.setClipPath(path)
+        if touchesCorners(event.rect(), self._width, self._height, 5):
+            path = QPainterPath()
+            rect = QRectF(0, 0, self._width, self._height)
+            path.addRoundedRect(rect, 5, 5)
+            painter.setClipPath(path)
         painter.drawPixmap(QPoint(0, 0), self.currentImage)
 
         shadowPixmap = self.currentImage.copy(self.pixmapX, self.pixmapY, 35, 35)
@@ -86,13 +73,19 @@ class VerificationImage(QWidget):
         movePainter.end()
         painter.drawPixmap(QPoint(self._moveX, self.pixmapY), movePixmap)
 
+        drawDirtyRects(painter, event)
+
         super().paintEvent(event)
 
     def setMoveX(self, mapped_value):
 
         internal_value = int(mapped_value * 266 / 300)
+        oldRect = self.pieceRect()
         self._moveX = 1 + internal_value
-        self.update()
+        updateMoved(self, oldRect, self.pieceRect())
+
+    def pieceRect(self):
+        return QRect(self._moveX, self.pixmapY, 35, 35).adjusted(-1, -1, 1, 1)
 
     def getMoveX(self):
         return self._moveX
@@ -1,39 +1,26 @@
-import sys
-import time
-import random
 from random import randint
-from math import sqrt
-from typing import List, Optional
-
-from PySide6.QtWidgets import (
-    QApplication,
-    QWidget,
-    QLabel,
-    QSlider,
-    QStyle,
-    QStyleOptionSlider,
-    QMessageBox,
-    QVBoxLayout,
-    QHBoxLayout,
-)
+
+from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import (
     Qt,
+    Signal,
     QPropertyAnimation,
     QEasingCurve,
-    Signal,
     QPoint,
-    QSize,
     QRectF,
     QRect,
     Property,
-    QUrl,
-    QByteArray,
 )
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor, QFont, QPen, QPainterPath
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PySide6.QtGui import QPixmap, QPainter, QColor, QFont, QPen, QPainterPath
+
+from src.components.dirty import drawDirtyRects, touchesCorners, updateMoved
+from src.components.images import RANDOM_IMAGE_URL, imagePool
 
 
 class VerificationImage(QWidget):
+
+    imageLoaded = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
 
@@ -41,9 +28,6 @@ class VerificationImage(QWidget):
         self._height = 169
         self.setFixedSize(self._width, self._height)
 
-        self.network_manager = QNetworkAccessManager(self)
-        self.network_manager.finished.connect(self.on_image_downloaded)
-
         self.currentImage = QPixmap(self._width, self._height)
         self.currentImage.fill(QColor(200, 200, 200))
 
@@ -53,42 +37,29 @@ class VerificationImage(QWidget):
 
         self.loading = True
 
-        self.load_image_from_url("https://api.elaina.cat/random/pc")
+        self.load_image_from_url(RANDOM_IMAGE_URL)
 
     def load_image_from_url(self, url: str):
 
         self.loading = True
         self.update()
-        request = QNetworkRequest(QUrl(url))
-        self.network_manager.get(request)
+        imagePool(url).request(self.on_image_loaded)
 
-    def on_image_downloaded(self, reply: QNetworkReply):
+    def on_image_loaded(self, image, error):
 
-        if reply.error() != QNetworkReply.NetworkError.NoError:
-            print(f"网络错误: {reply.errorString()}，使用本地图片备选")
+        if image is None:
+            print(f"{error}，使用本地图片备选")
             self.fallback_to_local_image()
         else:
 
-            data = reply.readAll()
-            pixmap = QPixmap()
-            if not pixmap.loadFromData(data):
-                print("图片数据解析失败，使用本地图片备选")
-                self.fallback_to_local_image()
-            else:
-
-                self.currentImage = pixmap.scaled(
-                    self._width,
-                    self._height,
-                    Qt.AspectRatioMode.IgnoreAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
+            self.currentImage = QPixmap.fromImage(image)
 
-                self.pixmapX = randint(50, self._width - 35 - 1)
-                self.pixmapY = randint(40, self._height - 35 - 1)
-                self.loading = False
-                self.update()
+            self.pixmapX = randint(50, self._width - 35 - 1)
+            self.pixmapY = randint(40, self._height - 35 - 1)
+            self.loading = False
+            self.update()
 
-        reply.deleteLater()
+        self.imageLoaded.emit()
 
     def fallback_to_local_image(self):
 
@@ -104,10 +75,11 @@ class VerificationImage(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        path = QPainterPath()
-        rect = QRectF(0, 0, self._width, self._height)
-        path.addRoundedRect(rect, 5, 5)
-        painter.setClipPath(path)
+        if touchesCorners(event.rect(), self._width, self._height, 5):
+            path = QPainterPath()
+            rect = QRectF(0, 0, self._width, self._height)
+            path.addRoundedRect(rect, 5, 5)
+            painter.setClipPath(path)
         painter.drawPixmap(QPoint(0, 0), self.currentImage)
 
         shadowPixmap = self.currentImage.copy(self.pixmapX, self.pixmapY, 35, 35)
@@ -140,12 +112,18 @@ class VerificationImage(QWidget):
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "加载中...")
             painter.restore()
 
+        drawDirtyRects(painter, event)
+
         super().paintEvent(event)
 
     def setMoveX(self, mapped_value):
         internal_value = int(mapped_value * 266 / 300)
+        oldRect = self.pieceRect()
         self._moveX = 1 + internal_value
-        self.update()
+        updateMoved(self, oldRect, self.pieceRect())
+
+    def pieceRect(self):
+        return QRect(self._moveX, self.pixmapY, 35, 35).adjusted(-1, -1, 1, 1)
 
     def getMoveX(self):
         return self._moveX
@@ -174,4 +152,4 @@ class VerificationImage(QWidget):
             self.animation.deleteLater()
             delattr(self, "animation")
 
-        self.load_image_from_url("https://api.elaina.cat/random/pc")
+        self.load_image_from_url(RANDOM_IMAGE_URL)
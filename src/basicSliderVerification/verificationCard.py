@@ -1,20 +1,13 @@
-from typing import Optional, Union
+from typing import Optional
 
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
 )
 
-from PySide6.QtCore import (
-    QTimer,
-    Signal,
-    QPoint,
-)
-from src.components.flyout import (
-    Flyout,
-    FlyoutView,
-    PullUpFlyoutAnimationManager,
-)
+from PySide6.QtCore import Signal
+from src.components.flyout import FlyoutView, PooledFlyout
+from src.behavior.verdict import Verdict
 from src.components.slider import VerificationSlider
 
 from .url_image import VerificationImage
@@ -38,15 +31,15 @@ class VerificationCard(QWidget):
         self.vBoxLayout.addWidget(self.verifySlider)
 
         self.verifySlider.valueChanged.connect(self.verifyImage.setMoveX)
-        self.verifySlider.resultSignal.connect(self.verify)
+        self.verifySlider.verdictSignal.connect(self.verify)
 
         self.tolerance: int = 5
 
-    def verify(self, resultDict: dict) -> None:
+    def verify(self, verdict: Verdict) -> None:
 
         self.pixmapValue = self.verifyImage.getMoveX()
         self.correctValue = self.verifyImage.getCorrectValue()
-        if resultDict["result"]:
+        if verdict.result:
 
             if abs(self.pixmapValue - self.correctValue) <= self.tolerance:
                 self.verificationSuccess.emit()
@@ -62,6 +55,10 @@ class VerificationCard(QWidget):
             self.verifySlider.setSuccess(False)
             self.verifySlider.setError(True)
 
+    def reset(self) -> None:
+        self.verifySlider.reset()
+        self.verifyImage.refreshImage()
+
 
 class VerificationFlyoutView(FlyoutView):
 
@@ -83,36 +80,14 @@ class VerificationFlyoutView(FlyoutView):
         self.adjustSize()
 
 
-class VerificationFlyout(Flyout):
-
-    success = Signal()
+class VerificationFlyout(PooledFlyout):
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         view = VerificationFlyoutView()
-        super().__init__(view, parent, isDeleteOnClose=False)
+        super().__init__(view, parent)
         self.view: VerificationFlyoutView = view
         self.view.card.verificationSuccess.connect(self.closeWindow)
 
-    @classmethod
-    def create(
-        cls,
-        target: Optional[Union[QWidget, QPoint]] = None,
-        parent: Optional[QWidget] = None,
-    ) -> "VerificationFlyout":
-
-        flyout = cls(parent)
-        if target is None:
-            return flyout
-
-        flyout.show()
-        if isinstance(target, QWidget):
-            pos = PullUpFlyoutAnimationManager(flyout).position(target)
-        else:
-            pos = target
-
-        flyout.exec(pos)
-        return flyout
-
-    def closeWindow(self) -> None:
-        self.success.emit()
-        QTimer.singleShot(300, self.fadeOut)
+    def resetContent(self) -> None:
+        # 放回池中时换一道新题
+        self.view.card.reset()
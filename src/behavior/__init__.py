@@ -0,0 +1,70 @@
+from .analyzer import (
+    DEFAULT_PIPELINE,
+    RulePipeline,
+    Stage,
+    VoteStage,
+    analyzeTrack,
+    buildPipeline,
+    flattenFailures,
+    registerRule,
+)
+from .features import TrackFeatures, computeFeatures, registerFeature, HAS_NUMPY
+from .model import (
+    LogisticModel,
+    TrackModel,
+    TreeEnsembleModel,
+    fitLogistic,
+    loadModel,
+    saveModel,
+)
+from .recording import (
+    TrackReader,
+    TrackRecord,
+    TrackRecorder,
+    TrackWriter,
+    simplifyTrack,
+)
+from .sampling import InputSampler
+from .spectral import SPECTRAL_FEATURES
+from .streaming import RunningStat, StreamingAnalyzer
+from .templates import TemplateLibrary, TemplateMatch
+from .thresholds import DEFAULT_THRESHOLDS, loadThresholds, saveThresholds
+from .track import TrackBuffer
+from .verdict import Verdict
+
+__all__ = [
+    "DEFAULT_PIPELINE",
+    "RulePipeline",
+    "Stage",
+    "VoteStage",
+    "analyzeTrack",
+    "buildPipeline",
+    "flattenFailures",
+    "registerRule",
+    "TrackFeatures",
+    "computeFeatures",
+    "registerFeature",
+    "HAS_NUMPY",
+    "InputSampler",
+    "SPECTRAL_FEATURES",
+    "RunningStat",
+    "StreamingAnalyzer",
+    "TrackBuffer",
+    "Verdict",
+    "DEFAULT_THRESHOLDS",
+    "loadThresholds",
+    "saveThresholds",
+    "TemplateLibrary",
+    "TemplateMatch",
+    "LogisticModel",
+    "TrackModel",
+    "TreeEnsembleModel",
+    "fitLogistic",
+    "loadModel",
+    "saveModel",
+    "TrackReader",
+    "TrackRecord",
+    "TrackRecorder",
+    "TrackWriter",
+    "simplifyTrack",
+]
@@ -0,0 +1,254 @@
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .features import TrackFeatures, featureCost
+from .thresholds import mergeThresholds
+
+
+class Stage:
+
+    def __init__(
+        self,
+        name: str,
+        check: Callable[[TrackFeatures], object],
+        cost: float = 1.0,
+        requires: Iterable[str] = (),
+        final: bool = False,
+    ):
+        # check 返回失败信息（str 或 list）表示判定为机器人，返回 None 表示通过；
+        # final 阶段失败后不再执行后续阶段，用于轨迹过短等其余特征已无意义的硬性条件
+        self.name = name
+        self.check = check
+        self.cost = cost
+        self.requires = tuple(requires)
+        self.final = final
+
+    @property
+    def totalCost(self) -> float:
+        return self.cost + featureCost(self.requires)
+
+    def evaluate(self, features: TrackFeatures, complete: bool = False):
+        # complete 要求返回全部命中的原因；普通阶段一次检查就是完整结果
+        return self.check(features)
+
+
+class VoteStage(Stage):
+
+    def __init__(
+        self,
+        name: str,
+        rules: Iterable[Tuple[str, Callable[[TrackFeatures], bool], Iterable[str]]],
+        need: int,
+        cost: float = 0.0,
+    ):
+        self.rules = [(msg, check, tuple(requires)) for msg, check, requires in rules]
+        self.need = need
+        requires = []
+        for _, _, names in self.rules:
+            requires.extend(name for name in names if name not in requires)
+        super().__init__(name, self._vote, cost, requires)
+
+    def evaluate(self, features: TrackFeatures, complete: bool = False):
+        return self._vote(features, complete)
+
+    def _vote(self, features, complete=False):
+        # 按特征代价从低到高逐条投票：票数达标立即判定，剩余规则不可能达标时立即放行；
+        # complete 时达标后继续投完，返回全部命中的规则
+        order = sorted(
+            range(len(self.rules)), key=lambda i: featureCost(self.rules[i][2])
+        )
+        fired = []
+        remaining = len(order)
+        for i in order:
+            remaining -= 1
+            if self.rules[i][1](features):
+                fired.append(i)
+                if len(fired) >= self.need and not complete:
+                    break
+            elif len(fired) + remaining < self.need:
+                return None
+        if len(fired) >= self.need:
+            return [self.rules[j][0] for j in sorted(fired)]
+        return None
+
+
+class RulePipeline:
+
+    def __init__(self, stages: Iterable[Stage] = ()):
+        self._stages: List[Stage] = []
+        self._ordered: Optional[List[Stage]] = None
+        for stage in stages:
+            self.register(stage)
+
+    def register(self, stage: Stage) -> Stage:
+        # 同名阶段原位替换，保持注册顺序不变
+        for i, old in enumerate(self._stages):
+            if old.name == stage.name:
+                self._stages[i] = stage
+                break
+        else:
+            self._stages.append(stage)
+        self._ordered = None
+        return stage
+
+    def unregister(self, name: str) -> None:
+        self._stages = [stage for stage in self._stages if stage.name != name]
+        self._ordered = None
+
+    def stages(self) -> List[Stage]:
+        # 按总代价（阶段自身 + 尚需计算的特征）排序，代价相同时保持注册顺序
+        if self._ordered is None:
+            self._ordered = sorted(self._stages, key=lambda stage: stage.totalCost)
+        return list(self._ordered)
+
+    def copy(self) -> "RulePipeline":
+        return RulePipeline(self._stages)
+
+    def evaluate(self, features: TrackFeatures, complete: bool = True) -> list:
+        # 第一个失败的阶段就决定了结果；complete 时继续跑完其余阶段收集全部原因，
+        # 用到的特征大多已经算过并缓存，遇到失败的 final 阶段为止。
+        # 只关心是否通过时传 complete=False 提前结束
+        failures = []
+        for stage in self.stages():
+            msg = stage.evaluate(features, complete)
+            if msg:
+                failures.append(msg)
+                if not complete or stage.final:
+                    break
+        return failures
+
+
+def buildPipeline(
+    thresholds: Optional[dict] = None, base: Optional[RulePipeline] = None
+) -> RulePipeline:
+
+    # 按阈值配置生成内置规则；传入 base 时在其副本上替换内置规则，保留另行注册的规则
+    t = mergeThresholds(thresholds)
+
+    def duration(f):
+        total_time = f["total_time"]
+        if total_time < t["min_time"] or total_time > t["max_time"]:
+            return "滑动时间异常"
+        return None
+
+    def extreme(f):
+        if (
+            f["total_time"] < t["extreme_time"]
+            and f["avg_deviation"] < t["extreme_deviation"]
+            and f["speed_std"] < t["extreme_speed_std"]
+        ):
+            return "极速滑动异常"
+        return None
+
+    def threshold(name, key, divisor):
+        return lambda f: f[name] < t[key] + f["total_distance"] / t[divisor]
+
+    pipeline = base.copy() if base is not None else RulePipeline()
+    for stage in (
+        Stage(
+            "length",
+            lambda f: "滑动轨迹过短" if f["sample_count"] < t["min_samples"] else None,
+            cost=0,
+            requires=("sample_count",),
+            final=True,
+        ),
+        Stage(
+            "distance",
+            lambda f: (
+                "滑动距离过短" if f["total_distance"] < t["min_distance"] else None
+            ),
+            cost=0,
+            requires=("total_distance",),
+            final=True,
+        ),
+        Stage("duration", duration, cost=0, requires=("total_time",), final=True),
+        Stage(
+            "backward",
+            lambda f: ["回退滑动异常"] if f["backward_moves"] > 0 else None,
+            requires=("backward_moves",),
+        ),
+        Stage(
+            "extreme",
+            extreme,
+            requires=("total_time", "avg_deviation", "speed_std"),
+        ),
+        VoteStage(
+            "vote",
+            [
+                (
+                    "速度变化异常",
+                    threshold("speed_std", "speed_std_base", "speed_std_divisor"),
+                    ("speed_std", "total_distance"),
+                ),
+                (
+                    "加速度变化异常",
+                    threshold("acc_std", "acc_std_base", "acc_std_divisor"),
+                    ("acc_std", "total_distance"),
+                ),
+                (
+                    "加加速度变化异常",
+                    threshold("jerk_std", "jerk_std_base", "jerk_std_divisor"),
+                    ("jerk_std", "total_distance"),
+                ),
+                (
+                    "停顿次数异常",
+                    threshold("pauses", "pause_base", "pause_divisor"),
+                    ("pauses", "total_distance"),
+                ),
+                (
+                    "轨迹异常",
+                    threshold("avg_deviation", "deviation_base", "deviation_divisor"),
+                    ("avg_deviation", "total_distance"),
+                ),
+                (
+                    "速度突变异常",
+                    lambda f: f["abrupt_changes"] < t["abrupt_min"],
+                    ("abrupt_changes",),
+                ),
+            ],
+            need=t["vote_need"],
+        ),
+    ):
+        pipeline.register(stage)
+    return pipeline
+
+
+DEFAULT_PIPELINE = buildPipeline()
+
+
+def registerRule(
+    name: str,
+    check: Callable[[TrackFeatures], object],
+    cost: float = 1.0,
+    requires: Iterable[str] = (),
+) -> Stage:
+    return DEFAULT_PIPELINE.register(Stage(name, check, cost, requires))
+
+
+def analyzeTrack(
+    xs: Sequence[float],
+    ts: Sequence[float],
+    ys: Optional[Sequence[float]] = None,
+    features: Optional[dict] = None,
+    pipeline: Optional[RulePipeline] = None,
+    complete: bool = True,
+) -> dict:
+
+    # features 可传入已算好的特征（例如流式分析的结果），其余特征在规则用到时才计算；
+    # failures 包含全部命中的原因，complete=False 时只有第一个失败阶段的原因
+    trackFeatures = TrackFeatures(xs, ts, ys=ys, values=features)
+    failures = (pipeline or DEFAULT_PIPELINE).evaluate(trackFeatures, complete)
+    return {
+        "result": not failures,
+        "failures": failures,
+        "features": trackFeatures.computed(),
+    }
+
+
+def flattenFailures(failures: list) -> List[str]:
+    msg = []
+    for failure in failures:
+        if isinstance(failure, str):
+            msg.append(failure)
+        else:
+            msg.extend(failure)
+    return msg
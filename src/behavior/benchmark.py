@@ -0,0 +1,287 @@
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence
+
+from .analyzer import DEFAULT_PIPELINE, RulePipeline
+from .features import HAS_NUMPY, PUBLIC_FEATURES, TrackFeatures
+from .spectral import SPECTRAL_FEATURES
+from .synthetic import GENERATORS, minimumJerkHuman, randomProfile, replayBot
+from .templates import TemplateLibrary
+
+# 只依赖 src.behavior，不导入 PySide6，可以在没有显示器的服务器或 CI 上运行
+
+DEFAULT_LENGTHS = (15, 100, 1000, 10000, 100000)
+DEFAULT_TEMPLATE_SIZES = (100, 1000, 5000, 10000)
+
+# 分阶段计时时按顺序强制计算的特征，后面的阶段复用前面已算好的中间结果
+STAGES = (
+    ("convert", ("_x", "_t")),
+    ("speed", ("_dxs", "_dts", "_speeds", "speed_std")),
+    ("acceleration", ("_accelerations", "acc_std")),
+    ("jerk", ("_jerks", "jerk_std")),
+    ("deviation", ("avg_deviation",)),
+    ("spectral", ("_spectra",) + SPECTRAL_FEATURES),
+    ("other", ("sample_count",) + PUBLIC_FEATURES),
+)
+
+
+def percentile(values: Sequence[float], ratio: float) -> float:
+    # 最近秩法，样本数很少时也不会插值出不存在的耗时
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(ratio * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def stageTimings(
+    xs, ys, ts, backend: Optional[str] = None, pipeline: Optional[RulePipeline] = None
+) -> Dict[str, float]:
+
+    features = TrackFeatures(xs, ts, ys=ys, backend=backend)
+    timings = {}
+    for stage, names in STAGES:
+        start = time.perf_counter()
+        for name in names:
+            features[name]
+        timings[stage] = time.perf_counter() - start
+    # 特征已全部算好，rules 阶段只剩规则本身的比较开销
+    start = time.perf_counter()
+    (pipeline or DEFAULT_PIPELINE).evaluate(features)
+    timings["rules"] = time.perf_counter() - start
+    return timings
+
+
+def peakMemory(xs, ys, ts, backend: Optional[str] = None) -> int:
+    # 单独跑一次分析测峰值内存，tracemalloc 的开销不计入耗时
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        features = TrackFeatures(xs, ts, ys=ys, backend=backend)
+        DEFAULT_PIPELINE.evaluate(features)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmarkCase(
+    generator: str,
+    length: int,
+    repeat: int = 20,
+    backend: Optional[str] = None,
+    seed: int = 0,
+) -> dict:
+
+    rng = random.Random(seed)
+    make = GENERATORS[generator]
+    tracks = [make(length, rng) for _ in range(repeat)]
+
+    # 端到端延迟与 analyzeTrack 一致：惰性计算特征，命中后继续收集全部失败原因
+    latencies = []
+    bots = 0
+    for xs, ys, ts in tracks:
+        start = time.perf_counter()
+        features = TrackFeatures(xs, ts, ys=ys, backend=backend)
+        failures = DEFAULT_PIPELINE.evaluate(features)
+        latencies.append(time.perf_counter() - start)
+        bots += bool(failures)
+
+    stages: Dict[str, float] = {}
+    for xs, ys, ts in tracks:
+        for stage, elapsed in stageTimings(xs, ys, ts, backend).items():
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+    stages = {stage: elapsed / repeat for stage, elapsed in stages.items()}
+
+    xs, ys, ts = tracks[0]
+    return {
+        "generator": generator,
+        "length": length,
+        "repeat": repeat,
+        "backend": TrackFeatures(xs, ts, backend=backend).backend,
+        "bot_ratio": bots / repeat,
+        "p50": percentile(latencies, 0.5),
+        "p90": percentile(latencies, 0.9),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies),
+        "stages": stages,
+        "peak_bytes": peakMemory(xs, ys, ts, backend),
+    }
+
+
+def benchmarkTemplates(size: int, queries: int = 200, seed: int = 0) -> dict:
+
+    # 模板库由随机进度曲线的重放轨迹组成；查询一半是库中某条曲线的重放（应命中），
+    # 一半是最小加加速度的人类轨迹（不应命中）
+    rng = random.Random(seed)
+    profiles = [randomProfile(rng) for _ in range(size)]
+    library = TemplateLibrary()
+    for i, profile in enumerate(profiles):
+        xs, _, ts = replayBot(120, rng, profile=profile, noise=0.3)
+        library.add(xs, ts, f"profile-{i}")
+
+    start = time.perf_counter()
+    library.nearest([0.0] * library.length)
+    buildTime = time.perf_counter() - start
+    for key in library.stats:
+        library.stats[key] = 0
+
+    latencies = []
+    hits = falseAlarms = 0
+    for i in range(queries):
+        if i % 2 == 0:
+            profile = profiles[rng.randrange(size)]
+            distance = rng.uniform(100, 250)
+            xs, _, ts = replayBot(150, rng, distance=distance, profile=profile)
+        else:
+            xs, _, ts = minimumJerkHuman(150, rng)
+        start = time.perf_counter()
+        match = library.match(xs, ts)
+        latencies.append(time.perf_counter() - start)
+        if i % 2 == 0:
+            hits += match is not None
+        else:
+            falseAlarms += match is not None
+
+    stats = library.stats
+    return {
+        "templates": size,
+        "queries": queries,
+        "band": library.band,
+        "build": buildTime,
+        "p50": percentile(latencies, 0.5),
+        "p90": percentile(latencies, 0.9),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies),
+        "dtw_per_query": stats["dtw"] / queries,
+        "pruned": 1 - stats["dtw"] / (queries * size),
+        "recall": hits / ((queries + 1) // 2),
+        "false_alarm": falseAlarms / (queries // 2) if queries > 1 else 0.0,
+    }
+
+
+def printTemplateReport(results: Sequence[dict], stream) -> None:
+    header = ["模板数", "建索引", "p50", "p90", "p99", "DTW 次数", "剪枝率"]
+    header += ["召回率", "误报率"]
+    print("\t".join(header), file=stream)
+    for result in results:
+        row = [str(result["templates"])]
+        row += [
+            f"{result[key] * 1000:.3f}" for key in ("build", "p50", "p90", "p99")
+        ]
+        row += [
+            f"{result['dtw_per_query']:.1f}",
+            f"{result['pruned']:.2%}",
+            f"{result['recall']:.0%}",
+            f"{result['false_alarm']:.0%}",
+        ]
+        print("\t".join(row), file=stream)
+    print("耗时单位为毫秒，DTW 次数为每次查询的平均值", file=stream)
+
+
+def printReport(results: Sequence[dict], stream) -> None:
+    stageNames = [stage for stage, _ in STAGES] + ["rules"]
+    header = ["生成器", "采样数", "后端", "判机器人", "p50", "p90", "p99"]
+    header += stageNames + ["峰值内存"]
+    print("\t".join(header), file=stream)
+    for result in results:
+        row = [
+            result["generator"],
+            str(result["length"]),
+            result["backend"],
+            f"{result['bot_ratio']:.0%}",
+        ]
+        row += [f"{result[key] * 1000:.3f}" for key in ("p50", "p90", "p99")]
+        row += [f"{result['stages'][stage] * 1000:.3f}" for stage in stageNames]
+        row.append(f"{result['peak_bytes'] / 1024:.1f}K")
+        print("\t".join(row), file=stream)
+    print("耗时单位为毫秒，分阶段耗时为平均值", file=stream)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.behavior.benchmark",
+        description="用合成轨迹测量拖动分析的分阶段耗时、延迟分位数和峰值内存",
+    )
+    parser.add_argument(
+        "--generators",
+        default=",".join(GENERATORS),
+        help=f"逗号分隔的生成器，可选 {', '.join(GENERATORS)}",
+    )
+    parser.add_argument(
+        "--lengths",
+        default=",".join(str(length) for length in DEFAULT_LENGTHS),
+        help="逗号分隔的采样数",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="每组的轨迹数")
+    parser.add_argument(
+        "--backend",
+        choices=("python", "numpy"),
+        default=None,
+        help="强制使用某个分析后端，默认按采样数自动选择",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument(
+        "--templates",
+        nargs="?",
+        const=",".join(str(size) for size in DEFAULT_TEMPLATE_SIZES),
+        default=None,
+        help="改为测量 DTW 模板匹配的延迟随模板数的变化，可指定逗号分隔的模板数",
+    )
+    parser.add_argument(
+        "--queries", type=int, default=200, help="模板匹配基准的查询次数"
+    )
+    parser.add_argument("--json", default=None, help="把完整结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    if args.templates is not None:
+        if not HAS_NUMPY:
+            parser.error("模板匹配基准需要 numpy")
+        results = []
+        for size in (int(size) for size in args.templates.split(",") if size):
+            result = benchmarkTemplates(size, args.queries, args.seed)
+            results.append(result)
+            print(
+                f"{size} 个模板: p50 {result['p50'] * 1000:.3f} 毫秒",
+                file=sys.stderr,
+            )
+        printTemplateReport(results, sys.stdout)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        return 0
+
+    generators = [name for name in args.generators.split(",") if name]
+    for name in generators:
+        if name not in GENERATORS:
+            parser.error(f"未知的生成器: {name}")
+    if args.backend == "numpy" and not HAS_NUMPY:
+        parser.error("numpy 未安装，无法使用向量化分析")
+    lengths = [int(length) for length in args.lengths.split(",") if length]
+    if min(lengths) < 2:
+        parser.error("采样数至少为 2")
+
+    results = []
+    for generator in generators:
+        for length in lengths:
+            result = benchmarkCase(
+                generator, length, args.repeat, args.backend, args.seed
+            )
+            results.append(result)
+            print(
+                f"{generator} × {length}: p50 {result['p50'] * 1000:.3f} 毫秒",
+                file=sys.stderr,
+            )
+
+    printReport(results, sys.stdout)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
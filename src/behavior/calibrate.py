@@ -0,0 +1,422 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .features import HAS_NUMPY, TrackFeatures
+from .recording import TrackReader, isTrackFile
+from .scorer import iterLines, parseRecord
+from .thresholds import (
+    DEFAULT_THRESHOLDS,
+    THRESHOLD_FEATURES,
+    botMask,
+    mergeThresholds,
+    saveThresholds,
+)
+
+if HAS_NUMPY:
+    import numpy as np
+
+CACHE_VERSION = 1
+
+# 未指定搜索空间时，对投票规则的各项基准阈值和票数要求做网格搜索
+DEFAULT_GRID = {
+    "speed_std_base": (5, 10, 20, 40),
+    "acc_std_base": (25, 50, 100, 200),
+    "jerk_std_base": (100, 200, 400, 800),
+    "pause_base": (0, 1, 2),
+    "deviation_base": (1, 2, 4),
+    "vote_need": (2, 3, 4, 5),
+}
+
+BOT_LABELS = {"bot", "robot", "machine", "1", "true"}
+HUMAN_LABELS = {"human", "user", "0", "false"}
+
+
+def parseLabel(value) -> bool:
+    # 返回 True 表示机器人轨迹
+    if isinstance(value, bool):
+        return value
+    label = str(value).strip().lower()
+    if label in BOT_LABELS:
+        return True
+    if label in HUMAN_LABELS:
+        return False
+    raise ValueError(f"无法识别的轨迹标签: {value}")
+
+
+def iterLabelled(
+    inputs: Iterable[str] = (),
+    humanPaths: Iterable[str] = (),
+    botPaths: Iterable[str] = (),
+) -> Iterator[Tuple[Sequence[float], Sequence[float], Optional[Sequence[float]], bool]]:
+
+    # inputs 中每条记录自带 label 字段；--human / --bot 指定的文件整体标注
+    sources = [(path, None) for path in inputs]
+    sources += [(path, False) for path in humanPaths]
+    sources += [(path, True) for path in botPaths]
+    for path, fileLabel in sources:
+        if path != "-" and isTrackFile(path):
+            if fileLabel is None:
+                raise ValueError(f"二进制轨迹文件没有标签，请用 --human 或 --bot 指定: {path}")
+            with TrackReader(path) as reader:
+                for record in reader:
+                    yield record.xs, record.ts, record.ys, fileLabel
+            continue
+        for line in iterLines(path):
+            record = json.loads(line)
+            xs, ts, ys = parseRecord(record)
+            if fileLabel is None:
+                label = parseLabel(record.get("label", record.get("bot")))
+            else:
+                label = fileLabel
+            yield xs, ts, ys, label
+
+
+def _featureTask(batch, names: Sequence[str] = THRESHOLD_FEATURES):
+    rows = []
+    for xs, ts, ys, label in batch:
+        if not len(xs):
+            continue
+        features = TrackFeatures(xs, ts, ys=ys)
+        rows.append(([features[name] for name in names], label))
+    return rows
+
+
+def buildFeatureTable(
+    tracks: Iterable,
+    workers: int = 1,
+    batchSize: int = 512,
+    names: Sequence[str] = THRESHOLD_FEATURES,
+) -> dict:
+
+    # 每条轨迹的特征只计算一次，按列存放；之后每组参数只需要重新做比较
+    columns: Dict[str, list] = {name: [] for name in names}
+    labels: List[bool] = []
+
+    def collect(rows):
+        for values, label in rows:
+            for name, value in zip(names, values):
+                columns[name].append(value)
+            labels.append(label)
+
+    tracks = iter(tracks)
+    batches = iter(lambda: list(itertools.islice(tracks, batchSize)), [])
+    if workers == 1:
+        for batch in batches:
+            collect(_featureTask(batch, names))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for rows in executor.map(_featureTask, batches, itertools.repeat(names)):
+                collect(rows)
+    return {"features": columns, "labels": labels}
+
+
+def _sourceStamp(inputs, humanPaths, botPaths) -> list:
+    stamp = []
+    for kind, paths in (("mixed", inputs), ("human", humanPaths), ("bot", botPaths)):
+        for path in paths:
+            stat = os.stat(path)
+            stamp.append([kind, os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return stamp
+
+
+def loadFeatureCache(path: str, stamp: list) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        cache.get("version") != CACHE_VERSION
+        or cache.get("sources") != stamp
+        or tuple(cache.get("names", ())) != THRESHOLD_FEATURES
+    ):
+        return None
+    return cache["table"]
+
+
+def saveFeatureCache(path: str, stamp: list, table: dict) -> None:
+    cache = {
+        "version": CACHE_VERSION,
+        "sources": stamp,
+        "names": list(THRESHOLD_FEATURES),
+        "table": table,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+
+
+def parseValue(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def gridSpace(grid: Dict[str, Sequence]) -> Iterator[dict]:
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def randomSpace(
+    ranges: Dict[str, Tuple[float, float]], count: int, seed: Optional[int] = None
+) -> Iterator[dict]:
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        combo = {}
+        for name, (low, high) in ranges.items():
+            if isinstance(low, int) and isinstance(high, int):
+                combo[name] = rng.randint(low, high)
+            else:
+                combo[name] = rng.uniform(low, high)
+        yield combo
+
+
+_TABLE = None
+
+
+def _initWorker(table: dict) -> None:
+    global _TABLE
+    features = table["features"]
+    if HAS_NUMPY:
+        _TABLE = (
+            {name: np.asarray(values) for name, values in features.items()},
+            np.asarray(table["labels"], dtype=bool),
+        )
+    else:
+        rows = [dict(zip(features, values)) for values in zip(*features.values())]
+        _TABLE = (rows, table["labels"])
+
+
+def confusion(thresholds: dict) -> Tuple[int, int, int, int]:
+    # 以机器人为正类，返回 (tp, fp, tn, fn)
+    features, labels = _TABLE
+    t = mergeThresholds(thresholds)
+    if HAS_NUMPY:
+        predicted = botMask(features, t)
+        tp = int(np.count_nonzero(predicted & labels))
+        fp = int(np.count_nonzero(predicted & ~labels))
+        bots = int(np.count_nonzero(labels))
+        return tp, fp, labels.size - bots - fp, bots - tp
+
+    tp = fp = tn = fn = 0
+    for row, label in zip(features, labels):
+        if botMask(row, t):
+            if label:
+                tp += 1
+            else:
+                fp += 1
+        elif label:
+            fn += 1
+        else:
+            tn += 1
+    return tp, fp, tn, fn
+
+
+def _sweepTask(combos):
+    return [confusion(combo) for combo in combos]
+
+
+def sweep(
+    table: dict, combos: Iterable[dict], workers: int = 1, chunkSize: int = 64
+) -> List[Tuple[dict, Tuple[int, int, int, int]]]:
+
+    combos = list(combos)
+    chunks = [combos[i : i + chunkSize] for i in range(0, len(combos), chunkSize)]
+    if workers == 1:
+        _initWorker(table)
+        counts = [_sweepTask(chunk) for chunk in chunks]
+    else:
+        # 特征表随进程初始化只传一次，任务里只传参数组合
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_initWorker, initargs=(table,)
+        ) as executor:
+            counts = list(executor.map(_sweepTask, chunks))
+    return list(zip(combos, itertools.chain.from_iterable(counts)))
+
+
+def metrics(counts: Tuple[int, int, int, int]) -> dict:
+    tp, fp, tn, fn = counts
+    tpr = tp / (tp + fn) if tp + fn else 0.0
+    fpr = fp / (fp + tn) if fp + tn else 0.0
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    f1 = 2 * precision * tpr / (precision + tpr) if precision + tpr else 0.0
+    return {
+        "tp": tp,
+        "fp": fp,
+        "tn": tn,
+        "fn": fn,
+        "tpr": tpr,
+        "fpr": fpr,
+        "precision": precision,
+        "f1": f1,
+    }
+
+
+def rocFrontier(results: Sequence[Tuple[dict, dict]]) -> List[Tuple[dict, dict]]:
+    # 每个误判率下召回率最高的组合，即 ROC 曲线的上包络
+    ordered = sorted(results, key=lambda item: (item[1]["fpr"], -item[1]["tpr"]))
+    frontier = []
+    for combo, metric in ordered:
+        if not frontier or metric["tpr"] > frontier[-1][1]["tpr"]:
+            frontier.append((combo, metric))
+    return frontier
+
+
+def selectBest(
+    results: Sequence[Tuple[dict, dict]], maxFpr: float
+) -> Optional[Tuple[dict, dict]]:
+
+    candidates = [item for item in results if item[1]["fpr"] <= maxFpr]
+    if not candidates:
+        return None
+    return max(
+        candidates,
+        key=lambda item: (item[1]["tpr"], -item[1]["fpr"], item[1]["precision"]),
+    )
+
+
+def writeTable(results: Sequence[Tuple[dict, dict]], path: str) -> None:
+    names = sorted({name for combo, _ in results for name in combo})
+    fields = ["tp", "fp", "tn", "fn", "tpr", "fpr", "precision", "f1"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(names + fields)
+        for combo, metric in results:
+            writer.writerow(
+                [combo.get(name, "") for name in names]
+                + [metric[field] for field in fields]
+            )
+
+
+def printFrontier(frontier: Sequence[Tuple[dict, dict]], stream) -> None:
+    print("误判率(FPR)  召回率(TPR)  精确率   F1      参数", file=stream)
+    for combo, metric in frontier:
+        params = ", ".join(f"{name}={value:g}" for name, value in combo.items())
+        print(
+            f"{metric['fpr']:<12.4f} {metric['tpr']:<12.4f} "
+            f"{metric['precision']:<8.4f} {metric['f1']:<7.4f} {params}",
+            file=stream,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.behavior.calibrate",
+        description="在标注好的人类/机器人轨迹语料上搜索判定阈值，输出 ROC 表和阈值配置",
+    )
+    parser.add_argument("inputs", nargs="*", help="记录中带 label 字段的 JSONL 文件")
+    parser.add_argument("--human", action="append", default=[], help="全部为人类的轨迹文件")
+    parser.add_argument("--bot", action="append", default=[], help="全部为机器人的轨迹文件")
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2,...",
+        help="网格搜索的参数取值，可重复指定",
+    )
+    parser.add_argument(
+        "--range",
+        action="append",
+        default=[],
+        metavar="NAME=LOW:HIGH",
+        help="随机搜索的参数范围，整数端点按整数采样",
+    )
+    parser.add_argument("--random", type=int, default=0, help="随机搜索的组合数")
+    parser.add_argument("--seed", type=int, default=None, help="随机搜索的种子")
+    parser.add_argument("--max-fpr", type=float, default=0.01, help="允许的人类误判率")
+    parser.add_argument("-o", "--output", default="thresholds.json", help="阈值配置输出路径")
+    parser.add_argument("--table", default=None, help="把全部组合的指标写入 CSV")
+    parser.add_argument("--cache", default=None, help="特征缓存文件，输入未变化时复用")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="进程数，默认使用全部核心"
+    )
+    parser.add_argument("--batch-size", type=int, default=512, help="每个任务的轨迹数")
+    args = parser.parse_args(argv)
+
+    if not (args.inputs or args.human or args.bot):
+        parser.error("至少需要一个输入文件")
+    workers = args.workers or os.cpu_count() or 1
+
+    grid = {}
+    for spec in args.grid:
+        name, _, values = spec.partition("=")
+        grid[name] = [parseValue(value) for value in values.split(",")]
+    ranges = {}
+    for spec in args.range:
+        name, _, bounds = spec.partition("=")
+        low, _, high = bounds.partition(":")
+        ranges[name] = (parseValue(low), parseValue(high))
+    for name in itertools.chain(grid, ranges):
+        if name not in DEFAULT_THRESHOLDS:
+            parser.error(f"未知的阈值参数: {name}")
+
+    table = None
+    stamp = None
+    if args.cache and "-" not in args.inputs:
+        stamp = _sourceStamp(args.inputs, args.human, args.bot)
+        table = loadFeatureCache(args.cache, stamp)
+    if table is None:
+        tracks = iterLabelled(args.inputs, args.human, args.bot)
+        table = buildFeatureTable(tracks, workers, args.batch_size)
+        if stamp is not None:
+            saveFeatureCache(args.cache, stamp, table)
+    else:
+        print(f"使用特征缓存 {args.cache}", file=sys.stderr)
+
+    labels = table["labels"]
+    bots = sum(labels)
+    print(
+        f"共 {len(labels)} 条轨迹：人类 {len(labels) - bots} 条，机器人 {bots} 条",
+        file=sys.stderr,
+    )
+
+    if args.random:
+        ranges = ranges or {
+            name: (min(values), max(values)) for name, values in DEFAULT_GRID.items()
+        }
+        combos = list(randomSpace(ranges, args.random, args.seed))
+    else:
+        combos = list(gridSpace(grid or DEFAULT_GRID))
+    combos.append({})
+    print(f"评估 {len(combos)} 组参数", file=sys.stderr)
+
+    results = [
+        (combo, metrics(counts)) for combo, counts in sweep(table, combos, workers)
+    ]
+    if args.table:
+        writeTable(results, args.table)
+
+    printFrontier(rocFrontier(results), sys.stdout)
+    baseline = results[-1][1]
+    print(
+        f"默认阈值：召回率 {baseline['tpr']:.4f}，误判率 {baseline['fpr']:.4f}，"
+        f"精确率 {baseline['precision']:.4f}",
+        file=sys.stderr,
+    )
+
+    best = selectBest(results, args.max_fpr)
+    if best is None:
+        print(f"没有误判率不超过 {args.max_fpr} 的参数组合", file=sys.stderr)
+        return 1
+    combo, metric = best
+    saveThresholds(combo, args.output, metrics={"tracks": len(labels), **metric})
+    print(
+        f"已写入 {args.output}：召回率 {metric['tpr']:.4f}，误判率 {metric['fpr']:.4f}，"
+        f"精确率 {metric['precision']:.4f}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+from math import sqrt
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+# 短轨迹上数组转换的开销比循环本身还大，低于该采样数时走纯 Python 实现
+NUMPY_MIN_SAMPLES = 64
+
+# 间隔超过 PAUSE_INTERVAL 秒且移动不到 PAUSE_DISTANCE 像素的一步记为一次停顿；流式分析共用
+PAUSE_INTERVAL = 0.1
+PAUSE_DISTANCE = 2
+
+# 特征名 -> (相对代价, 依赖的特征, 计算函数)；以下划线开头的是中间结果，不对外输出
+FEATURES: Dict[str, Tuple[float, Tuple[str, ...], Callable]] = {}
+
+PUBLIC_FEATURES = (
+    "total_time",
+    "total_distance",
+    "backward_moves",
+    "speed_std",
+    "acc_std",
+    "jerk_std",
+    "abrupt_changes",
+    "pauses",
+    "avg_deviation",
+    "y_jitter",
+)
+
+
+def registerFeature(name: str, cost: float = 1.0, requires: Iterable[str] = ()):
+
+    def decorator(func):
+        FEATURES[name] = (cost, tuple(requires), func)
+        return func
+
+    return decorator
+
+
+def featureCost(names: Iterable[str], seen: Optional[set] = None) -> float:
+    # 计算一组特征及其全部依赖的总代价，共享的依赖只计一次
+    seen = set() if seen is None else seen
+    total = 0.0
+    for name in names:
+        if name in seen:
+            continue
+        seen.add(name)
+        cost, requires, _ = FEATURES[name]
+        total += cost + featureCost(requires, seen)
+    return total
+
+
+class TrackFeatures:
+
+    def __init__(
+        self,
+        xs: Sequence[float],
+        ts: Sequence[float],
+        ys: Optional[Sequence[float]] = None,
+        backend: Optional[str] = None,
+        values: Optional[dict] = None,
+    ):
+        if backend is None:
+            backend = (
+                "numpy" if HAS_NUMPY and len(xs) >= NUMPY_MIN_SAMPLES else "python"
+            )
+        if backend == "numpy" and not HAS_NUMPY:
+            raise RuntimeError("numpy 未安装，无法使用向量化分析")
+        if backend not in ("numpy", "python"):
+            raise ValueError(f"未知的分析后端: {backend}")
+
+        self.xs = xs
+        self.ts = ts
+        self.ys = ys
+        self.backend = backend
+        self.vectorized = backend == "numpy"
+        self.values = dict(values) if values else {}
+
+    def __getitem__(self, name: str):
+        try:
+            return self.values[name]
+        except KeyError:
+            pass
+        try:
+            _, _, func = FEATURES[name]
+        except KeyError:
+            raise KeyError(f"未注册的特征: {name}") from None
+        value = self.values[name] = func(self)
+        return value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.values
+
+    def computed(self) -> dict:
+        return {k: v for k, v in self.values.items() if not k.startswith("_")}
+
+
+def computeFeatures(
+    xs: Sequence[float],
+    ts: Sequence[float],
+    backend: Optional[str] = None,
+    ys: Optional[Sequence[float]] = None,
+) -> dict:
+
+    features = TrackFeatures(xs, ts, ys=ys, backend=backend)
+    return {name: features[name] for name in PUBLIC_FEATURES}
+
+
+def _std(values):
+    if len(values) > 1:
+        mean = sum(values) / len(values)
+        var = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+        return sqrt(var) if var > 0 else 0
+    return 0
+
+
+def _npStd(values):
+    if values.size > 1:
+        var = float(values.var(ddof=1))
+        return sqrt(var) if var > 0 else 0
+    return 0
+
+
+@registerFeature("sample_count", cost=0)
+def _sampleCount(f):
+    return len(f.xs)
+
+
+@registerFeature("total_time", cost=0)
+def _totalTime(f):
+    return f.ts[-1] - f.ts[0]
+
+
+@registerFeature("total_distance", cost=0)
+def _totalDistance(f):
+    return abs(f.xs[-1] - f.xs[0])
+
+
+@registerFeature("_x", cost=1)
+def _xArray(f):
+    return np.asarray(f.xs, dtype=np.float64) if f.vectorized else f.xs
+
+
+@registerFeature("_t", cost=1)
+def _tArray(f):
+    return np.asarray(f.ts, dtype=np.float64) if f.vectorized else f.ts
+
+
+@registerFeature("_dxs", cost=2, requires=("_x",))
+def _dxs(f):
+    xs = f["_x"]
+    if f.vectorized:
+        return np.diff(xs)
+    return [xs[i] - xs[i - 1] for i in range(1, len(xs))]
+
+
+@registerFeature("_dts", cost=2, requires=("_t",))
+def _dts(f):
+    ts = f["_t"]
+    if f.vectorized:
+        return np.diff(ts)
+    return [ts[i] - ts[i - 1] for i in range(1, len(ts))]
+
+
+@registerFeature("backward_moves", cost=2, requires=("_dxs",))
+def _backwardMoves(f):
+    if f.vectorized:
+        return int(np.count_nonzero(f["_dxs"] < 0))
+    return sum(1 for dx in f["_dxs"] if dx < 0)
+
+
+@registerFeature("_speeds", cost=4, requires=("_dxs", "_dts"))
+def _speeds(f):
+    dxs = f["_dxs"]
+    dts = f["_dts"]
+    if f.vectorized:
+        positive = dts > 0
+        return np.where(positive, np.abs(dxs) / np.where(positive, dts, 1.0), 0.0)
+    return [abs(dx) / dt if dt > 0 else 0 for dx, dt in zip(dxs, dts)]
+
+
+# 加速度除以前一段的时间间隔，加加速度除以后一段的时间间隔，
+# 两种实现保持与最初的滑块实现相同的下标对应关系
+@registerFeature("_accelerations", cost=4, requires=("_speeds", "_dts"))
+def _accelerations(f):
+    speeds = f["_speeds"]
+    dts = f["_dts"]
+    if f.vectorized:
+        positive = dts[:-1] > 0
+        return np.where(
+            positive, np.diff(speeds) / np.where(positive, dts[:-1], 1.0), 0.0
+        )
+    return [
+        (speeds[i] - speeds[i - 1]) / dts[i - 1] if dts[i - 1] > 0 else 0
+        for i in range(1, len(speeds))
+    ]
+
+
+@registerFeature("_jerks", cost=4, requires=("_accelerations", "_dts"))
+def _jerks(f):
+    accelerations = f["_accelerations"]
+    dts = f["_dts"]
+    if f.vectorized:
+        spans = dts[1 : accelerations.size]
+        positive = spans > 0
+        return np.where(
+            positive, np.diff(accelerations) / np.where(positive, spans, 1.0), 0.0
+        )
+    return [
+        (accelerations[i] - accelerations[i - 1]) / dts[i] if dts[i] > 0 else 0
+        for i in range(1, len(accelerations))
+    ]
+
+
+@registerFeature("speed_std", cost=2, requires=("_speeds",))
+def _speedStd(f):
+    return _npStd(f["_speeds"]) if f.vectorized else _std(f["_speeds"])
+
+
+@registerFeature("acc_std", cost=2, requires=("_accelerations",))
+def _accStd(f):
+    return _npStd(f["_accelerations"]) if f.vectorized else _std(f["_accelerations"])
+
+
+@registerFeature("jerk_std", cost=2, requires=("_jerks",))
+def _jerkStd(f):
+    return _npStd(f["_jerks"]) if f.vectorized else _std(f["_jerks"])
+
+
+@registerFeature(
+    "abrupt_changes", cost=3, requires=("_speeds", "total_distance", "total_time")
+)
+def _abruptChanges(f):
+    total_time = f["total_time"]
+    avg_speed = f["total_distance"] / total_time if total_time > 0 else 0
+    threshold = avg_speed * 0.5
+    speeds = f["_speeds"]
+    if f.vectorized:
+        return int(np.count_nonzero(np.abs(np.diff(speeds)) > threshold))
+    return sum(
+        1 for i in range(1, len(speeds)) if abs(speeds[i] - speeds[i - 1]) > threshold
+    )
+
+
+@registerFeature("pauses", cost=3, requires=("_dxs", "_dts"))
+def _pauses(f):
+    dxs = f["_dxs"]
+    dts = f["_dts"]
+    if f.vectorized:
+        return int(
+            np.count_nonzero((dts > PAUSE_INTERVAL) & (np.abs(dxs) < PAUSE_DISTANCE))
+        )
+    return sum(
+        1
+        for dx, dt in zip(dxs, dts)
+        if dt > PAUSE_INTERVAL and abs(dx) < PAUSE_DISTANCE
+    )
+
+
+@registerFeature(
+    "avg_deviation", cost=6, requires=("_x", "_t", "total_distance", "total_time")
+)
+def _avgDeviation(f):
+    if f["total_distance"] <= 0:
+        return 0
+    total_time = f["total_time"]
+    xs = f["_x"]
+    ts = f["_t"]
+    if f.vectorized:
+        if total_time > 0:
+            t_ratio = (ts - ts[0]) / total_time
+        else:
+            t_ratio = np.zeros_like(ts)
+        expected_x = xs[0] + (xs[-1] - xs[0]) * t_ratio
+        return float(np.abs(xs - expected_x).mean())
+
+    start_time = ts[0]
+    span = xs[-1] - xs[0]
+    deviations = 0
+    for x, t in zip(xs, ts):
+        t_ratio = (t - start_time) / total_time if total_time > 0 else 0
+        deviations += abs(x - (xs[0] + span * t_ratio))
+    return deviations / len(xs)
+
+
+@registerFeature("y_jitter", cost=3)
+def _yJitter(f):
+    if f.ys is None:
+        return 0
+    if f.vectorized:
+        return _npStd(np.asarray(f.ys, dtype=np.float64))
+    return _std(f.ys)
+
+
+# 频谱特征在单独的模块中注册，随本模块一起加载
+from . import spectral  # noqa: E402,F401
@@ -0,0 +1,367 @@
+import json
+from math import exp
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from .analyzer import Stage
+from .features import HAS_NUMPY, TrackFeatures
+from .spectral import SPECTRAL_FEATURES
+from .thresholds import THRESHOLD_FEATURES
+
+if HAS_NUMPY:
+    import numpy as np
+
+MODEL_VERSION = 1
+
+# 未指定时模型使用的特征：内置规则用到的全部特征加上频谱特征
+DEFAULT_MODEL_FEATURES = THRESHOLD_FEATURES + ("y_jitter",) + SPECTRAL_FEATURES
+
+# 模型类型 -> 类；模型文件中的 type 字段决定用哪个类加载，替换模型不需要改代码
+MODEL_TYPES: Dict[str, type] = {}
+
+
+def registerModel(kind: str):
+
+    def decorator(cls):
+        cls.kind = kind
+        MODEL_TYPES[kind] = cls
+        return cls
+
+    return decorator
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + exp(-z))
+    e = exp(z)
+    return e / (1.0 + e)
+
+
+class TrackModel:
+
+    # 输出为机器人的概率；单条轨迹走纯 Python 路径（微秒级），批量评分走 numpy
+    kind = ""
+
+    def __init__(
+        self,
+        features: Sequence[str],
+        threshold: float = 0.5,
+        metadata: Optional[dict] = None,
+    ):
+        self.features = tuple(features)
+        self.threshold = threshold
+        self.metadata = dict(metadata or {})
+
+    def scoreValues(self, values: Sequence[float]) -> float:
+        return _sigmoid(self.decisionOne(values))
+
+    def score(self, features) -> float:
+        # features 可以是 TrackFeatures（按需计算所需特征）或普通的特征字典
+        return self.scoreValues([features[name] for name in self.features])
+
+    def predict(self, matrix):
+        # matrix 每行一条轨迹、每列一个特征，列顺序与 self.features 一致
+        z = self.decision(np.asarray(matrix, dtype=np.float64))
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def featureMatrix(self, xs, ts, lengths, ys=None):
+        # 补齐成等长的二维数组传入，lengths 为每条轨迹的真实采样数。
+        # 特征仍逐条轨迹用 TrackFeatures 计算（Python 循环，耗时随轨迹数线性增长），
+        # 向量化的只有 predict 的评分；大批量离线评分时瓶颈在这里而不在模型
+        rows = []
+        for i, length in enumerate(lengths):
+            length = int(length)
+            features = TrackFeatures(
+                xs[i][:length],
+                ts[i][:length],
+                ys=ys[i][:length] if ys is not None else None,
+            )
+            rows.append([features[name] for name in self.features])
+        return np.asarray(rows, dtype=np.float64).reshape(len(rows), len(self.features))
+
+    def scoreBatch(self, xs, ts, lengths, ys=None):
+        return self.predict(self.featureMatrix(xs, ts, lengths, ys))
+
+    def stage(self, name: str = "vote") -> Stage:
+        # 默认与内置的六条投票规则同名，注册到规则链副本时原位替换投票阶段
+        def check(f):
+            probability = self.score(f)
+            if probability >= self.threshold:
+                return f"模型判定为机器人（{probability:.2f}）"
+            return None
+
+        return Stage(name, check, cost=1.0, requires=self.features)
+
+    def decisionOne(self, values: Sequence[float]) -> float:
+        raise NotImplementedError
+
+    def decision(self, matrix):
+        raise NotImplementedError
+
+    def parameters(self) -> dict:
+        raise NotImplementedError
+
+    @classmethod
+    def fromParameters(cls, features, threshold, metadata, params) -> "TrackModel":
+        raise NotImplementedError
+
+
+@registerModel("logistic")
+class LogisticModel(TrackModel):
+
+    def __init__(
+        self,
+        features: Sequence[str],
+        weights: Sequence[float],
+        bias: float = 0.0,
+        mean: Optional[Sequence[float]] = None,
+        scale: Optional[Sequence[float]] = None,
+        threshold: float = 0.5,
+        metadata: Optional[dict] = None,
+    ):
+        super().__init__(features, threshold, metadata)
+        count = len(self.features)
+        self.weights = [float(w) for w in weights]
+        self.bias = float(bias)
+        self.mean = [float(m) for m in mean] if mean is not None else [0.0] * count
+        self.scale = [float(s) for s in scale] if scale is not None else [1.0] * count
+        if not len(self.weights) == len(self.mean) == len(self.scale) == count:
+            raise ValueError("模型参数与特征数量不一致")
+        # 标准化折算进权重，评分时只剩一次点积
+        self._coef = [w / s for w, s in zip(self.weights, self.scale)]
+        self._intercept = self.bias - sum(c * m for c, m in zip(self._coef, self.mean))
+        if HAS_NUMPY:
+            self._coefArray = np.asarray(self._coef)
+
+    def decisionOne(self, values: Sequence[float]) -> float:
+        z = self._intercept
+        for c, v in zip(self._coef, values):
+            z += c * v
+        return z
+
+    def decision(self, matrix):
+        return matrix @ self._coefArray + self._intercept
+
+    def parameters(self) -> dict:
+        return {
+            "weights": self.weights,
+            "bias": self.bias,
+            "mean": self.mean,
+            "scale": self.scale,
+        }
+
+    @classmethod
+    def fromParameters(cls, features, threshold, metadata, params):
+        return cls(
+            features,
+            _floats(params["weights"]),
+            float(params.get("bias", 0.0)),
+            _floats(params["mean"]) if "mean" in params else None,
+            _floats(params["scale"]) if "scale" in params else None,
+            threshold,
+            metadata,
+        )
+
+
+@registerModel("tree_ensemble")
+class TreeEnsembleModel(TrackModel):
+
+    # 梯度提升树：每棵树用平行数组表示，feature 为 -1 的是叶子，
+    # x[feature] <= threshold 走 left，否则走 right；概率为 sigmoid(base + 各树叶子值之和)
+    def __init__(
+        self,
+        features: Sequence[str],
+        trees: Sequence[Mapping[str, Sequence]],
+        base: float = 0.0,
+        threshold: float = 0.5,
+        metadata: Optional[dict] = None,
+    ):
+        super().__init__(features, threshold, metadata)
+        self.base = float(base)
+        self.trees = [
+            {
+                "feature": [int(v) for v in tree["feature"]],
+                "threshold": [float(v) for v in tree["threshold"]],
+                "left": [int(v) for v in tree["left"]],
+                "right": [int(v) for v in tree["right"]],
+                "value": [float(v) for v in tree["value"]],
+            }
+            for tree in trees
+        ]
+        for tree in self.trees:
+            if max(tree["feature"]) >= len(self.features):
+                raise ValueError("决策树引用了不存在的特征")
+        if HAS_NUMPY:
+            self._flatten()
+
+    def _flatten(self):
+        # 所有树拼接成一组数组，批量评分时所有样本、所有树同时逐层下降
+        offsets = []
+        arrays = {key: [] for key in ("feature", "threshold", "left", "right", "value")}
+        depth = 0
+        offset = 0
+        for tree in self.trees:
+            offsets.append(offset)
+            count = len(tree["feature"])
+            for key in ("feature", "threshold", "value"):
+                arrays[key].extend(tree[key])
+            for key in ("left", "right"):
+                arrays[key].extend(
+                    child + offset if child >= 0 else -1 for child in tree[key]
+                )
+            depth = max(depth, _treeDepth(tree))
+            offset += count
+        self._roots = np.asarray(offsets, dtype=np.int64)
+        self._feature = np.asarray(arrays["feature"], dtype=np.int64)
+        self._threshold = np.asarray(arrays["threshold"], dtype=np.float64)
+        self._left = np.asarray(arrays["left"], dtype=np.int64)
+        self._right = np.asarray(arrays["right"], dtype=np.int64)
+        self._value = np.asarray(arrays["value"], dtype=np.float64)
+        self._depth = depth
+
+    def decisionOne(self, values: Sequence[float]) -> float:
+        z = self.base
+        for tree in self.trees:
+            feature = tree["feature"]
+            node = 0
+            while feature[node] >= 0:
+                if values[feature[node]] <= tree["threshold"][node]:
+                    node = tree["left"][node]
+                else:
+                    node = tree["right"][node]
+            z += tree["value"][node]
+        return z
+
+    def decision(self, matrix):
+        rows = np.arange(matrix.shape[0])[:, None]
+        nodes = np.broadcast_to(self._roots, (matrix.shape[0], self._roots.size))
+        for _ in range(self._depth):
+            feature = self._feature[nodes]
+            leaf = feature < 0
+            goLeft = matrix[rows, np.maximum(feature, 0)] <= self._threshold[nodes]
+            nodes = np.where(
+                leaf, nodes, np.where(goLeft, self._left[nodes], self._right[nodes])
+            )
+        return self.base + self._value[nodes].sum(axis=1)
+
+    def parameters(self) -> dict:
+        return {"base": self.base, "trees": self.trees}
+
+    @classmethod
+    def fromParameters(cls, features, threshold, metadata, params):
+        base = float(params.get("base", 0.0))
+        return cls(features, params["trees"], base, threshold, metadata)
+
+
+def _floats(values) -> List[float]:
+    return [float(v) for v in values]
+
+
+def _treeDepth(tree: Mapping[str, Sequence]) -> int:
+    depth = 0
+    level = [0]
+    while True:
+        level = [
+            child
+            for node in level
+            if tree["feature"][node] >= 0
+            for child in (tree["left"][node], tree["right"][node])
+        ]
+        if not level:
+            return depth
+        depth += 1
+
+
+def saveModel(model: TrackModel, path: str) -> None:
+    # .npz 把数值参数存为数组，其余格式写 JSON；两种格式的字段相同
+    config = {
+        "version": MODEL_VERSION,
+        "type": model.kind,
+        "features": list(model.features),
+        "threshold": model.threshold,
+        "metadata": model.metadata,
+    }
+    params = model.parameters()
+    if path.endswith(".npz"):
+        arrays = {}
+        if model.kind == "tree_ensemble":
+            params = dict(params)
+            for i, tree in enumerate(params.pop("trees")):
+                for key, values in tree.items():
+                    arrays[f"trees/{i}/{key}"] = np.asarray(values)
+            params["tree_count"] = len(model.trees)
+        for key, value in params.items():
+            if isinstance(value, list):
+                arrays[f"params/{key}"] = np.asarray(value, dtype=np.float64)
+            else:
+                config.setdefault("params", {})[key] = value
+        with open(path, "wb") as f:
+            header = np.asarray(json.dumps(config, ensure_ascii=False))
+            np.savez(f, config=header, **arrays)
+        return
+    config["params"] = params
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def loadModel(path: str) -> TrackModel:
+    if path.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            params = dict(config.get("params", {}))
+            for key in data.files:
+                if key.startswith("params/"):
+                    params[key[len("params/") :]] = data[key].tolist()
+            if "tree_count" in params:
+                params["trees"] = [
+                    {
+                        key: data[f"trees/{i}/{key}"].tolist()
+                        for key in ("feature", "threshold", "left", "right", "value")
+                    }
+                    for i in range(params.pop("tree_count"))
+                ]
+    else:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        params = config.get("params", {})
+
+    if config.get("version", MODEL_VERSION) > MODEL_VERSION:
+        raise ValueError(f"不支持的模型版本: {config['version']}")
+    try:
+        cls = MODEL_TYPES[config["type"]]
+    except KeyError:
+        raise ValueError(f"未知的模型类型: {config.get('type')}") from None
+    return cls.fromParameters(
+        config["features"],
+        float(config.get("threshold", 0.5)),
+        config.get("metadata"),
+        params,
+    )
+
+
+def fitLogistic(
+    matrix,
+    labels,
+    features: Sequence[str],
+    l2: float = 1e-3,
+    iterations: int = 2000,
+    learningRate: float = 0.5,
+) -> LogisticModel:
+
+    # 全批量梯度下降训练带 L2 正则的逻辑回归，训练前按列标准化；只需要 numpy
+    matrix = np.asarray(matrix, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.float64)
+    mean = matrix.mean(axis=0)
+    scale = matrix.std(axis=0)
+    scale[scale <= 0] = 1.0
+    x = (matrix - mean) / scale
+    weights = np.zeros(x.shape[1])
+    bias = 0.0
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(x @ weights + bias)))
+        error = p - labels
+        weights -= learningRate * (x.T @ error / len(labels) + l2 * weights)
+        bias -= learningRate * float(error.mean())
+    return LogisticModel(
+        features, weights.tolist(), bias, mean.tolist(), scale.tolist()
+    )
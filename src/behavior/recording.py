@@ -0,0 +1,376 @@
+import atexit
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+from array import array
+from collections import namedtuple
+from math import hypot
+from typing import List, Optional, Sequence
+
+# 文件布局：32 字节定长文件头 | 若干条记录 | 记录偏移索引（每条 8 字节）
+# 记录内的时间和坐标先量化为整数，再以 zigzag 差分 + varint 编码
+MAGIC = b"VTRK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIHHQQ")
+START_TIME = struct.Struct("<d")
+
+FLAG_RESULT = 0x01
+FLAG_HAS_Y = 0x02
+
+TrackRecord = namedtuple("TrackRecord", ["xs", "ys", "ts", "result", "msg"])
+
+
+def isTrackFile(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _writeVarint(buf: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _writeSigned(buf: bytearray, value: int) -> None:
+    _writeVarint(buf, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def _readVarint(data, pos: int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _readSigned(data, pos: int):
+    value, pos = _readVarint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def simplifyTrack(
+    xs: Sequence[float],
+    ys: Optional[Sequence[float]],
+    ts: Sequence[float],
+    epsilon: float,
+) -> List[int]:
+
+    # Ramer–Douglas–Peucker，距离用同步欧氏距离（SED）：采样点与简化后线段上同一时刻
+    # 按时间插值出的位置之间的距离；被删掉的每个采样点与简化轨迹在该时刻的位置相差不超过 epsilon 像素
+    n = len(xs)
+    if n < 3:
+        return list(range(n))
+
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        duration = ts[last] - ts[first]
+        x0, dx = xs[first], xs[last] - xs[first]
+        if ys is not None:
+            y0, dy = ys[first], ys[last] - ys[first]
+        max_dist = -1.0
+        index = first
+        for i in range(first + 1, last):
+            ratio = (ts[i] - ts[first]) / duration if duration > 0 else 0
+            if ys is not None:
+                dist = hypot(xs[i] - x0 - dx * ratio, ys[i] - y0 - dy * ratio)
+            else:
+                dist = abs(xs[i] - x0 - dx * ratio)
+            if dist > max_dist:
+                max_dist = dist
+                index = i
+        if max_dist > epsilon:
+            keep[index] = 1
+            stack.append((first, index))
+            stack.append((index, last))
+    return [i for i in range(n) if keep[i]]
+
+
+class TrackWriter:
+
+    def __init__(self, path: str, timeScale: int = 1000000, coordScale: int = 100):
+
+        self.path = path
+        self.timeScale = timeScale
+        self.coordScale = coordScale
+        self.offsets = array("Q")
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+            # 追加到已有文件：读入旧索引，从索引位置开始继续写记录
+            with TrackReader(path) as reader:
+                self.timeScale = reader.timeScale
+                self.coordScale = reader.coordScale
+                self.offsets.extend(reader.offsets)
+                end = reader.dataEnd
+            self.file = open(path, "r+b", buffering=1 << 16)
+            self.file.truncate(end)
+            # 旧索引即将被新记录覆盖，先清掉文件头里的索引位置，异常退出后可重新扫描
+            self._writeHeader(0)
+            self.file.seek(end)
+        else:
+            self.file = open(path, "w+b", buffering=1 << 16)
+            self._writeHeader(0)
+
+    def _writeHeader(self, indexOffset: int) -> None:
+        self.file.seek(0)
+        self.file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                self.timeScale,
+                self.coordScale,
+                0,
+                len(self.offsets),
+                indexOffset,
+            )
+        )
+
+    def write(
+        self,
+        xs: Sequence[float],
+        ys: Optional[Sequence[float]],
+        ts: Sequence[float],
+        result: bool,
+        msg: Sequence[str] = (),
+    ) -> None:
+
+        buf = bytearray()
+        flags = (FLAG_RESULT if result else 0) | (FLAG_HAS_Y if ys is not None else 0)
+        buf.append(flags)
+        _writeVarint(buf, len(xs))
+        text = "\n".join(msg).encode("utf-8")
+        _writeVarint(buf, len(text))
+        buf += text
+        buf += START_TIME.pack(ts[0] if len(ts) else 0.0)
+
+        timeScale = self.timeScale
+        coordScale = self.coordScale
+        start = ts[0] if len(ts) else 0.0
+        last_t = last_x = last_y = 0
+        for i in range(len(xs)):
+            # 先量化绝对值再求差分，累计误差不会随采样数增长
+            qt = round((ts[i] - start) * timeScale)
+            qx = round(xs[i] * coordScale)
+            _writeSigned(buf, qt - last_t)
+            _writeSigned(buf, qx - last_x)
+            last_t, last_x = qt, qx
+            if ys is not None:
+                qy = round(ys[i] * coordScale)
+                _writeSigned(buf, qy - last_y)
+                last_y = qy
+
+        self.offsets.append(self.file.tell())
+        self.file.write(buf)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        indexOffset = self.file.tell()
+        offsets = self.offsets
+        if sys.byteorder == "big":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        self.file.write(offsets.tobytes())
+        self._writeHeader(indexOffset)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrackReader:
+
+    def __init__(self, path: str):
+
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._mmap
+
+        magic, version, _, timeScale, coordScale, _, count, indexOffset = (
+            HEADER.unpack_from(data, 0)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"不是轨迹记录文件: {path}")
+        if version > VERSION:
+            raise ValueError(f"不支持的轨迹记录版本: {version}")
+        self.timeScale = timeScale
+        self.coordScale = coordScale
+
+        if indexOffset:
+            self.offsets = array("Q")
+            self.offsets.frombytes(data[indexOffset : indexOffset + 8 * count])
+            if sys.byteorder == "big":
+                self.offsets.byteswap()
+            self.dataEnd = indexOffset
+        else:
+            # 写入进程未正常关闭，没有索引：顺序扫描一遍重建
+            self.offsets = array("Q")
+            pos = HEADER.size
+            while pos < len(data):
+                try:
+                    end = self._skip(pos)
+                except IndexError:
+                    break
+                self.offsets.append(pos)
+                pos = end
+            self.dataEnd = pos
+
+    def _skip(self, pos: int) -> int:
+        data = self._mmap
+        flags = data[pos]
+        n, pos = _readVarint(data, pos + 1)
+        size, pos = _readVarint(data, pos)
+        pos += size + START_TIME.size
+        for _ in range(n * (3 if flags & FLAG_HAS_Y else 2)):
+            _, pos = _readVarint(data, pos)
+        if pos > len(data):
+            raise IndexError
+        return pos
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> TrackRecord:
+
+        data = self._mmap
+        pos = self.offsets[index]
+        flags = data[pos]
+        n, pos = _readVarint(data, pos + 1)
+        size, pos = _readVarint(data, pos)
+        msg = data[pos : pos + size].decode("utf-8")
+        pos += size
+        (start,) = START_TIME.unpack_from(data, pos)
+        pos += START_TIME.size
+
+        has_y = flags & FLAG_HAS_Y
+        xs = array("d")
+        ts = array("d")
+        ys = array("d") if has_y else None
+        timeScale = self.timeScale
+        coordScale = self.coordScale
+        qt = qx = qy = 0
+        for _ in range(n):
+            delta, pos = _readSigned(data, pos)
+            qt += delta
+            delta, pos = _readSigned(data, pos)
+            qx += delta
+            ts.append(start + qt / timeScale)
+            xs.append(qx / coordScale)
+            if has_y:
+                delta, pos = _readSigned(data, pos)
+                qy += delta
+                ys.append(qy / coordScale)
+
+        return TrackRecord(
+            xs, ys, ts, bool(flags & FLAG_RESULT), msg.split("\n") if msg else []
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _copyColumn(values) -> array:
+    try:
+        return array("d", memoryview(values).tobytes())
+    except TypeError:
+        return array("d", values)
+
+
+class TrackRecorder:
+
+    def __init__(
+        self,
+        path: str,
+        simplifyEpsilon: Optional[float] = None,
+        flushInterval: float = 1.0,
+        **writerOptions,
+    ):
+        self.path = path
+        self.simplifyEpsilon = simplifyEpsilon
+        self.flushInterval = flushInterval
+        self.dropped = 0
+
+        self._writer = TrackWriter(path, **writerOptions)
+        self._queue = queue.Queue(maxsize=1024)
+        self._thread = threading.Thread(
+            target=self._run, name="TrackRecorder", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, xs, ys, ts, result: bool, msg: Sequence[str] = ()) -> None:
+
+        # GUI 线程只做一次内存拷贝，简化、编码和写盘都在后台线程完成
+        snapshot = (
+            _copyColumn(xs),
+            _copyColumn(ys) if ys is not None else None,
+            _copyColumn(ts),
+            result,
+            list(msg),
+        )
+        try:
+            self._queue.put_nowait(snapshot)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        writer = self._writer
+        dirty = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flushInterval)
+            except queue.Empty:
+                if dirty:
+                    writer.flush()
+                    dirty = False
+                continue
+            if item is None:
+                break
+            xs, ys, ts, result, msg = item
+            if self.simplifyEpsilon and len(xs) > 2:
+                keep = simplifyTrack(xs, ys, ts, self.simplifyEpsilon)
+                xs = [xs[i] for i in keep]
+                ts = [ts[i] for i in keep]
+                if ys is not None:
+                    ys = [ys[i] for i in keep]
+            writer.write(xs, ys, ts, result, msg)
+            dirty = True
+        writer.close()
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
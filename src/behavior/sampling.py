@@ -0,0 +1,95 @@
+import time
+from typing import Callable, Optional
+
+
+class InputSampler:
+
+    def __init__(
+        self,
+        sink: Callable[[float, float, float], Optional[str]],
+        resampleRate: Optional[float] = None,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ):
+        # sink(x, y, t) 接收整理后的采样，返回值非空表示下游要求中止拖动
+        self.sink = sink
+        self.resampleRate = resampleRate
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.coalesced = 0
+        self.emitted = 0
+        self._useEventTime: Optional[bool] = None
+        self._pending = None
+        self._last = None
+        self._origin = 0.0
+        self._gridIndex = 0
+        self._emittedTime = float("-inf")
+
+    def timestamp(self, eventTime: int = 0) -> float:
+        # 优先使用事件自带的时间戳（毫秒，单调），反映设备产生事件的时刻；
+        # 平台不提供时（为 0）整次拖动改用单调纳秒时钟，两种时钟不混用
+        if self._useEventTime is None:
+            self._useEventTime = eventTime > 0
+        if self._useEventTime:
+            return eventTime / 1000.0
+        return self.clock() / 1e9
+
+    def add(self, x: float, y: float, eventTime: int = 0) -> Optional[str]:
+
+        t = self.timestamp(eventTime)
+        pending = self._pending
+        if pending is not None and t <= pending[2]:
+            # 同一时刻合并的多个事件只保留最新位置，避免出现 dt 为 0 的采样
+            self._pending = (x, y, pending[2])
+            self.coalesced += 1
+            return None
+
+        reason = self._flush()
+        self._pending = (x, y, t)
+        return reason
+
+    def finish(self) -> Optional[str]:
+        reason = self._flush()
+        last = self._last
+        if self.resampleRate and last is not None and last[2] > self._emittedTime:
+            # 重采样时补上真实的终点，保证滑动距离和时长不受网格影响
+            reason = self._emit(*last) or reason
+        return reason
+
+    def _emit(self, x: float, y: float, t: float) -> Optional[str]:
+        self._emittedTime = t
+        self.emitted += 1
+        return self.sink(x, y, t)
+
+    def _flush(self) -> Optional[str]:
+
+        sample = self._pending
+        if sample is None:
+            return None
+        self._pending = None
+
+        last = self._last
+        self._last = sample
+        if not self.resampleRate:
+            return self._emit(*sample)
+
+        if last is None:
+            self._origin = sample[2]
+            self._gridIndex = 1
+            return self._emit(*sample)
+
+        # 在上一个和当前真实采样之间按固定频率线性插值，网格时间由起点推算，不累积误差
+        reason = None
+        step = 1.0 / self.resampleRate
+        x0, y0, t0 = last
+        x1, y1, t1 = sample
+        span = t1 - t0
+        grid = self._origin + self._gridIndex * step
+        while grid <= t1:
+            ratio = (grid - t0) / span
+            result = self._emit(x0 + (x1 - x0) * ratio, y0 + (y1 - y0) * ratio, grid)
+            reason = reason or result
+            self._gridIndex += 1
+            grid = self._origin + self._gridIndex * step
+        return reason
@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from .analyzer import analyzeTrack, flattenFailures
+from .recording import TrackReader, isTrackFile
+
+
+def parseRecord(record: dict):
+    # 支持列式 {"xs": [...], "ts": [...], "ys": [...]}，
+    # 也兼容滑块旧版 moveTrack 的 {"track": [[x, t], ...]}
+    if "track" in record:
+        track = record["track"]
+        xs = [p[0] for p in track]
+        ts = [p[-1] for p in track]
+        ys = [p[1] for p in track] if track and len(track[0]) > 2 else None
+    else:
+        xs = record["xs"]
+        ts = record["ts"]
+        ys = record.get("ys")
+    return xs, ts, ys
+
+
+def scoreRecord(record: dict) -> dict:
+    xs, ts, ys = parseRecord(record)
+    verdict = analyzeTrack(xs, ts, ys=ys)
+    return {
+        "id": record.get("id"),
+        "result": verdict["result"],
+        "msg": flattenFailures(verdict["failures"]),
+    }
+
+
+def _scoreTask(task):
+    outputs = []
+    samples = 0
+    bots = 0
+    if task[0] == "binary":
+        # 二进制语料只传文件路径和记录区间，由子进程自行 mmap 随机读取
+        _, path, start, stop = task
+        with TrackReader(path) as reader:
+            for index in range(start, stop):
+                record = reader[index]
+                verdict = analyzeTrack(record.xs, record.ts, ys=record.ys)
+                result = {
+                    "id": f"{path}#{index}",
+                    "result": verdict["result"],
+                    "msg": flattenFailures(verdict["failures"]),
+                }
+                samples += len(record.xs)
+                bots += not result["result"]
+                outputs.append(json.dumps(result, ensure_ascii=False))
+    else:
+        for line in task[1]:
+            record = json.loads(line)
+            result = scoreRecord(record)
+            samples += len(record.get("xs") or record.get("track") or ())
+            bots += not result["result"]
+            outputs.append(json.dumps(result, ensure_ascii=False))
+    return outputs, samples, bots
+
+
+def iterLines(path: str) -> Iterator[str]:
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            if line.strip():
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def iterTasks(paths: Iterable[str], batchSize: int) -> Iterator[tuple]:
+    for path in paths:
+        if path != "-" and isTrackFile(path):
+            with TrackReader(path) as reader:
+                count = len(reader)
+            for start in range(0, count, batchSize):
+                yield ("binary", path, start, min(start + batchSize, count))
+            continue
+
+        lines = iterLines(path)
+        while True:
+            batch = list(islice(lines, batchSize))
+            if not batch:
+                break
+            yield ("jsonl", batch)
+
+
+class ThroughputReporter:
+
+    def __init__(self, stream: TextIO, interval: float = 2.0):
+        self.stream = stream
+        self.interval = interval
+        self.startTime = time.perf_counter()
+        self.lastReport = self.startTime
+        self.tracks = 0
+        self.samples = 0
+        self.bots = 0
+
+    def add(self, tracks: int, samples: int, bots: int) -> None:
+        self.tracks += tracks
+        self.samples += samples
+        self.bots += bots
+        now = time.perf_counter()
+        if self.interval and now - self.lastReport >= self.interval:
+            self.lastReport = now
+            self.report(now)
+
+    def report(self, now: Optional[float] = None) -> None:
+        elapsed = max((now or time.perf_counter()) - self.startTime, 1e-9)
+        print(
+            f"已评分 {self.tracks} 条轨迹（判定为机器人 {self.bots} 条），"
+            f"{self.tracks / elapsed:.0f} 条/秒，{self.samples / elapsed:.0f} 采样/秒，"
+            f"耗时 {elapsed:.2f} 秒",
+            file=self.stream,
+        )
+
+
+def scoreCorpus(
+    paths: Iterable[str],
+    output: TextIO,
+    workers: Optional[int] = None,
+    batchSize: int = 512,
+    reporter: Optional[ThroughputReporter] = None,
+) -> ThroughputReporter:
+
+    workers = workers or os.cpu_count() or 1
+    reporter = reporter or ThroughputReporter(sys.stderr)
+    tasks = iterTasks(paths, batchSize)
+
+    def emit(result):
+        outputs, samples, bots = result
+        for line in outputs:
+            output.write(line)
+            output.write("\n")
+        reporter.add(len(outputs), samples, bots)
+
+    if workers == 1:
+        for task in tasks:
+            emit(_scoreTask(task))
+        return reporter
+
+    # 只保留有限个在途批次，输入按需读取，内存占用与语料大小无关；
+    # 按提交顺序取回结果，输出顺序与输入一致
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for task in tasks:
+            pending.append(executor.submit(_scoreTask, task))
+            if len(pending) >= workers * 2:
+                emit(pending.popleft().result())
+        while pending:
+            emit(pending.popleft().result())
+    return reporter
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.behavior.scorer",
+        description="离线批量评估滑动轨迹，每行输出一条 JSON 判定结果",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="JSONL 或二进制轨迹记录文件，- 表示标准输入"
+    )
+    parser.add_argument("-o", "--output", default="-", help="输出文件，默认标准输出")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="进程数，默认使用全部核心"
+    )
+    parser.add_argument("--batch-size", type=int, default=512, help="每个任务的轨迹数")
+    parser.add_argument(
+        "--report-interval", type=float, default=2.0, help="吞吐量报告间隔（秒）"
+    )
+    args = parser.parse_args(argv)
+
+    output = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    reporter = ThroughputReporter(sys.stderr, args.report_interval)
+    try:
+        scoreCorpus(args.inputs, output, args.workers, args.batch_size, reporter)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    reporter.report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
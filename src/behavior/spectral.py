@@ -0,0 +1,117 @@
+from .features import HAS_NUMPY, registerFeature
+
+if HAS_NUMPY:
+    import numpy as np
+
+# 频谱特征：轨迹按固定频率线性插值重采样后，对速度和加速度做一次加汉宁窗的 FFT。
+# 人手拖动带有 8~12Hz 的生理性震颤，速度曲线又接近平滑的最小加加速度曲线，能量集中在低频；
+# 脚本生成的轨迹要么几乎没有频谱能量（匀速），要么是接近白噪声的平坦频谱（随机抖动）
+SPECTRAL_RATE = 200.0
+TREMOR_BAND = (8.0, 12.0)
+LOW_BAND = 2.0
+
+# 时间预算：重采样点数上限为 8192（200Hz 下约 41 秒，更长的轨迹只分析开头），
+# FFT 的规模因此有上界，其余开销只有一次与采样数成正比的插值；
+# 十万个采样的轨迹整个阶段约 4 毫秒，可用 python -m src.behavior.benchmark 复核
+SPECTRAL_MAX_POINTS = 8192
+SPECTRAL_MIN_POINTS = 16
+
+SPECTRAL_FEATURES = (
+    "tremor_ratio",
+    "acc_tremor_ratio",
+    "speed_low_ratio",
+    "speed_flatness",
+    "acc_flatness",
+)
+
+
+def _periodogram(signal, tolerance):
+    signal = signal - signal.mean()
+    freqs = np.fft.rfftfreq(signal.size, 1.0 / SPECTRAL_RATE)
+    if np.abs(signal).max() <= tolerance:
+        # 匀速或静止时只剩舍入误差，按没有能量处理，避免舍入噪声被当成白噪声
+        return freqs[1:], np.zeros(freqs.size - 1)
+    power = np.abs(np.fft.rfft(signal * np.hanning(signal.size))) ** 2
+    # 去掉直流分量，只保留变化部分的能量
+    return freqs[1:], power[1:]
+
+
+@registerFeature("_spectra", cost=8)
+def _spectra(f):
+    # numpy 未安装或轨迹过短时返回 None，相关特征均为 0
+    if not HAS_NUMPY or len(f.xs) < 2 or f.ts[-1] <= f.ts[0]:
+        return None
+    ts = np.asarray(f.ts, dtype=np.float64)
+    xs = np.asarray(f.xs, dtype=np.float64)
+    count = min(int((ts[-1] - ts[0]) * SPECTRAL_RATE) + 1, SPECTRAL_MAX_POINTS)
+    if count < SPECTRAL_MIN_POINTS:
+        return None
+    grid = ts[0] + np.arange(count) / SPECTRAL_RATE
+    if xs.size > count:
+        # 输入频率高于重采样频率时先按时间分箱求均值再插值，相当于低通滤波，
+        # 避免高频的逐点噪声混叠进分析频段
+        bins = ((ts - ts[0]) * SPECTRAL_RATE).astype(np.int64)
+        bins = bins[bins < count]
+        sizes = np.bincount(bins, minlength=count)
+        filled = sizes > 0
+        binnedTs = np.bincount(bins, ts[: bins.size], count)[filled] / sizes[filled]
+        binnedXs = np.bincount(bins, xs[: bins.size], count)[filled] / sizes[filled]
+        # 保留真实的起点和终点，插值时两端不会被钳成水平段
+        ts = np.concatenate(([ts[0]], binnedTs, [ts[-1]]))
+        xs = np.concatenate(([xs[0]], binnedXs, [xs[-1]]))
+    position = np.interp(grid, ts, xs)
+    velocity = np.diff(position) * SPECTRAL_RATE
+    acceleration = np.diff(velocity) * SPECTRAL_RATE
+    # 位置的浮点舍入误差经过差分会被放大，低于该量级的变化视为没有能量
+    tolerance = 1e-9 * (float(np.abs(position).max()) + 1.0)
+    return {
+        "velocity": _periodogram(velocity, tolerance * SPECTRAL_RATE),
+        "acceleration": _periodogram(acceleration, tolerance * SPECTRAL_RATE**2),
+    }
+
+
+def _bandRatio(spectrum, low, high):
+    freqs, power = spectrum
+    total = float(power.sum())
+    if total <= 0:
+        return 0.0
+    return float(power[(freqs >= low) & (freqs <= high)].sum()) / total
+
+
+def _flatness(spectrum):
+    # 几何平均 / 算术平均：白噪声接近 1，能量集中在少数频率时接近 0
+    _, power = spectrum
+    mean = float(power.mean())
+    if mean <= 0:
+        return 0.0
+    return float(np.exp(np.log(power + mean * 1e-12).mean())) / mean
+
+
+@registerFeature("tremor_ratio", cost=1, requires=("_spectra",))
+def _tremorRatio(f):
+    spectra = f["_spectra"]
+    return _bandRatio(spectra["velocity"], *TREMOR_BAND) if spectra else 0.0
+
+
+@registerFeature("acc_tremor_ratio", cost=1, requires=("_spectra",))
+def _accTremorRatio(f):
+    spectra = f["_spectra"]
+    return _bandRatio(spectra["acceleration"], *TREMOR_BAND) if spectra else 0.0
+
+
+@registerFeature("speed_low_ratio", cost=1, requires=("_spectra",))
+def _speedLowRatio(f):
+    spectra = f["_spectra"]
+    return _bandRatio(spectra["velocity"], 0.0, LOW_BAND) if spectra else 0.0
+
+
+@registerFeature("speed_flatness", cost=1, requires=("_spectra",))
+def _speedFlatness(f):
+    spectra = f["_spectra"]
+    return _flatness(spectra["velocity"]) if spectra else 0.0
+
+
+@registerFeature("acc_flatness", cost=1, requires=("_spectra",))
+def _accFlatness(f):
+    spectra = f["_spectra"]
+    return _flatness(spectra["acceleration"]) if spectra else 0.0
@@ -0,0 +1,126 @@
+from math import sqrt
+from typing import Optional
+
+from .features import PAUSE_DISTANCE, PAUSE_INTERVAL
+from .thresholds import mergeThresholds
+
+
+class RunningStat:
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def std(self) -> float:
+        if self.count > 1:
+            var = self.m2 / (self.count - 1)
+            return sqrt(var) if var > 0 else 0
+        return 0
+
+
+class StreamingAnalyzer:
+
+    # 超过该速度（像素/秒）的单步移动不可能来自人手，直接判定
+    abortSpeed = 20000.0
+    # 计算单步速度时的最小时间间隔，避免同一时刻合并的事件被误判为超速
+    minSpeedInterval = 0.001
+
+    def __init__(self, thresholds: Optional[dict] = None):
+        # 与规则链使用同一份阈值，超时提前中止用 max_time
+        self.thresholds = mergeThresholds(thresholds)
+        self.maxDuration = self.thresholds["max_time"]
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.startX = 0.0
+        self.startTime = 0.0
+        self.lastX = 0.0
+        self.lastTime = 0.0
+
+        self.speedStat = RunningStat()
+        self.accStat = RunningStat()
+        self.jerkStat = RunningStat()
+        self.yStat = RunningStat()
+
+        self.backwardMoves = 0
+        self.pauses = 0
+
+        self._lastDt = 0.0
+        self._lastSpeed: Optional[float] = None
+        self._lastAcc: Optional[float] = None
+
+        self.abortReason: Optional[str] = None
+
+    def push(self, x: float, t: float, y: Optional[float] = None) -> Optional[str]:
+
+        if y is not None:
+            self.yStat.push(y)
+
+        if self.count == 0:
+            self.count = 1
+            self.startX = self.lastX = x
+            self.startTime = self.lastTime = t
+            return None
+
+        dx = x - self.lastX
+        dt = t - self.lastTime
+        abs_dx = abs(dx)
+
+        if dx < 0:
+            self.backwardMoves += 1
+        if dt > PAUSE_INTERVAL and abs_dx < PAUSE_DISTANCE:
+            self.pauses += 1
+
+        speed = abs_dx / dt if dt > 0 else 0
+        self.speedStat.push(speed)
+
+        # 与批量分析保持相同的下标对应关系：加速度和加加速度都除以上一段的时间间隔
+        if self._lastSpeed is not None:
+            acc = (speed - self._lastSpeed) / self._lastDt if self._lastDt > 0 else 0
+            self.accStat.push(acc)
+            if self._lastAcc is not None:
+                jerk = (acc - self._lastAcc) / self._lastDt if self._lastDt > 0 else 0
+                self.jerkStat.push(jerk)
+            self._lastAcc = acc
+
+        self._lastSpeed = speed
+        self._lastDt = dt
+        self.lastX = x
+        self.lastTime = t
+        self.count += 1
+
+        if self.abortReason is None:
+            if dx < 0:
+                self.abortReason = "回退滑动异常"
+            elif abs_dx / max(dt, self.minSpeedInterval) > self.abortSpeed:
+                self.abortReason = "滑动速度异常"
+            elif t - self.startTime > self.maxDuration:
+                self.abortReason = "滑动时间异常"
+            return self.abortReason
+        return None
+
+    def features(self) -> dict:
+
+        # 只返回能逐点精确累计、与批量分析结果一致的特征；速度突变次数和平均偏离量
+        # 取决于整条轨迹的平均速度和首尾连线，由 TrackFeatures 在松手后按缓冲的轨迹计算，
+        # 规则和按批量特征训练的模型看到的始终是同一套数值
+        return {
+            "total_time": self.lastTime - self.startTime,
+            "total_distance": abs(self.lastX - self.startX),
+            "backward_moves": self.backwardMoves,
+            "speed_std": self.speedStat.std(),
+            "acc_std": self.accStat.std(),
+            "jerk_std": self.jerkStat.std(),
+            "pauses": self.pauses,
+            "y_jitter": self.yStat.std(),
+        }
@@ -0,0 +1,150 @@
+import random
+from math import pi, sin
+from array import array
+from typing import Callable, Dict, Optional, Tuple
+
+# 合成轨迹生成器：给定采样数返回 (xs, ys, ts) 三列，供基准测试和规则调试使用
+# 时长固定在 1~2 秒左右，采样数越多相当于鼠标回报率越高
+
+Columns = Tuple[array, array, array]
+
+
+def _columns() -> Columns:
+    return array("d"), array("d"), array("d")
+
+
+def linearBot(
+    n: int, rng: Optional[random.Random] = None, distance: float = 200.0
+) -> Columns:
+    # 等间隔时间、等间隔位移的直线拖动
+    rng = rng or random.Random()
+    duration = rng.uniform(0.8, 1.5)
+    xs, ys, ts = _columns()
+    for i in range(n):
+        ratio = i / (n - 1) if n > 1 else 0
+        xs.append(10 + distance * ratio)
+        ys.append(16.0)
+        ts.append(duration * ratio)
+    return xs, ys, ts
+
+
+def constantSpeedBot(
+    n: int, rng: Optional[random.Random] = None, distance: float = 200.0
+) -> Columns:
+    # 事件间隔有抖动，但位置严格按匀速计算
+    rng = rng or random.Random()
+    duration = rng.uniform(0.8, 1.5)
+    gaps = [rng.uniform(0.5, 1.5) for _ in range(n - 1)]
+    scale = duration / sum(gaps) if gaps else 0
+    speed = distance / duration
+    xs, ys, ts = _columns()
+    t = 0.0
+    for i in range(n):
+        if i:
+            t += gaps[i - 1] * scale
+        xs.append(10 + speed * t)
+        ys.append(16.0)
+        ts.append(t)
+    return xs, ys, ts
+
+
+def steppedBot(
+    n: int, rng: Optional[random.Random] = None, distance: float = 200.0
+) -> Columns:
+    # 每隔若干个采样跳一格，形成阶梯状的位置曲线
+    rng = rng or random.Random()
+    duration = rng.uniform(0.8, 1.5)
+    steps = max(1, min(n // 4, 20))
+    xs, ys, ts = _columns()
+    for i in range(n):
+        ratio = i / (n - 1) if n > 1 else 0
+        xs.append(10 + distance * int(ratio * steps) / steps)
+        ys.append(16.0)
+        ts.append(duration * ratio)
+    return xs, ys, ts
+
+
+def minimumJerkHuman(
+    n: int, rng: Optional[random.Random] = None, distance: float = 200.0
+) -> Columns:
+    # 最小加加速度速度曲线 s(τ) = 10τ³ - 15τ⁴ + 6τ⁵，叠加 8~12Hz 的生理性震颤、
+    # 位置噪声、纵向抖动和几次停顿
+    rng = rng or random.Random()
+    duration = rng.uniform(1.0, 2.0)
+    tremor = rng.uniform(8.0, 12.0)
+    tremorAmplitude = rng.uniform(0.3, 0.8)
+    phase = rng.uniform(0, 2 * pi)
+    pauses = {rng.randrange(1, n) for _ in range(rng.randint(1, 3))} if n > 1 else set()
+    gaps = [rng.uniform(0.5, 1.5) for _ in range(n - 1)]
+    scale = duration / sum(gaps) if gaps else 0
+    xs, ys, ts = _columns()
+    t = 0.0
+    x = 10.0
+    hold = 0
+    for i in range(n):
+        if i:
+            t += gaps[i - 1] * scale
+            if i in pauses:
+                t += rng.uniform(0.12, 0.3)
+                hold = 2
+        tau = t / duration if duration else 0
+        tau = min(tau, 1.0)
+        target = 10 + distance * (10 * tau**3 - 15 * tau**4 + 6 * tau**5)
+        if hold:
+            hold -= 1
+        else:
+            shake = tremorAmplitude * sin(2 * pi * tremor * t + phase)
+            x = max(x, target + shake + rng.gauss(0, 0.8))
+        xs.append(x)
+        ys.append(16 + rng.gauss(0, 0.6))
+        ts.append(t)
+    return xs, ys, ts
+
+
+def randomProfile(rng: Optional[random.Random] = None, knots: int = 8) -> list:
+    # 随机的单调进度曲线（0~1 之间的折线节点），模拟机器人预先录好的一条轨迹；
+    # 各段位移差异较大，接近停顿的段和快速冲刺的段都会出现
+    rng = rng or random.Random()
+    steps = [rng.uniform(0.05, 1.0) ** 2 for _ in range(knots)]
+    total = sum(steps)
+    profile = [0.0]
+    for step in steps:
+        profile.append(profile[-1] + step / total)
+    return profile
+
+
+def replayBot(
+    n: int,
+    rng: Optional[random.Random] = None,
+    distance: float = 200.0,
+    profile: Optional[list] = None,
+    noise: float = 0.6,
+) -> Columns:
+    # 按同一条进度曲线重放，每次的距离、时长、事件间隔和位置噪声都不同
+    rng = rng or random.Random()
+    profile = profile or randomProfile(rng)
+    segments = len(profile) - 1
+    duration = rng.uniform(0.8, 1.8)
+    gaps = [rng.uniform(0.5, 1.5) for _ in range(n - 1)]
+    scale = duration / sum(gaps) if gaps else 0
+    xs, ys, ts = _columns()
+    t = 0.0
+    for i in range(n):
+        if i:
+            t += gaps[i - 1] * scale
+        position = min(t / duration, 1.0) * segments if duration else 0
+        k = min(int(position), segments - 1)
+        ratio = profile[k] + (profile[k + 1] - profile[k]) * (position - k)
+        xs.append(10 + distance * ratio + rng.gauss(0, noise))
+        ys.append(16 + rng.gauss(0, noise))
+        ts.append(t)
+    return xs, ys, ts
+
+
+GENERATORS: Dict[str, Callable[..., Columns]] = {
+    "linear": linearBot,
+    "constant": constantSpeedBot,
+    "stepped": steppedBot,
+    "human": minimumJerkHuman,
+    "replay": replayBot,
+}
@@ -0,0 +1,419 @@
+import json
+from collections import namedtuple
+from math import ceil, inf, sqrt
+from typing import Iterable, List, Optional, Sequence
+
+from .analyzer import Stage
+from .features import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+TEMPLATE_VERSION = 1
+
+# 重放固定轨迹的机器人每次的距离、时长和噪声都不同，但归一化后的进度曲线几乎一致：
+# 轨迹按时间均匀重采样为定长序列，位置换算为从起点到终点的进度（0~1），再用 DTW 比较
+DEFAULT_LENGTH = 64
+DEFAULT_BAND = 0.05
+# 按合成数据校准：1000~10000 个重放模板下，300 条最小加加速度人类轨迹无一命中，
+# 重放轨迹的召回率约 75%；放宽到 0.008 时召回接近 100%，但约 11% 的人类轨迹被误判
+DEFAULT_MAX_DISTANCE = 0.0045
+
+# 模板数少于该值时不分簇，直接对全部模板算下界
+CLUSTER_MIN_TEMPLATES = 64
+PAA_SEGMENTS = 8
+# 批量计算前先逐个计算的候选数，用来尽快收紧最优距离
+SEED_CANDIDATES = 4
+
+TemplateMatch = namedtuple("TemplateMatch", ["name", "index", "distance"])
+
+
+def normalizeTrack(
+    xs: Sequence[float], ts: Sequence[float], length: int = DEFAULT_LENGTH
+) -> Optional[List[float]]:
+
+    n = len(xs)
+    if n < 2 or ts[-1] <= ts[0]:
+        return None
+    start = xs[0]
+    span = xs[-1] - start
+    if abs(span) < 1e-9:
+        return None
+
+    t0 = ts[0]
+    step = (ts[-1] - t0) / (length - 1)
+    series = []
+    j = 0
+    for k in range(length):
+        t = t0 + k * step
+        while j < n - 2 and ts[j + 1] < t:
+            j += 1
+        dt = ts[j + 1] - ts[j]
+        ratio = (t - ts[j]) / dt if dt > 0 else 0.0
+        ratio = min(max(ratio, 0.0), 1.0)
+        x = xs[j] + (xs[j + 1] - xs[j]) * ratio
+        series.append((x - start) / span)
+    return series
+
+
+def envelope(series: Sequence[float], radius: int):
+    # LB_Keogh 用的上下包络：每个点取 Sakoe–Chiba 带宽内的最大值和最小值
+    n = len(series)
+    upper = []
+    lower = []
+    for i in range(n):
+        window = series[max(0, i - radius) : min(n, i + radius + 1)]
+        upper.append(max(window))
+        lower.append(min(window))
+    return upper, lower
+
+
+def lbKeogh(
+    query: Sequence[float],
+    upper: Sequence[float],
+    lower: Sequence[float],
+    limit: float = inf,
+) -> float:
+
+    # 查询序列落在模板包络外的部分的平方和，是带约束 DTW 距离的下界；超过 limit 提前返回
+    total = 0.0
+    for q, u, l in zip(query, upper, lower):
+        if q > u:
+            total += (q - u) * (q - u)
+        elif q < l:
+            total += (l - q) * (l - q)
+        else:
+            continue
+        if total >= limit:
+            return total
+    return total
+
+
+def dtwDistance(
+    a: Sequence[float],
+    b: Sequence[float],
+    radius: int,
+    limit: float = inf,
+    tail: Optional[Sequence[float]] = None,
+) -> float:
+
+    # 平方代价的 DTW，只计算 Sakoe–Chiba 带宽内的格子；
+    # tail[i] 为第 i 行及以后各行代价的下界之和（来自 LB_Keogh 的逐点项），
+    # 当前行的最小累计值加上剩余行的下界已超过 limit 时放弃
+    n = len(a)
+    prev = [inf] * (n + 1)
+    prev[0] = 0.0
+    for i in range(1, n + 1):
+        cur = [inf] * (n + 1)
+        ai = a[i - 1]
+        rowMin = inf
+        for j in range(max(1, i - radius), min(n, i + radius) + 1):
+            d = ai - b[j - 1]
+            best = prev[j - 1]
+            if prev[j] < best:
+                best = prev[j]
+            if cur[j - 1] < best:
+                best = cur[j - 1]
+            value = cur[j] = d * d + best
+            if value < rowMin:
+                rowMin = value
+        if rowMin + (tail[i] if tail is not None else 0.0) >= limit:
+            return inf
+        prev = cur
+    return prev[n]
+
+
+class TemplateLibrary:
+
+    def __init__(
+        self,
+        length: int = DEFAULT_LENGTH,
+        band: float = DEFAULT_BAND,
+        maxDistance: float = DEFAULT_MAX_DISTANCE,
+    ):
+        # band 为带宽占序列长度的比例；maxDistance 为逐点均方根距离，超过即视为不匹配
+        if length < 2:
+            raise ValueError("模板长度至少为 2")
+        self.length = length
+        self.band = band
+        self.radius = max(1, int(round(band * length)))
+        self.maxDistance = maxDistance
+
+        self.names: List[str] = []
+        self.series: List[List[float]] = []
+        self._envelopes = []
+        self._index = None
+        self.stats = {
+            "queries": 0,
+            "clusters_pruned": 0,
+            "lb_pruned": 0,
+            "dtw": 0,
+            "abandoned": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def add(
+        self, xs: Sequence[float], ts: Sequence[float], name: Optional[str] = None
+    ) -> bool:
+        series = normalizeTrack(xs, ts, self.length)
+        if series is None:
+            return False
+        self.addSeries(series, name)
+        return True
+
+    def addSeries(self, series: Sequence[float], name: Optional[str] = None) -> None:
+        if len(series) != self.length:
+            raise ValueError(f"模板长度应为 {self.length}，实际为 {len(series)}")
+        series = [float(value) for value in series]
+        self.names.append(name if name is not None else f"template-{len(self.series)}")
+        self.series.append(series)
+        self._envelopes.append(envelope(series, self.radius))
+        self._index = None
+
+    def addRecords(self, records: Iterable) -> int:
+        # 从录制文件（TrackReader）中挑出判为机器人的轨迹作为模板
+        added = 0
+        for i, record in enumerate(records):
+            if not record.result and self.add(record.xs, record.ts, f"record-{i}"):
+                added += 1
+        return added
+
+    def match(self, xs: Sequence[float], ts: Sequence[float]):
+        series = normalizeTrack(xs, ts, self.length)
+        if series is None:
+            return None
+        return self.nearest(series)
+
+    def nearest(
+        self, series: Sequence[float], maxDistance: Optional[float] = None
+    ) -> Optional[TemplateMatch]:
+
+        # 返回距离不超过 maxDistance 的最近模板；比较前先用下界排除，只对剩下的候选算 DTW
+        if maxDistance is None:
+            maxDistance = self.maxDistance
+        self.stats["queries"] += 1
+        if not self.series:
+            return None
+        limit = maxDistance * maxDistance * self.length
+        if HAS_NUMPY:
+            best, index = self._searchIndexed(series, limit)
+        else:
+            best, index = self._searchLinear(series, limit)
+        if index is None:
+            return None
+        return TemplateMatch(self.names[index], index, sqrt(best / self.length))
+
+    def _refine(self, series, candidates, bounds, best, index, tails=None):
+        # candidates 已按下界升序排列，下界不小于当前最优距离后其余候选都不可能更近
+        for position, (candidate, bound) in enumerate(zip(candidates, bounds)):
+            if bound >= best:
+                self.stats["lb_pruned"] += len(candidates) - position
+                break
+            self.stats["dtw"] += 1
+            tail = tails[position].tolist() if tails is not None else None
+            distance = dtwDistance(
+                series, self.series[candidate], self.radius, best, tail
+            )
+            if distance == inf:
+                self.stats["abandoned"] += 1
+            elif distance < best:
+                best, index = distance, candidate
+        return best, index
+
+    def _searchLinear(self, series, limit):
+        bounds = [
+            lbKeogh(series, upper, lower, limit) for upper, lower in self._envelopes
+        ]
+        order = sorted(range(len(bounds)), key=bounds.__getitem__)
+        return self._refine(series, order, [bounds[i] for i in order], limit, None)
+
+    def _buildIndex(self):
+        # 模板按 PAA 粗粒度特征做几轮 k-means 分簇，簇包络取成员包络的并集，
+        # 查询对簇包络的下界不超过对任一成员的下界，整簇可以一次排除
+        data = np.asarray(self.series)
+        upper = np.asarray([env[0] for env in self._envelopes])
+        lower = np.asarray([env[1] for env in self._envelopes])
+        count = len(self.series)
+        if count < CLUSTER_MIN_TEMPLATES:
+            members = [np.arange(count)]
+        else:
+            segments = min(PAA_SEGMENTS, self.length)
+            paa = np.stack(
+                [chunk.mean(axis=1) for chunk in np.array_split(data, segments, 1)],
+                axis=1,
+            )
+            k = int(ceil(sqrt(count)))
+            order = np.argsort(paa.mean(axis=1), kind="stable")
+            centers = paa[order[np.linspace(0, count - 1, k).astype(int)]]
+            for _ in range(8):
+                distances = ((paa[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+                labels = distances.argmin(axis=1)
+                for c in range(k):
+                    chosen = labels == c
+                    if chosen.any():
+                        centers[c] = paa[chosen].mean(axis=0)
+            members = [np.flatnonzero(labels == c) for c in range(k)]
+            members = [indices for indices in members if len(indices)]
+        self._index = (
+            data,
+            upper,
+            lower,
+            members,
+            np.asarray([upper[indices].max(axis=0) for indices in members]),
+            np.asarray([lower[indices].min(axis=0) for indices in members]),
+        )
+
+    def _searchIndexed(self, series, limit):
+        if self._index is None:
+            self._buildIndex()
+        data, upper, lower, members, clusterUpper, clusterLower = self._index
+        query = np.asarray(series, dtype=np.float64)
+
+        # 阈值固定，先用簇包络整簇排除，剩余候选一次性向量化计算下界
+        clusterBounds = _lbTerms(query, clusterUpper, clusterLower).sum(axis=1)
+        survivors = np.flatnonzero(clusterBounds < limit)
+        self.stats["clusters_pruned"] += len(members) - len(survivors)
+        if not len(survivors):
+            return limit, None
+        indices = np.concatenate([members[cluster] for cluster in survivors])
+
+        terms = _lbTerms(query, upper[indices], lower[indices])
+        bounds = terms.sum(axis=1)
+        keep = bounds < limit
+        self.stats["lb_pruned"] += len(indices) - int(keep.sum())
+        indices, terms, bounds = indices[keep], terms[keep], bounds[keep]
+        if not len(indices):
+            return limit, None
+
+        # LB_Improved：查询投影到模板包络上，模板对投影序列包络的下界可以叠加
+        projected = np.clip(query, lower[indices], upper[indices])
+        projectedUpper, projectedLower = _envelopes(projected, self.radius)
+        bounds = bounds + _lbTerms(data[indices], projectedUpper, projectedLower).sum(
+            axis=1
+        )
+
+        ranked = np.argsort(bounds, kind="stable")
+        indices, terms, bounds = indices[ranked], terms[ranked], bounds[ranked]
+        tails = np.zeros((len(indices), self.length + 1))
+        tails[:, :-1] = np.cumsum(terms[:, ::-1], axis=1)[:, ::-1]
+
+        # 先对下界最小的几个候选逐个算 DTW，命中后用更小的最优距离再筛一遍，
+        # 剩余候选批量计算
+        seeds = SEED_CANDIDATES
+        best, index = self._refine(
+            series,
+            indices[:seeds].tolist(),
+            bounds[:seeds].tolist(),
+            limit,
+            None,
+            tails[:seeds],
+        )
+        keep = bounds[seeds:] < best
+        self.stats["lb_pruned"] += len(keep) - int(keep.sum())
+        rest = indices[seeds:][keep]
+        if not len(rest):
+            return best, index
+        self.stats["dtw"] += len(rest)
+        distances = _dtwBatch(
+            query, data[rest], self.radius, best, tails[seeds:][keep]
+        )
+        self.stats["abandoned"] += int(np.isinf(distances).sum())
+        position = int(distances.argmin())
+        if distances[position] < best:
+            return float(distances[position]), int(rest[position])
+        return best, index
+
+    def stage(self, name: str = "template", cost: float = 10.0) -> Stage:
+        # 代价较高，排在内置规则之后，只有规则都通过的轨迹才会查模板库
+        def check(f):
+            if self.match(f.xs, f.ts) is not None:
+                return "轨迹与已知机器人模板相似"
+            return None
+
+        return Stage(name, check, cost=cost)
+
+    def save(self, path: str) -> None:
+        config = {
+            "version": TEMPLATE_VERSION,
+            "length": self.length,
+            "band": self.band,
+            "max_distance": self.maxDistance,
+            "templates": [
+                {"name": name, "series": [round(value, 6) for value in series]}
+                for name, series in zip(self.names, self.series)
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "TemplateLibrary":
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        if config.get("version", TEMPLATE_VERSION) > TEMPLATE_VERSION:
+            raise ValueError(f"不支持的模板库版本: {config['version']}")
+        library = cls(
+            config.get("length", DEFAULT_LENGTH),
+            config.get("band", DEFAULT_BAND),
+            config.get("max_distance", DEFAULT_MAX_DISTANCE),
+        )
+        for template in config.get("templates", []):
+            library.addSeries(template["series"], template.get("name"))
+        return library
+
+
+def _dtwBatch(query, candidates, radius, limit, tails):
+
+    # 同一查询对一批等长候选同时计算带约束 DTW，只存带宽内的格子：
+    # 第 i 行第 k 格对应列 j = i - radius + k。行内递推 cur[j] = c[j] + min(m[j], cur[j-1])
+    # 等价于 cur = C + 前缀最小值(m - C + c)，C 为 c 的前缀和，整行可以向量化
+    count, n = candidates.shape
+    width = 2 * radius + 1
+    padded = np.pad(candidates, ((0, 0), (radius, radius)))
+    alive = np.arange(count)
+    distances = np.full(count, np.inf)
+    prev = np.full((count, width + 1), np.inf)
+    start = np.full((1, width), np.inf)
+    start[0, radius] = 0.0
+    for i in range(n):
+        cost = (query[i] - padded[:, i : i + width]) ** 2
+        left = max(0, radius - i)
+        right = min(width, n - i + radius)
+        cost[:, :left] = 0.0
+        cost[:, right:] = 0.0
+        m = start if i == 0 else np.minimum(prev[:, :width], prev[:, 1:])
+        total = np.cumsum(cost, axis=1)
+        cur = total + np.minimum.accumulate(m - total + cost, axis=1)
+        cur[:, :left] = np.inf
+        prev[:, :width] = cur
+        # 每隔几行淘汰一次当前行最小值加剩余下界已超过阈值的候选，缩小后续计算量
+        if i % 8 == 7 and i < n - 1:
+            rowMin = cur[:, left:right].min(axis=1)
+            keep = rowMin + tails[:, i + 1] < limit
+            if not keep.all():
+                alive, prev, padded, tails = (
+                    alive[keep],
+                    prev[keep],
+                    padded[keep],
+                    tails[keep],
+                )
+                if not len(alive):
+                    return distances
+    distances[alive] = prev[:, radius]
+    return distances
+
+
+def _envelopes(rows, radius):
+    # 按行计算带宽内的滑动最大值和最小值；两端用边界值填充，不改变截断窗口的极值
+    padded = np.pad(rows, ((0, 0), (radius, radius)), mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1, axis=1)
+    return windows.max(axis=2), windows.min(axis=2)
+
+
+def _lbTerms(query, upper, lower):
+    # LB_Keogh 的逐点项，query 和包络任一方可以是按行堆叠的矩阵
+    above = np.clip(query - upper, 0, None)
+    below = np.clip(lower - query, 0, None)
+    return above * above + below * below
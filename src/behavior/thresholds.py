@@ -0,0 +1,100 @@
+import json
+from typing import Optional
+
+CONFIG_VERSION = 1
+
+# 默认值即最初写死在滑块里的判定阈值；形如 base + total_distance / divisor 的阈值拆成两个参数
+DEFAULT_THRESHOLDS = {
+    "min_samples": 15,
+    "min_distance": 5,
+    "min_time": 0.3,
+    "max_time": 5.0,
+    "extreme_time": 0.8,
+    "extreme_deviation": 1,
+    "extreme_speed_std": 5,
+    "speed_std_base": 10,
+    "speed_std_divisor": 50,
+    "acc_std_base": 50,
+    "acc_std_divisor": 10,
+    "jerk_std_base": 200,
+    "jerk_std_divisor": 5,
+    "pause_base": 1,
+    "pause_divisor": 100,
+    "deviation_base": 2,
+    "deviation_divisor": 30,
+    "abrupt_min": 2,
+    "vote_need": 3,
+}
+
+# 判定所需的全部特征，校准工具按这些名字缓存每条轨迹的特征
+THRESHOLD_FEATURES = (
+    "sample_count",
+    "total_time",
+    "total_distance",
+    "backward_moves",
+    "speed_std",
+    "acc_std",
+    "jerk_std",
+    "abrupt_changes",
+    "pauses",
+    "avg_deviation",
+)
+
+
+def mergeThresholds(thresholds: Optional[dict] = None) -> dict:
+    merged = dict(DEFAULT_THRESHOLDS)
+    if thresholds:
+        unknown = set(thresholds) - set(DEFAULT_THRESHOLDS)
+        if unknown:
+            raise ValueError(f"未知的阈值参数: {', '.join(sorted(unknown))}")
+        merged.update(thresholds)
+    return merged
+
+
+def loadThresholds(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    if config.get("version", CONFIG_VERSION) > CONFIG_VERSION:
+        raise ValueError(f"不支持的阈值配置版本: {config['version']}")
+    return mergeThresholds(config.get("thresholds", {}))
+
+
+def saveThresholds(thresholds: dict, path: str, metrics: Optional[dict] = None) -> None:
+    config = {"version": CONFIG_VERSION, "thresholds": mergeThresholds(thresholds)}
+    if metrics:
+        config["metrics"] = metrics
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def voteCount(f, t: dict):
+    # 同时适用于单条轨迹的特征字典和按列存放的 numpy 特征数组
+    distance = f["total_distance"]
+    votes = (
+        f["speed_std"] < t["speed_std_base"] + distance / t["speed_std_divisor"],
+        f["acc_std"] < t["acc_std_base"] + distance / t["acc_std_divisor"],
+        f["jerk_std"] < t["jerk_std_base"] + distance / t["jerk_std_divisor"],
+        f["pauses"] < t["pause_base"] + distance / t["pause_divisor"],
+        f["avg_deviation"] < t["deviation_base"] + distance / t["deviation_divisor"],
+        f["abrupt_changes"] < t["abrupt_min"],
+    )
+    return sum(vote * 1 for vote in votes)
+
+
+def botMask(f, t: dict):
+    # 与 buildPipeline 生成的规则链判定结果一致，只是不区分具体是哪条规则命中
+    total_time = f["total_time"]
+    return (
+        (f["sample_count"] < t["min_samples"])
+        | (f["total_distance"] < t["min_distance"])
+        | (total_time < t["min_time"])
+        | (total_time > t["max_time"])
+        | (f["backward_moves"] > 0)
+        | (
+            (total_time < t["extreme_time"])
+            & (f["avg_deviation"] < t["extreme_deviation"])
+            & (f["speed_std"] < t["extreme_speed_std"])
+        )
+        | (voteCount(f, t) >= t["vote_need"])
+    )
@@ -0,0 +1,81 @@
+from array import array
+
+
+class TrackBuffer:
+
+    __slots__ = ("capacity", "stride", "_x", "_y", "_t", "_size", "_seen", "_tail")
+
+    def __init__(self, capacity: int = 4096):
+        if capacity < 4:
+            raise ValueError("轨迹缓冲区容量至少为 4")
+        self.capacity = capacity
+        # 三列各自预分配，单次拖动的内存固定为 3 * 8 * capacity 字节
+        self._x = array("d", bytes(8 * capacity))
+        self._y = array("d", bytes(8 * capacity))
+        self._t = array("d", bytes(8 * capacity))
+        self.clear()
+
+    def clear(self) -> None:
+        self.stride = 1
+        self._size = 0
+        self._seen = 0
+        self._tail = False
+
+    @property
+    def nbytes(self) -> int:
+        return 3 * self._x.itemsize * self.capacity
+
+    def append(self, x: float, y: float, t: float) -> None:
+
+        # 不在步长上的采样只占用末尾一个临时槽位，保证终点始终是最新的采样
+        if self._tail:
+            self._size -= 1
+            self._tail = False
+
+        if self._size == self.capacity:
+            self._compact()
+
+        keep = self._seen % self.stride == 0
+        self._seen += 1
+
+        i = self._size
+        self._x[i] = x
+        self._y[i] = y
+        self._t[i] = t
+        self._size += 1
+        self._tail = not keep
+
+    def _compact(self) -> None:
+        # 容量用尽时保留偶数位置的采样并把步长翻倍，之后的采样也按同样步长保留，
+        # 因此降采样结果只取决于输入序列
+        half = (self._size + 1) // 2
+        for column in (self._x, self._y, self._t):
+            column[:half] = column[0 : self._size : 2]
+        self._size = half
+        self.stride *= 2
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("轨迹下标越界")
+        return self._x[index], self._y[index], self._t[index]
+
+    def snapshot(self):
+        size = self._size
+        return self._x[:size], self._y[:size], self._t[:size]
+
+    @property
+    def xs(self) -> memoryview:
+        return memoryview(self._x)[: self._size]
+
+    @property
+    def ys(self) -> memoryview:
+        return memoryview(self._y)[: self._size]
+
+    @property
+    def ts(self) -> memoryview:
+        return memoryview(self._t)[: self._size]
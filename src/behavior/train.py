@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from .calibrate import buildFeatureTable, iterLabelled
+from .features import HAS_NUMPY
+from .model import DEFAULT_MODEL_FEATURES, fitLogistic, saveModel
+
+if HAS_NUMPY:
+    import numpy as np
+
+# 模型训练命令行；与 model 分开，包的 __init__ 导入 model 时不会带进训练用的多进程模块，
+# 也不会在 python -m 运行时重复导入
+
+
+def thresholdForFpr(probabilities, labels, maxFpr: float) -> float:
+    # 人类轨迹的概率按降序排列，取误判率不超过 maxFpr 的最低阈值
+    probabilities = np.asarray(probabilities)
+    humans = np.sort(probabilities[~np.asarray(labels, dtype=bool)])[::-1]
+    allowed = int(maxFpr * humans.size)
+    if allowed >= humans.size:
+        return 0.0
+    return float(np.nextafter(humans[allowed], 1.0))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.behavior.train",
+        description="在标注好的人类/机器人轨迹语料上训练逻辑回归模型，输出可供滑块加载的模型文件",
+    )
+    parser.add_argument("inputs", nargs="*", help="记录中带 label 字段的 JSONL 文件")
+    parser.add_argument("--human", action="append", default=[], help="全部为人类的轨迹文件")
+    parser.add_argument("--bot", action="append", default=[], help="全部为机器人的轨迹文件")
+    parser.add_argument(
+        "--features",
+        default=",".join(DEFAULT_MODEL_FEATURES),
+        help="逗号分隔的特征名",
+    )
+    parser.add_argument("--l2", type=float, default=1e-3, help="L2 正则系数")
+    parser.add_argument("--max-fpr", type=float, default=0.01, help="允许的人类误判率")
+    parser.add_argument(
+        "-o", "--output", default="model.json", help="模型输出路径（.json 或 .npz）"
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="进程数，默认使用全部核心"
+    )
+    args = parser.parse_args(argv)
+
+    if not HAS_NUMPY:
+        parser.error("训练模型需要 numpy")
+    if not (args.inputs or args.human or args.bot):
+        parser.error("至少需要一个输入文件")
+    names = tuple(name for name in args.features.split(",") if name)
+
+    tracks = iterLabelled(args.inputs, args.human, args.bot)
+    table = buildFeatureTable(tracks, args.workers or os.cpu_count() or 1, names=names)
+    labels = np.asarray(table["labels"], dtype=bool)
+    if labels.all() or not labels.any():
+        parser.error("训练数据需要同时包含人类和机器人轨迹")
+    matrix = np.column_stack([table["features"][name] for name in names])
+
+    model = fitLogistic(matrix, labels, names, l2=args.l2)
+    probabilities = model.predict(matrix)
+    model.threshold = thresholdForFpr(probabilities, labels, args.max_fpr)
+    predicted = probabilities >= model.threshold
+    tpr = float(predicted[labels].mean())
+    fpr = float(predicted[~labels].mean())
+    model.metadata = {"tracks": int(labels.size), "tpr": tpr, "fpr": fpr}
+    saveModel(model, args.output)
+    print(
+        f"已写入 {args.output}：阈值 {model.threshold:.4f}，召回率 {tpr:.4f}，误判率 {fpr:.4f}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
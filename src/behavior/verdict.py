@@ -0,0 +1,60 @@
+from types import MappingProxyType
+from typing import Iterable, Optional
+
+
+class Verdict:
+
+    # 每次拖动只生成一个判定结果，创建后不可修改，可以放心跨线程、跨信号传递
+    __slots__ = ("result", "value", "endTime", "msg", "features")
+
+    def __init__(
+        self,
+        result: bool,
+        value: int = 0,
+        endTime: float = 0,
+        msg: Iterable[str] = (),
+        features: Optional[dict] = None,
+    ):
+        object.__setattr__(self, "result", bool(result))
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "endTime", endTime)
+        object.__setattr__(self, "msg", tuple(msg))
+        object.__setattr__(self, "features", MappingProxyType(dict(features or {})))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Verdict 不可修改")
+
+    def __delattr__(self, name):
+        raise AttributeError("Verdict 不可修改")
+
+    # 兼容旧版 resultDict 的用法：verdict["result"]、verdict["msg"]、dict(verdict)
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        return ("result", "value", "endTime", "msg")
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __eq__(self, other):
+        if not isinstance(other, Verdict):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __hash__(self):
+        return hash((self.result, self.value, self.endTime, self.msg))
+
+    def __repr__(self):
+        return (
+            f"Verdict(result={self.result}, value={self.value}, "
+            f"endTime={self.endTime}, msg={list(self.msg)})"
+        )
+
+    def asDict(self) -> dict:
+        # 与旧版 resultDict 相同的可修改字典，msg 为列表
+        result = {key: getattr(self, key) for key in self.keys()}
+        result["msg"] = list(self.msg)
+        return result
@@ -1,30 +1,26 @@
-import sys
 import random
 import math
-from PySide6.QtWidgets import (
-    QApplication,
-    QWidget,
-    QSlider,
-    QMessageBox,
-    QVBoxLayout,
-    QHBoxLayout,
-    QPushButton,
-)
+from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import (
     Qt,
+    Signal,
     QPropertyAnimation,
     QEasingCurve,
     QPoint,
     QRectF,
-    QUrl,
     Property,
     QPointF,
 )
 from PySide6.QtGui import QPixmap, QPainter, QColor, QFont, QPen, QPainterPath
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+
+from src.components.dirty import drawDirtyRects, touchesCorners, updateMoved
+from src.components.images import RANDOM_IMAGE_URL, imagePool
 
 
 class VerificationImage(QWidget):
+
+    imageLoaded = Signal()
+
     
 
     def __init__(self, parent=None):
@@ -35,9 +31,6 @@ class VerificationImage(QWidget):
         self.setFixedSize(self._width, self._height)
 
         
-        self.network_manager = QNetworkAccessManager(self)
-        self.network_manager.finished.connect(self.on_image_downloaded)
-
         
         self.currentImage = QPixmap(self._width, self._height)
         self.currentImage.fill(QColor(200, 200, 200))
@@ -55,41 +48,30 @@ class VerificationImage(QWidget):
 
         
         self.sliderPixmap = None
+        self.backgroundLayer = None
 
         
         self.loading = True
 
         
-        self.load_image_from_url("https://api.elaina.cat/random/pc")
+        self.load_image_from_url(RANDOM_IMAGE_URL)
 
     def load_image_from_url(self, url: str):
         self.loading = True
         self.update()
-        request = QNetworkRequest(QUrl(url))
-        self.network_manager.get(request)
+        imagePool(url).request(self.on_image_loaded)
 
-    def on_image_downloaded(self, reply: QNetworkReply):
-        if reply.error() != QNetworkReply.NetworkError.NoError:
-            print(f"网络错误: {reply.errorString()}，使用本地图片备选")
+    def on_image_loaded(self, image, error):
+        if image is None:
+            print(f"{error}，使用本地图片备选")
             self.fallback_to_local_image()
         else:
-            data = reply.readAll()
-            pixmap = QPixmap()
-            if not pixmap.loadFromData(data):
-                print("图片数据解析失败，使用本地图片备选")
-                self.fallback_to_local_image()
-            else:
-                self.currentImage = pixmap.scaled(
-                    self._width,
-                    self._height,
-                    Qt.AspectRatioMode.IgnoreAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                
-                self.generate_circle_and_gap()
-                self.loading = False
-                self.update()
-        reply.deleteLater()
+            self.currentImage = QPixmap.fromImage(image)
+            
+            self.generate_circle_and_gap()
+            self.loading = False
+            self.update()
+        self.imageLoaded.emit()
 
     def fallback_to_local_image(self):
         self.currentImage.fill(QColor(200, 200, 200))
@@ -98,6 +80,7 @@ class VerificationImage(QWidget):
         self.update()
 
     def generate_circle_and_gap(self):
+        self.backgroundLayer = None
         
         max_attempts = 100
         for _ in range(max_attempts):
@@ -145,8 +128,14 @@ class VerificationImage(QWidget):
         
         
         actual_deg = (mapped_value / 300.0) * 360.0
+        oldRect = self.pieceRect()
         self.currentAngle = math.radians(actual_deg)
-        self.update()
+        updateMoved(self, oldRect, self.pieceRect())
+
+    def pieceRect(self):
+        sx = self.centerX + self.radius * math.cos(self.currentAngle)
+        sy = self.centerY + self.radius * math.sin(self.currentAngle)
+        return QRectF(sx - 18, sy - 18, 36, 36).toAlignedRect().adjusted(-1, -1, 1, 1)
 
     def getAngleDeg(self) -> float:
         
@@ -165,32 +154,17 @@ class VerificationImage(QWidget):
         painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
 
         
-        path = QPainterPath()
-        rect = QRectF(0, 0, self._width, self._height)
-        path.addRoundedRect(rect, 5, 5)
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, self.currentImage)
-
-        
-        painter.setPen(QPen(QColor(255, 255, 255, 150), 2, Qt.PenStyle.DashLine))
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawEllipse(
-            QPointF(self.centerX, self.centerY), self.radius, self.radius
-        )
-
-        
-        shadowPixmap = self.currentImage.copy(
-            int(self.gapX - 17.5), int(self.gapY - 17.5), 35, 35
-        )
-        shadowPainter = QPainter(shadowPixmap)
-        shadowPainter.setCompositionMode(
-            QPainter.CompositionMode.CompositionMode_SourceAtop
-        )
-        shadowPainter.fillRect(shadowPixmap.rect(), QColor(0, 0, 0, 200))
-        shadowPainter.end()
-        painter.drawPixmap(
-            QPoint(int(self.gapX - 17.5), int(self.gapY - 17.5)), shadowPixmap
-        )
+        if touchesCorners(event.rect(), self._width, self._height, 5):
+            path = QPainterPath()
+            rect = QRectF(0, 0, self._width, self._height)
+            path.addRoundedRect(rect, 5, 5)
+            painter.setClipPath(path)
+        if (
+            self.backgroundLayer is None
+            or self.backgroundLayer.devicePixelRatio() != self.devicePixelRatioF()
+        ):
+            self.backgroundLayer = self.renderBackground()
+        painter.drawPixmap(0, 0, self.backgroundLayer)
 
         if self.sliderPixmap:
             
@@ -219,8 +193,43 @@ class VerificationImage(QWidget):
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "加载中...")
             painter.restore()
 
+        drawDirtyRects(painter, event)
+
         super().paintEvent(event)
 
+    def renderBackground(self):
+        # 背景图、虚线圆和缺口阴影在拖动过程中不变，预渲染成一层，拖动时只需贴图
+        dpr = self.devicePixelRatioF()
+        layer = QPixmap(round(self._width * dpr), round(self._height * dpr))
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(layer)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(0, 0, self.currentImage)
+
+        painter.setPen(QPen(QColor(255, 255, 255, 150), 2, Qt.PenStyle.DashLine))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawEllipse(
+            QPointF(self.centerX, self.centerY), self.radius, self.radius
+        )
+
+        shadowPixmap = self.currentImage.copy(
+            int(self.gapX - 17.5), int(self.gapY - 17.5), 35, 35
+        )
+        shadowPainter = QPainter(shadowPixmap)
+        shadowPainter.setCompositionMode(
+            QPainter.CompositionMode.CompositionMode_SourceAtop
+        )
+        shadowPainter.fillRect(shadowPixmap.rect(), QColor(0, 0, 0, 200))
+        shadowPainter.end()
+        painter.drawPixmap(
+            QPoint(int(self.gapX - 17.5), int(self.gapY - 17.5)), shadowPixmap
+        )
+        painter.end()
+        return layer
+
     def resetAnimation(self):
 
         if (
@@ -246,7 +255,7 @@ class VerificationImage(QWidget):
             self.animation.stop()
             self.animation.deleteLater()
             delattr(self, "animation")
-        self.load_image_from_url("https://api.elaina.cat/random/pc")
+        self.load_image_from_url(RANDOM_IMAGE_URL)
 
     def verify(self) -> bool:
 
@@ -0,0 +1,142 @@
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional, Sequence
+
+from PySide6.QtCore import QAbstractAnimation, QEvent, QObject, QPoint
+from PySide6.QtWidgets import QApplication, QPushButton, QVBoxLayout, QWidget
+
+from src.behavior.benchmark import percentile
+from src.registry import KINDS, flyoutClass
+
+# 对比弹出窗口模式和覆盖层模式打开浮层的延迟与动画每帧开销；
+# 窗口合成器的开销不在本进程内，offscreen 平台下弹出窗口模式的数字偏乐观，应在真实桌面上运行
+
+MODES = ("popup", "overlay")
+TIMEOUT = 2.0
+
+
+class PaintWatcher(QObject):
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.paintedAt = None
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, e):
+        if e.type() == QEvent.Type.Paint and self.paintedAt is None:
+            self.paintedAt = time.perf_counter()
+        return super().eventFilter(obj, e)
+
+
+def _processUntil(app, done):
+    # 只累计事件处理本身的耗时，两次处理之间的空转等待不计入
+    busy = 0.0
+    deadline = time.perf_counter() + TIMEOUT
+    while not done() and time.perf_counter() < deadline:
+        start = time.perf_counter()
+        app.processEvents()
+        busy += time.perf_counter() - start
+        time.sleep(0.001)
+    return busy
+
+
+def measureOpen(app, cls, host, target, overlay, fresh):
+    if fresh:
+        cls.pool().clear()
+        app.processEvents()
+
+    start = time.perf_counter()
+    flyout = cls.create(target=target, parent=host, isOverlay=overlay)
+    watcher = PaintWatcher(flyout)
+    _processUntil(app, lambda: watcher.paintedAt is not None)
+    latency = (watcher.paintedAt or time.perf_counter()) - start
+
+    frames = []
+    group = flyout.aniManager.aniGroup
+    flyout.aniManager.slideAni.valueChanged.connect(lambda _: frames.append(1))
+    busy = _processUntil(
+        app, lambda: group.state() == QAbstractAnimation.State.Stopped
+    )
+
+    flyout.close()
+    _processUntil(app, lambda: not flyout.isVisible())
+    watcher.deleteLater()
+    return latency, busy, len(frames)
+
+
+def benchmarkMode(app, cls, host, target, overlay, repeat):
+    cold, warm, frameCosts, frameCounts = [], [], [], []
+    for i in range(repeat):
+        # 交替测量新建实例（含窗口创建）和从池中取出复用的实例
+        fresh = i % 2 == 0
+        latency, busy, frames = measureOpen(app, cls, host, target, overlay, fresh)
+        (cold if fresh else warm).append(latency)
+        if frames:
+            frameCosts.append(busy / frames)
+            frameCounts.append(frames)
+    return {
+        "mode": "overlay" if overlay else "popup",
+        "cold_p50": percentile(cold, 0.5),
+        "warm_p50": percentile(warm, 0.5) if warm else 0.0,
+        "warm_p95": percentile(warm, 0.95) if warm else 0.0,
+        "frame_mean": sum(frameCosts) / len(frameCosts) if frameCosts else 0.0,
+        "frames": sum(frameCounts) / len(frameCounts) if frameCounts else 0.0,
+    }
+
+
+def printReport(results: Sequence[dict], stream) -> None:
+    header = ["模式", "新建 p50", "复用 p50", "复用 p95", "每帧耗时", "动画帧数"]
+    print("\t".join(header), file=stream)
+    for result in results:
+        row = [result["mode"]]
+        row += [
+            f"{result[key] * 1000:.2f}"
+            for key in ("cold_p50", "warm_p50", "warm_p95", "frame_mean")
+        ]
+        row.append(f"{result['frames']:.1f}")
+        print("\t".join(row), file=stream)
+    print("耗时单位为毫秒；打开延迟从 create() 调用到浮层内容第一次绘制", file=stream)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.components.benchmark",
+        description="对比弹出窗口模式和覆盖层模式下浮层的打开延迟与动画每帧开销",
+    )
+    parser.add_argument(
+        "--kind",
+        choices=list(KINDS),
+        default="iconClick",
+        help="验证码类型，默认使用不需要网络的图标点选",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="每种模式的打开次数")
+    parser.add_argument("--json", default=None, help="把完整结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    cls = flyoutClass(args.kind)
+
+    host = QWidget()
+    host.resize(800, 600)
+    layout = QVBoxLayout(host)
+    button = QPushButton("打开验证码", host)
+    layout.addWidget(button)
+    host.show()
+    host.move(QPoint(100, 100))
+    app.processEvents()
+
+    results = [
+        benchmarkMode(app, cls, host, button, mode == "overlay", args.repeat)
+        for mode in MODES
+    ]
+    printReport(results, sys.stdout)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import os
+
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QColor, QPen
+
+# 调试开关：打开后每次重绘都会在实际重绘的区域上叠加半透明红框，
+# 也可以在启动前设置环境变量 VERIFICATION_DEBUG_DIRTY=1
+DEBUG_DIRTY_RECTS = os.environ.get("VERIFICATION_DEBUG_DIRTY") == "1"
+
+
+def setDirtyRectDebug(enabled: bool = True) -> None:
+    global DEBUG_DIRTY_RECTS
+    DEBUG_DIRTY_RECTS = enabled
+
+
+def updateMoved(widget, oldRect: QRect, newRect: QRect) -> None:
+    # 只重绘移动物体新旧位置的并集，其余区域由后备存储保留
+    widget.update(oldRect.united(newRect))
+
+
+def touchesCorners(rect: QRect, width: int, height: int, radius: int) -> bool:
+    # 重绘区域碰不到四个圆角时可以省掉圆角裁剪路径
+    return (rect.left() < radius or rect.right() >= width - radius) and (
+        rect.top() < radius or rect.bottom() >= height - radius
+    )
+
+
+def drawDirtyRects(painter, event) -> None:
+    if not DEBUG_DIRTY_RECTS:
+        return
+    painter.save()
+    painter.setClipping(False)
+    painter.setPen(QPen(QColor(255, 0, 0, 200), 1))
+    painter.setBrush(QColor(255, 0, 0, 40))
+    for rect in event.region():
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+    painter.restore()
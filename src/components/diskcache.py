@@ -0,0 +1,204 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+# 按内容寻址的磁盘缓存：键是原始字节的 SHA-256，同一张图无论下载多少次只保存一份；
+# 每个键下有原图和若干缩放后的变体（如 "300x169.png"），各自是 <键前两位>/<键>.<变体> 文件。
+# 索引放在 SQLite（WAL 模式）里记录每个文件的大小和最近使用时间，总大小超过上限时按 LRU 删除；
+# 文件先写临时文件再原子替换，多个进程共用同一目录时不会读到写了一半的文件
+
+ORIGINAL = "original"
+# 超过这个秒数还没被替换的临时文件视为写入进程中途退出留下的
+STALE_TEMP_SECONDS = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (key, variant)
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+"""
+
+
+def contentKey(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, directory: str, maxBytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+        self._sweepTemp()
+
+    def _connect(self) -> "_Transaction":
+        # 每次操作单独打开连接，不在线程之间共享；busy 超时让并发写入的进程排队而不是报错
+        db = sqlite3.connect(
+            os.path.join(self.directory, "index.sqlite"),
+            timeout=10.0,
+            isolation_level=None,
+        )
+        db.execute("PRAGMA synchronous=NORMAL")
+        return _Transaction(db)
+
+    def path(self, key: str, variant: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.{variant}")
+
+    def _write(self, key: str, variant: str, data: bytes) -> None:
+        path = self.path(key, variant)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+
+    def _sweepTemp(self) -> None:
+        # 写临时文件后、替换前崩溃会留下 *.tmp；只删较旧的，其他进程可能正在写
+        cutoff = time.time() - STALE_TEMP_SECONDS
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            for child in os.scandir(entry.path):
+                if not child.name.endswith(".tmp"):
+                    continue
+                try:
+                    if child.stat().st_mtime < cutoff:
+                        os.remove(child.path)
+                except FileNotFoundError:
+                    pass
+
+    def put(self, data: bytes, variants: Dict[str, bytes]) -> str:
+        # 保存原图和缩放后的变体，返回内容键；已经缓存过的图只刷新使用时间
+        key = contentKey(data)
+        files = dict(variants)
+        files[ORIGINAL] = data
+        now = time.time()
+
+        with self._connect() as db:
+            known = {
+                row[0]
+                for row in db.execute(
+                    "SELECT variant FROM entries WHERE key = ?", (key,)
+                )
+            }
+        missing = {name: blob for name, blob in files.items() if name not in known}
+        for name, blob in missing.items():
+            self._write(key, name, blob)
+
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(
+                "INSERT INTO entries (key, variant, bytes, used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key, variant) DO UPDATE SET used = excluded.used",
+                [(key, name, len(blob), now) for name, blob in files.items()],
+            )
+            victims = self._evict(db)
+        self._remove(victims)
+        return key
+
+    def get(self, key: str, variant: str = ORIGINAL) -> Optional[bytes]:
+        data = self._read(key, variant)
+        if data is not None:
+            with self._connect() as db:
+                db.execute(
+                    "UPDATE entries SET used = ? WHERE key = ? AND variant = ?",
+                    (time.time(), key, variant),
+                )
+        return data
+
+    def pick(self, variant: str) -> Optional[Tuple[str, bytes]]:
+        # 取出最久没有用过的一张，并标记为刚用过；离线时连续调用会轮流返回缓存中的每张图
+        while True:
+            with self._connect() as db:
+                db.execute("BEGIN IMMEDIATE")
+                row = db.execute(
+                    "SELECT key FROM entries WHERE variant = ? ORDER BY used LIMIT 1",
+                    (variant,),
+                ).fetchone()
+                if row is None:
+                    return None
+                db.execute(
+                    "UPDATE entries SET used = ? WHERE key = ? AND variant = ?",
+                    (time.time(), row[0], variant),
+                )
+            data = self._read(row[0], variant)
+            if data is not None:
+                return row[0], data
+
+    def _read(self, key: str, variant: str) -> Optional[bytes]:
+        try:
+            with open(self.path(key, variant), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # 文件已被其他进程淘汰或手动删除，同步清掉索引
+            with self._connect() as db:
+                db.execute(
+                    "DELETE FROM entries WHERE key = ? AND variant = ?",
+                    (key, variant),
+                )
+            return None
+
+    def _evict(self, db: sqlite3.Connection) -> List[Tuple[str, str]]:
+        total = self._sum(db)
+        victims = []
+        if total <= self.maxBytes:
+            return victims
+        rows = db.execute("SELECT key, variant, bytes FROM entries ORDER BY used")
+        for key, variant, size in rows.fetchall():
+            if total <= self.maxBytes:
+                break
+            victims.append((key, variant))
+            total -= size
+        db.executemany("DELETE FROM entries WHERE key = ? AND variant = ?", victims)
+        return victims
+
+    def _remove(self, victims: List[Tuple[str, str]]) -> None:
+        # 索引事务提交之后再删除文件，其他进程最多读到一个已不存在的文件并跳过
+        for key, variant in victims:
+            try:
+                os.remove(self.path(key, variant))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            victims = db.execute("SELECT key, variant FROM entries").fetchall()
+            db.execute("DELETE FROM entries")
+        self._remove(victims)
+
+    def totalBytes(self) -> int:
+        with self._connect() as db:
+            return self._sum(db)
+
+    @staticmethod
+    def _sum(db: sqlite3.Connection) -> int:
+        return db.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(DISTINCT key) FROM entries").fetchone()[0]
+
+
+class _Transaction:
+    # sqlite3 连接的 with 语句只管事务、不关闭连接；这里两者都做
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.db
+
+    def __exit__(self, excType, exc, tb) -> None:
+        try:
+            if self.db.in_transaction:
+                self.db.execute("ROLLBACK" if excType else "COMMIT")
+        finally:
+            self.db.close()
@@ -1,5 +1,6 @@
 
-from typing import Union
+from math import ceil
+from typing import Optional, Union
 
 from PySide6.QtCore import (
     Qt,
@@ -9,18 +10,115 @@ from PySide6.QtCore import (
     QEasingCurve,
     QMargins,
     QObject,
+    QTimer,
     Signal,
+    SIGNAL,
     QRect,
+    QRectF,
+    QEvent,
+    Property,
 )
-from PySide6.QtGui import QPainter, QColor
+from PySide6.QtGui import QPainter, QColor, QImage, QPixmap, QPixmapCache
 from PySide6.QtWidgets import (
     QWidget,
-    QGraphicsDropShadowEffect,
+    QGraphicsBlurEffect,
+    QGraphicsScene,
     QHBoxLayout,
     QVBoxLayout,
     QApplication,
 )
 
+from src.components.pool import flyoutPool
+
+POPUP_FLAGS = Qt.Popup | Qt.FramelessWindowHint | Qt.NoDropShadowWindowHint
+
+
+def overlayHost(target, parent=None):
+    # 覆盖层挂在目标所在的顶层窗口上；目标是坐标且没有父控件时返回 None，退回弹出窗口模式
+    widget = target if isinstance(target, QWidget) else parent
+    return widget.window() if widget is not None else None
+
+
+def renderShadow(width, height, radius, blurRadius, color, dpr=1.0):
+
+    # 与 QGraphicsDropShadowEffect 相同的做法：圆角矩形的 alpha 做一次模糊，再用阴影色着色；
+    # 四周各留 blurRadius 的边距容纳模糊扩散出去的部分
+    margin = blurRadius
+    size = (ceil((width + 2 * margin) * dpr), ceil((height + 2 * margin) * dpr))
+    shape = QImage(*size, QImage.Format.Format_ARGB32_Premultiplied)
+    shape.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(shape)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.scale(dpr, dpr)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor(0, 0, 0))
+    painter.drawRoundedRect(QRectF(margin, margin, width, height), radius, radius)
+    painter.end()
+
+    scene = QGraphicsScene()
+    item = scene.addPixmap(QPixmap.fromImage(shape))
+    blur = QGraphicsBlurEffect()
+    blur.setBlurRadius(blurRadius * dpr)
+    item.setGraphicsEffect(blur)
+
+    image = QImage(*size, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(image.rect()), QRectF(image.rect()))
+    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+    painter.fillRect(image.rect(), color)
+    painter.end()
+
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def shadowPixmap(width, height, radius, blurRadius, color, dpr=1.0):
+    # 所有浮层共享 QPixmapCache；九宫格模板与尺寸无关，只有太小放不下模板时才按尺寸缓存
+    key = (
+        f"FlyoutShadow/{width}x{height}/{radius}/{blurRadius}/{color.rgba()}/{dpr}"
+    )
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        pixmap = renderShadow(width, height, radius, blurRadius, color, dpr)
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+def drawShadow(painter, rect, radius, blurRadius, color, dpr=1.0):
+
+    # 九宫格模板的边长保证正中一行、一列不受圆角和对边模糊的影响，
+    # 四角原样贴图，四边和中心拉伸正中的一行、一列像素
+    side = 2 * (blurRadius + radius) + 1
+    margin = blurRadius
+    outer = QRectF(rect).adjusted(-margin, -margin, margin, margin)
+    if rect.width() < side or rect.height() < side:
+        pixmap = shadowPixmap(
+            rect.width(), rect.height(), radius, blurRadius, color, dpr
+        )
+        painter.drawPixmap(outer.topLeft(), pixmap)
+        return
+
+    pixmap = shadowPixmap(side, side, radius, blurRadius, color, dpr)
+    half = margin + blurRadius + radius
+    total = side + 2 * margin
+    sourceEdges = [0, half * dpr, (half + 1) * dpr, total * dpr]
+    xs = [outer.left(), outer.left() + half, outer.right() - half, outer.right()]
+    ys = [outer.top(), outer.top() + half, outer.bottom() - half, outer.bottom()]
+    for i in range(3):
+        for j in range(3):
+            target = QRectF(xs[i], ys[j], xs[i + 1] - xs[i], ys[j + 1] - ys[j])
+            if target.isEmpty():
+                continue
+            source = QRectF(
+                sourceEdges[i],
+                sourceEdges[j],
+                sourceEdges[i + 1] - sourceEdges[i],
+                sourceEdges[j + 1] - sourceEdges[j],
+            )
+            painter.drawPixmap(target, pixmap, source)
+
 
 class FlyoutView(QWidget):
     closed = Signal()
@@ -80,6 +178,9 @@ class Flyout(QWidget):
         self.hBoxLayout = QHBoxLayout(self)
         self.aniManager = None
         self.isDeleteOnClose = isDeleteOnClose
+        self.isOverlay = False
+        self._opacity = 1.0
+        self._snapshot = None
 
         self.hBoxLayout.setContentsMargins(10, 10, 10, 10)
         self.hBoxLayout.addWidget(self.view)
@@ -91,23 +192,68 @@ class Flyout(QWidget):
         self.setShadowEffect()
 
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setWindowFlags(
-            Qt.Popup | Qt.FramelessWindowHint | Qt.NoDropShadowWindowHint
-        )
+        self.setWindowFlags(POPUP_FLAGS)
+
+    def setOverlay(self, overlay):
+        # 覆盖层模式：浮层作为子控件叠在父窗口之上，不再创建半透明的顶层弹出窗口，
+        # 滑入和淡入淡出都在进程内完成，不经过窗口合成器；需要先把父控件设为目标所在的顶层窗口。
+        # 只能在第一次显示之前设置，显示过的弹出窗口切换模式后无法再关闭
+        if overlay == self.isOverlay:
+            return
+        self.isOverlay = overlay
+        self.setWindowFlags(Qt.WindowType.Widget if overlay else POPUP_FLAGS)
+
+    def hostWindow(self):
+        return self.parentWidget() if self.isOverlay else None
+
+    def getOpacity(self):
+        return self._opacity
+
+    def setOpacity(self, opacity):
+        self._opacity = opacity
+        if not self.isOverlay:
+            self.setWindowOpacity(opacity)
+            return
+        # 半透明期间先截图一次、暂时隐藏内容控件，逐帧只按不透明度贴这张图；
+        # QGraphicsOpacityEffect 的缓存在控件移动时失效，滑入的每一帧都要离屏重绘整棵控件树
+        if opacity >= 1:
+            if self._snapshot is not None:
+                self._snapshot = None
+                self.view.show()
+        elif self._snapshot is None and self.isVisible():
+            self._snapshot = self.grab()
+            self.view.hide()
+        self.update()
+
+    opacity = Property(float, getOpacity, setOpacity)
 
     def setShadowEffect(self, blurRadius=None, offset=None):
-        if blurRadius is None:
-            blurRadius = self._shadowBlurRadius
-        if offset is None:
-            offset = self._shadowOffset
-        color = self._shadowColor
-
-        self.shadowEffect = QGraphicsDropShadowEffect(self.view)
-        self.shadowEffect.setBlurRadius(blurRadius)
-        self.shadowEffect.setOffset(*offset)
-        self.shadowEffect.setColor(color)
+        # 阴影在 paintEvent 中用缓存的九宫格贴图绘制，不再给 view 挂图形效果，
+        # 否则 view 内任何子控件重绘都要把整个 view 离屏渲染并重新模糊一次
+        if blurRadius is not None:
+            self._shadowBlurRadius = blurRadius
+        if offset is not None:
+            self._shadowOffset = offset
         self.view.setGraphicsEffect(None)
-        self.view.setGraphicsEffect(self.shadowEffect)
+        self.update()
+
+    def paintEvent(self, e):
+        painter = QPainter(self)
+        if self._snapshot is not None:
+            painter.setOpacity(self._opacity)
+            painter.drawPixmap(0, 0, self._snapshot)
+            return
+
+        rect = self.view.geometry().adjusted(1, 1, -1, -1)
+        rect.translate(*self._shadowOffset)
+        drawShadow(
+            painter,
+            rect,
+            self.view._borderRadius,
+            self._shadowBlurRadius,
+            self._shadowColor,
+            self.devicePixelRatioF(),
+        )
 
     def closeEvent(self, e):
         if self.isDeleteOnClose:
@@ -116,31 +262,71 @@ class Flyout(QWidget):
         self.closed.emit()
 
     def showEvent(self, e):
-        self.activateWindow()
+        if self.isOverlay:
+            # 父窗口有布局时子控件显示前不会自动调整大小；
+            # 子控件也不会像 Popup 那样在外部点击或按 Esc 时自动关闭，由应用级事件过滤器代劳
+            self.adjustSize()
+            self.raise_()
+            QApplication.instance().installEventFilter(self)
+        else:
+            self.activateWindow()
         super().showEvent(e)
 
+    def hideEvent(self, e):
+        if self.isOverlay:
+            QApplication.instance().removeEventFilter(self)
+        super().hideEvent(e)
+
+    def eventFilter(self, obj, e):
+        if not self.isVisible() or not obj.isWidgetType():
+            return super().eventFilter(obj, e)
+        if obj.window() is not self.window():
+            return super().eventFilter(obj, e)
+        if e.type() == QEvent.Type.MouseButtonPress:
+            # 未被接受的点击会沿父控件链继续传递，按点击位置而不是接收对象判断是否在浮层外
+            pos = self.mapFromGlobal(e.globalPosition().toPoint())
+            if not self.rect().contains(pos):
+                self.close()
+        elif e.type() == QEvent.Type.KeyPress and e.key() == Qt.Key.Key_Escape:
+            self.close()
+            return True
+        return super().eventFilter(obj, e)
+
     def exec(self, pos: QPoint):
         self.aniManager = PullUpFlyoutAnimationManager(self)
         self.show()
         self.aniManager.exec(pos)
 
     def fadeOut(self):
-        self.fadeOutAni = QPropertyAnimation(self, b"windowOpacity", self)
-        self.fadeOutAni.finished.connect(self.close)
-        self.fadeOutAni.setStartValue(1)
-        self.fadeOutAni.setEndValue(0)
-        self.fadeOutAni.setDuration(120)
+        # 复用的浮层会多次淡出，动画只创建一次，避免每次都新增一个子对象和连接
+        if not hasattr(self, "fadeOutAni"):
+            self.fadeOutAni = QPropertyAnimation(self, b"opacity", self)
+            self.fadeOutAni.finished.connect(self.close)
+            self.fadeOutAni.setStartValue(1)
+            self.fadeOutAni.setEndValue(0)
+            self.fadeOutAni.setDuration(120)
         self.fadeOutAni.start()
 
+    @classmethod
+    def pool(cls):
+        return flyoutPool(cls)
+
+    @classmethod
+    def prewarm(cls, count=1):
+        cls.pool().prewarm(count)
+
     @classmethod
     def create(
         cls,
         target: Union[QWidget, QPoint] = None,
         parent=None,
         isDeleteOnClose=True,
+        isOverlay=False,
     ):
         view = FlyoutView()
-        w = cls(view, parent, isDeleteOnClose)
+        host = overlayHost(target, parent) if isOverlay else None
+        w = cls(view, host or parent, isDeleteOnClose)
+        w.setOverlay(host is not None)
 
         if target is not None:
             w.show()
@@ -152,13 +338,67 @@ class Flyout(QWidget):
         return w
 
 
+class PooledFlyout(Flyout):
+
+    # 关闭后放回 FlyoutPool 复用的浮层：create() 从池中取出同一模式的实例，
+    # 放回时 resetState() 清掉上一次使用留下的状态，子类在 resetContent() 中换新内容
+    success = Signal()
+
+    def __init__(self, view: FlyoutView, parent: Optional[QWidget] = None) -> None:
+        super().__init__(view, parent, isDeleteOnClose=False)
+
+        self.fadeTimer = QTimer(self)
+        self.fadeTimer.setSingleShot(True)
+        self.fadeTimer.setInterval(300)
+        self.fadeTimer.timeout.connect(self.fadeOut)
+
+    @classmethod
+    def create(
+        cls,
+        target: Optional[Union[QWidget, QPoint]] = None,
+        parent: Optional[QWidget] = None,
+        isOverlay: bool = False,
+    ) -> "PooledFlyout":
+
+        host = overlayHost(target, parent) if isOverlay else None
+        flyout = cls.pool().acquire(host or parent, host is not None)
+        if target is None:
+            return flyout
+
+        flyout.show()
+        if isinstance(target, QWidget):
+            pos = PullUpFlyoutAnimationManager(flyout).position(target)
+        else:
+            pos = target
+
+        flyout.exec(pos)
+        return flyout
+
+    def closeWindow(self) -> None:
+        self.success.emit()
+        self.fadeTimer.start()
+
+    def resetState(self) -> None:
+        # 放回池中时调用：停止未完成的淡出，断开调用方连接的 success 槽
+        self.fadeTimer.stop()
+        if hasattr(self, "fadeOutAni"):
+            self.fadeOutAni.stop()
+        self.setOpacity(1)
+        if self.receivers(SIGNAL("success()")):
+            self.success.disconnect()
+        self.resetContent()
+
+    def resetContent(self) -> None:
+        pass
+
+
 class FlyoutAnimationManager(QObject):
     def __init__(self, flyout: Flyout):
         super().__init__()
         self.flyout = flyout
         self.aniGroup = QParallelAnimationGroup(self)
         self.slideAni = QPropertyAnimation(flyout, b"pos", self)
-        self.opacityAni = QPropertyAnimation(flyout, b"windowOpacity", self)
+        self.opacityAni = QPropertyAnimation(flyout, b"opacity", self)
 
         self.slideAni.setDuration(187)
         self.opacityAni.setDuration(187)
@@ -175,8 +415,14 @@ class FlyoutAnimationManager(QObject):
         raise NotImplementedError
 
     def _adjustPosition(self, pos):
-        screen = QApplication.primaryScreen()
-        rect = screen.geometry() if screen else QRect(0, 0, 1920, 1080)
+        host = self.flyout.hostWindow()
+        if host is not None:
+            # 覆盖层模式下传入的仍是全局坐标，换算到父窗口内并限制在窗口范围里
+            pos = host.mapFromGlobal(pos)
+            rect = host.rect()
+        else:
+            screen = QApplication.primaryScreen()
+            rect = screen.geometry() if screen else QRect(0, 0, 1920, 1080)
         w, h = self.flyout.sizeHint().width() + 5, self.flyout.sizeHint().height()
         x = max(rect.left(), min(pos.x(), rect.right() - w))
         y = max(rect.top(), min(pos.y() - 4, rect.bottom() - h + 5))
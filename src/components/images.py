@@ -0,0 +1,317 @@
+import os
+import sqlite3
+import time
+from collections import deque
+
+from PySide6.QtCore import (
+    Qt,
+    QBuffer,
+    QObject,
+    QRunnable,
+    QSize,
+    QStandardPaths,
+    QThreadPool,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QImage
+from shiboken6 import isValid
+
+from .diskcache import DiskCache
+from .network import sharedNetwork
+
+RANDOM_IMAGE_URL = "https://api.elaina.cat/random/pc"
+IMAGE_SIZE = QSize(300, 169)
+
+
+class DecodeSignals(QObject):
+
+    finished = Signal(object, str)
+
+
+def variantName(size):
+    return f"{size.width()}x{size.height()}.png"
+
+
+class DecodeTask(QRunnable):
+    def __init__(self, data, size, signals, cache=None):
+        super().__init__()
+        self.data = data
+        self.size = size
+        self.signals = signals
+        self.cache = cache
+
+    def run(self):
+        # 解码和平滑缩放在线程池中完成；QImage 可以跨线程使用，QPixmap 只在主线程创建
+        image = QImage.fromData(self.data)
+        error = ""
+        if image.isNull():
+            image = None
+            error = "图片数据解析失败"
+        else:
+            image = image.scaled(
+                self.size,
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            ).convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+            if self.cache is not None:
+                self.store(image)
+        try:
+            self.signals.finished.emit(image, error)
+        except RuntimeError:
+            # 解码期间图片池已被销毁，结果直接丢弃
+            pass
+
+    def store(self, image):
+        # 原图和缩放后的 PNG 一起写入磁盘缓存，写入失败不影响这次使用
+        buffer = QBuffer()
+        buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+        image.convertToFormat(QImage.Format.Format_RGB32).save(buffer, "PNG")
+        try:
+            self.cache.put(self.data, {variantName(self.size): bytes(buffer.data())})
+        except (OSError, sqlite3.Error) as e:
+            print(f"背景图缓存写入失败: {e}")
+
+
+class CacheLoadTask(QRunnable):
+    def __init__(self, cache, size, signals, error):
+        super().__init__()
+        self.cache = cache
+        self.size = size
+        self.signals = signals
+        self.error = error
+
+    def run(self):
+        # 从磁盘缓存取最久没用过的一张已缩放好的图，缓存为空时原样返回网络错误
+        image = None
+        try:
+            picked = self.cache.pick(variantName(self.size))
+        except (OSError, sqlite3.Error) as e:
+            print(f"背景图缓存读取失败: {e}")
+            picked = None
+        if picked is not None:
+            image = QImage.fromData(picked[1])
+            if image.isNull():
+                image = None
+            else:
+                image = image.convertToFormat(
+                    QImage.Format.Format_ARGB32_Premultiplied
+                )
+        try:
+            self.signals.finished.emit(image, self.error)
+        except RuntimeError:
+            pass
+
+
+class ImagePool(QObject):
+
+    # 进程内所有验证码共用的背景图池：预先下载、解码并缩放好 capacity 张图，
+    # request() 有现成的图时立即回调（命中），池空时排队等下一张（未命中），每次取图后在后台补足；
+    # 下载的图同时写入磁盘缓存 cache，网络失败或排队超过 slowTimeout 秒时从缓存取旧图。
+    # 下载失败后进入退避：不再补足，按 retryDelay 起步、每次翻倍（最多 maxRetryDelay 秒）的间隔
+    # 只为排队的调用方重试（没有调用方时发一个探测请求），成功一次后恢复补足
+    def __init__(
+        self,
+        url=RANDOM_IMAGE_URL,
+        capacity=3,
+        size=IMAGE_SIZE,
+        cache=None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.url = url
+        self.capacity = capacity
+        self.size = size
+        self.cache = cache
+        self.slowTimeout = 1.5
+        self.retryDelay = 1.0
+        self.maxRetryDelay = 60.0
+
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.cacheHits = 0
+
+        self._ready = deque()
+        self._waiters = deque()
+        self._pending = 0
+        self._failStreak = 0
+        self._lastError = ""
+
+        self.retryTimer = QTimer(self)
+        self.retryTimer.setSingleShot(True)
+        self.retryTimer.timeout.connect(self._retry)
+        self.slowTimer = QTimer(self)
+        self.slowTimer.setSingleShot(True)
+        self.slowTimer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.slowTimer.timeout.connect(self._onSlow)
+
+        self._signals = DecodeSignals(self)
+        self._signals.finished.connect(self._onDecoded)
+        self._cacheSignals = DecodeSignals(self)
+        self._cacheSignals.finished.connect(self._onCacheLoaded)
+
+    def __len__(self):
+        return len(self._ready)
+
+    def request(self, callback):
+        # callback(image, error)：image 为缩放好的 QImage，失败时为 None 并附带错误信息
+        if self._ready:
+            self.hits += 1
+            callback(self._ready.popleft(), "")
+        else:
+            self.misses += 1
+            # 每个排队的调用方记下自己的截止时间，转去缓存后置为 None
+            self._waiters.append([callback, time.monotonic() + self.slowTimeout])
+            if self._failStreak:
+                # 退避期间不等下载，直接用缓存中的旧图或交给调用方的本地备选
+                self._serveFailure(self._lastError)
+                return
+            self._armSlow()
+        self.refill()
+
+    def refill(self):
+        # 就绪的图和在途的请求合计补足到 capacity，另外为每个排队的调用方多取一张；
+        # 退避期间由重试定时器发请求
+        if self._failStreak:
+            return
+        wanted = self.capacity + len(self._waiters) - len(self._ready) - self._pending
+        self._download(wanted)
+
+    def _download(self, count):
+        for _ in range(count):
+            self._pending += 1
+            sharedNetwork().get(self.url, self._onDownloaded)
+
+    def _retry(self):
+        self._download(max(len(self._waiters), 1) - self._pending)
+
+    def _backOff(self, error):
+        # 同一轮里并发失败的请求只算一次，重试间隔按轮翻倍
+        self._lastError = error
+        if self.retryTimer.isActive():
+            return
+        delay = min(self.retryDelay * 2**self._failStreak, self.maxRetryDelay)
+        self._failStreak += 1
+        self.retryTimer.start(int(delay * 1000))
+
+    def clear(self):
+        self._ready.clear()
+
+    def _onDownloaded(self, data, error):
+        if data is None:
+            self._finish(None, f"网络错误: {error}")
+        else:
+            task = DecodeTask(data, self.size, self._signals, self.cache)
+            QThreadPool.globalInstance().start(task)
+
+    def _onDecoded(self, image, error):
+        self._finish(image, error)
+
+    def _finish(self, image, error):
+        self._pending -= 1
+        if image is None:
+            self.failures += 1
+            self._backOff(error)
+            self._serveFailure(error)
+            return
+        self._deliver(image, error)
+        if self._failStreak:
+            self._failStreak = 0
+            self.retryTimer.stop()
+            self.refill()
+
+    def _serveFailure(self, error):
+        if not self._waiters:
+            return
+        if self.cache is not None:
+            self._loadFromCache(error)
+        else:
+            self._deliver(None, error)
+
+    def _armSlow(self):
+        # 定时器总是对准最早一个还在等下载的调用方的截止时间
+        if self.cache is None or self.slowTimer.isActive():
+            return
+        for _, deadline in self._waiters:
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+                self.slowTimer.start(int(remaining * 1000) + 1)
+                return
+
+    def _onSlow(self):
+        # 网络慢时不再等下载，只为排队超过 slowTimeout 的调用方从缓存取旧图；
+        # 下载完成后的新图照常进入池中
+        now = time.monotonic()
+        for waiter in self._waiters:
+            if waiter[1] is None:
+                continue
+            if waiter[1] > now:
+                break
+            waiter[1] = None
+            self._loadFromCache("")
+        self._armSlow()
+
+    def _loadFromCache(self, error):
+        task = CacheLoadTask(self.cache, self.size, self._cacheSignals, error)
+        QThreadPool.globalInstance().start(task)
+
+    def _onCacheLoaded(self, image, error):
+        if image is None and not error:
+            # 缓存为空且下载还在进行，继续等待
+            return
+        # 缓存的图只交给正在等待的调用方，不放进池中占用新图的位置；
+        # 超时取的旧图只交给已经超时的调用方，排在前面的超时者可能已经等到了新图
+        delivered = self._deliver(
+            image, "" if image is not None else error, keep=False, overdue=not error
+        )
+        if delivered:
+            if image is not None:
+                self.cacheHits += 1
+
+    def _deliver(self, image, error, keep=True, overdue=False):
+        # 调用方按排队顺序超时，已超时的总在队首
+        while self._waiters:
+            callback, deadline = self._waiters[0]
+            # 排队期间控件可能已被销毁，跳过失效的回调
+            owner = getattr(callback, "__self__", None)
+            if isinstance(owner, QObject) and not isValid(owner):
+                self._waiters.popleft()
+                continue
+            if overdue and deadline is not None:
+                break
+            self._waiters.popleft()
+            callback(image, error)
+            return True
+        if image is not None and keep:
+            self._ready.append(image)
+        return False
+
+
+_pools = {}
+_cache = None
+
+
+def backgroundCache():
+    # 默认放在系统缓存目录下，多个进程共用；目录不可用时返回 None，图片池只走网络
+    global _cache
+    if _cache is None:
+        location = QStandardPaths.writableLocation(
+            QStandardPaths.StandardLocation.CacheLocation
+        )
+        try:
+            _cache = DiskCache(os.path.join(location, "captcha-backgrounds"))
+        except (OSError, sqlite3.Error) as e:
+            print(f"背景图缓存不可用: {e}")
+    return _cache
+
+
+def imagePool(url=RANDOM_IMAGE_URL):
+    # 每个地址一个池，首次使用时创建并立即开始预取。只有随机图接口每次返回不同的图，
+    # 固定地址预取只会下载同一张图的多个副本，因此不预取，每次取图时按需下载
+    pool = _pools.get(url)
+    if pool is None:
+        capacity = 3 if url == RANDOM_IMAGE_URL else 0
+        pool = _pools[url] = ImagePool(url, capacity, cache=backgroundCache())
+        pool.refill()
+    return pool
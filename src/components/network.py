@@ -0,0 +1,164 @@
+import atexit
+
+from PySide6.QtCore import (
+    QByteArray,
+    QCoreApplication,
+    QObject,
+    QThread,
+    QUrl,
+    Signal,
+    Slot,
+)
+from PySide6.QtNetwork import (
+    QNetworkAccessManager,
+    QNetworkReply,
+    QNetworkRequest,
+    QSslConfiguration,
+)
+
+
+class NetworkWorker(QObject):
+
+    # 真正持有 QNetworkAccessManager 的对象，位于主线程或独立的 I/O 线程；
+    # 管理器在第一次请求时于所在线程内创建
+    finished = Signal(int, object, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.manager = None
+        self.handshakes = 0
+
+    def _ensureManager(self):
+        if self.manager is None:
+            self.manager = QNetworkAccessManager(self)
+            self.manager.finished.connect(self._onFinished)
+            self.manager.encrypted.connect(self._onEncrypted)
+
+    @Slot(int, str)
+    def get(self, ticket, url):
+        self._ensureManager()
+        request = QNetworkRequest(QUrl(url))
+        request.setAttribute(QNetworkRequest.Attribute.Http2AllowedAttribute, True)
+        reply = self.manager.get(request)
+        reply.setProperty("ticket", ticket)
+
+    @Slot(str, int, bool)
+    def preconnect(self, host, port, encrypted):
+        self._ensureManager()
+        if encrypted:
+            # 在 ALPN 中声明 HTTP/2，服务器支持时预先建立的就是之后复用的 HTTP/2 连接
+            config = QSslConfiguration.defaultConfiguration()
+            protocols = (
+                QSslConfiguration.ALPNProtocolHTTP2,
+                QSslConfiguration.NextProtocolHttp1_1,
+            )
+            config.setAllowedNextProtocols([QByteArray(p) for p in protocols])
+            self.manager.connectToHostEncrypted(host, port, config)
+        else:
+            self.manager.connectToHost(host, port)
+
+    def _onEncrypted(self, reply):
+        self.handshakes += 1
+
+    def _onFinished(self, reply: QNetworkReply):
+        ticket = reply.property("ticket")
+        if ticket is None:
+            # 预连接产生的内部请求
+            reply.deleteLater()
+            return
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            self.finished.emit(ticket, None, reply.errorString())
+        else:
+            self.finished.emit(ticket, bytes(reply.readAll()), "")
+        reply.deleteLater()
+
+
+class SharedNetwork(QObject):
+
+    # 进程内共用的网络入口：所有请求走同一个 QNetworkAccessManager，
+    # DNS 结果、TCP/TLS 连接、TLS 会话和 HTTP/2 多路复用都在各验证码之间共享；
+    # ioThread=True 时管理器放在独立线程，收发和 TLS 计算不占用界面线程，回调仍在创建者线程执行
+    _get = Signal(int, str)
+    _preconnect = Signal(str, int, bool)
+
+    def __init__(self, ioThread=False, parent=None):
+        super().__init__(parent)
+        self.requests = 0
+        self.preconnects = 0
+        self._callbacks = {}
+        self._nextTicket = 0
+
+        self.worker = NetworkWorker()
+        self.ioThread = None
+        if ioThread:
+            self.ioThread = QThread(self)
+            self.ioThread.setObjectName("VerificationNetwork")
+            self.worker.moveToThread(self.ioThread)
+            self.ioThread.finished.connect(self.worker.deleteLater)
+            self.ioThread.start()
+            QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
+            atexit.register(self.shutdown)
+        else:
+            self.worker.setParent(self)
+
+        # 同一线程时直接调用，跨线程时自动排队到 I/O 线程
+        self._get.connect(self.worker.get)
+        self._preconnect.connect(self.worker.preconnect)
+        self.worker.finished.connect(self._onFinished)
+
+    @property
+    def handshakes(self):
+        # 完成的 TLS 握手次数，连接被复用时不再增加
+        return self.worker.handshakes
+
+    def get(self, url, callback):
+        # callback(data, error)：成功时 data 为响应内容，失败时为 None 并附带错误信息
+        ticket = self._nextTicket
+        self._nextTicket += 1
+        self._callbacks[ticket] = callback
+        self.requests += 1
+        self._get.emit(ticket, url)
+
+    def preconnect(self, host, port=None):
+        # host 可以是主机名或完整地址；不带协议的主机名按 https 处理
+        url = QUrl(host if "://" in host else f"https://{host}")
+        encrypted = url.scheme() == "https"
+        if port is None:
+            port = url.port(443 if encrypted else 80)
+        self.preconnects += 1
+        self._preconnect.emit(url.host(), port, encrypted)
+
+    def shutdown(self):
+        if self.ioThread is not None and self.ioThread.isRunning():
+            self.ioThread.quit()
+            self.ioThread.wait()
+
+    def _onFinished(self, ticket, data, error):
+        callback = self._callbacks.pop(ticket, None)
+        if callback is not None:
+            callback(data, error)
+
+
+_network = None
+
+
+def sharedNetwork():
+    global _network
+    if _network is None:
+        _network = SharedNetwork()
+    return _network
+
+
+def useIoThread():
+    # 在第一次请求前调用，之后的请求都在独立的 I/O 线程中收发
+    global _network
+    if _network is not None:
+        if _network.ioThread is not None:
+            return _network
+        raise RuntimeError("共享网络管理器已经创建，需要在第一次请求之前开启 I/O 线程")
+    _network = SharedNetwork(ioThread=True)
+    return _network
+
+
+def preconnect(host, port=None):
+    sharedNetwork().preconnect(host, port)
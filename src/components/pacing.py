@@ -0,0 +1,74 @@
+from typing import Callable
+
+from PySide6.QtCore import QObject, Qt, QTimer
+from PySide6.QtWidgets import QWidget
+
+DEFAULT_REFRESH_RATE = 60.0
+
+
+def refreshInterval(widget: QWidget) -> int:
+    # 取控件所在屏幕的刷新率，拿不到时按 60Hz 处理；窗口移到其他屏幕后下一帧自动生效
+    screen = widget.screen()
+    rate = screen.refreshRate() if screen is not None else 0
+    if rate <= 0:
+        rate = DEFAULT_REFRESH_RATE
+    return max(1, int(1000 / rate))
+
+
+class FramePacer(QObject):
+
+    # 把高频的视觉更新合并为每个显示帧最多一次：空闲时第一次更新立即生效，
+    # 同一帧内后续的更新只保留最新值，帧结束时再提交
+    def __init__(self, widget: QWidget, apply: Callable[[int], None]):
+        super().__init__(widget)
+        self.widget = widget
+        self.apply = apply
+        self.enabled = True
+
+        self.merged = 0
+        self.frames = 0
+
+        self._pending = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._onFrame)
+
+    def submit(self, value: int) -> None:
+        if not self.enabled:
+            self.apply(value)
+            return
+        if self._timer.isActive():
+            if self._pending is not None:
+                self.merged += 1
+            self._pending = value
+            return
+        self._present(value)
+
+    def flush(self) -> None:
+        # 松手或中止时立即提交尚未显示的值，保证判定使用的位置与屏幕一致
+        self._timer.stop()
+        value = self._pending
+        self._pending = None
+        if value is not None:
+            self._present(value)
+            self._timer.stop()
+
+    def cancel(self) -> None:
+        self._timer.stop()
+        self._pending = None
+
+    def resetStats(self) -> None:
+        self.merged = 0
+        self.frames = 0
+
+    def _present(self, value: int) -> None:
+        self.frames += 1
+        self.apply(value)
+        self._timer.start(refreshInterval(self.widget))
+
+    def _onFrame(self) -> None:
+        value = self._pending
+        self._pending = None
+        if value is not None:
+            self._present(value)
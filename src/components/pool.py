@@ -0,0 +1,150 @@
+import time
+from functools import partial
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QWidget
+from shiboken6 import isValid
+
+
+class FlyoutPool(QObject):
+
+    # 关闭后的浮层放回池中，下次 create() 直接取出复用，省去重新构建控件；
+    # 池大小有上限，闲置超过 idleTimeout 秒的实例由定时器销毁，长时间运行时内存保持有界
+    def __init__(self, factory, maxSize=2, idleTimeout=60.0, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.maxSize = maxSize
+        self.idleTimeout = idleTimeout
+        self._idle = []
+        # prewarm(count) 期间池的上限临时放宽到 count，预热的实例过期回收后恢复为 maxSize
+        self._warmSize = 0
+
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+        self.evictTimer = QTimer(self)
+        self.evictTimer.setSingleShot(True)
+        self.evictTimer.timeout.connect(self.evictIdle)
+
+    def __len__(self):
+        return len(self._idle)
+
+    def acquire(self, parent=None, overlay=False):
+        # 只复用同一模式的实例：弹出窗口显示过之后再切成覆盖层，原生窗口的关闭状态不会重置，
+        # 浮层再也关不掉，所以每个实例的模式在构建时确定
+        for i in range(len(self._idle) - 1, -1, -1):
+            flyout, _ = self._idle[i]
+            # 父控件销毁时池中的子浮层随之销毁，只剩失效的包装对象
+            if not isValid(flyout):
+                del self._idle[i]
+                continue
+            if flyout.isOverlay != overlay:
+                continue
+            del self._idle[i]
+            if flyout.parent() is not parent:
+                flyout.setParent(parent, flyout.windowFlags())
+            self.reused += 1
+            return flyout
+
+        return self._build(parent, overlay)
+
+    def _build(self, parent, overlay=False):
+        flyout = self.factory(parent)
+        flyout.setOverlay(overlay)
+        flyout.closed.connect(self._onClosed)
+        # 池中的隐藏实例在新题目的图片就绪后预先渲染一次，取出显示时只剩一次贴图
+        for child in flyout.findChildren(QWidget):
+            if hasattr(child, "imageLoaded"):
+                child.imageLoaded.connect(partial(self._onChallengeLoaded, flyout))
+        self.created += 1
+        return flyout
+
+    def prewarm(self, count=1):
+        # 在事件循环空闲时逐个构建隐藏实例并准备好第一道题，可在 QApplication 创建后立即调用；
+        # 预热的实例与放回的实例一样，闲置超过 idleTimeout 秒后回收；
+        # 覆盖层需要宿主窗口，预热的都是弹出窗口
+        self._warmSize = max(self._warmSize, count)
+        for _ in range(count - len(self._idle)):
+            QTimer.singleShot(0, self._prewarmOne)
+
+    def _limit(self):
+        return max(self.maxSize, self._warmSize)
+
+    def _prewarmOne(self):
+        if len(self._idle) >= self._limit():
+            return
+        flyout = self._build(None)
+        self.prepare(flyout)
+        self._store(flyout)
+
+    def prepare(self, flyout):
+        # 离屏渲染一次：完成布局、字体解析、阴影和滑块精灵图的生成
+        flyout.view.adjustSize()
+        flyout.adjustSize()
+        flyout.grab()
+
+    def _onChallengeLoaded(self, flyout):
+        if isValid(flyout) and not flyout.isVisible():
+            self.prepare(flyout)
+
+    def _onClosed(self):
+        self.release(self.sender())
+
+    def release(self, flyout):
+        if not isValid(flyout) or any(f is flyout for f, _ in self._idle):
+            return
+        if len(self._idle) >= self._limit():
+            self._discard(flyout)
+            return
+
+        if hasattr(flyout, "resetState"):
+            flyout.resetState()
+        self._store(flyout)
+
+    def _store(self, flyout):
+        self._idle.append((flyout, time.monotonic()))
+        if not self.evictTimer.isActive():
+            self.evictTimer.start(int(self.idleTimeout * 1000))
+
+    def evictIdle(self):
+        now = time.monotonic()
+        alive = []
+        for flyout, releasedAt in self._idle:
+            if not isValid(flyout):
+                continue
+            if now - releasedAt >= self.idleTimeout:
+                self._discard(flyout)
+                # 有实例闲置到期说明预热应对的高峰已经过去，上限恢复为 maxSize
+                self._warmSize = 0
+            else:
+                alive.append((flyout, releasedAt))
+        self._idle = alive
+
+        # 按最早放回的实例到期时间重新计时，池空时定时器停止
+        if alive:
+            remaining = self.idleTimeout - (now - min(t for _, t in alive))
+            self.evictTimer.start(max(0, int(remaining * 1000)))
+
+    def clear(self):
+        for flyout, _ in self._idle:
+            if isValid(flyout):
+                self._discard(flyout)
+        self._idle = []
+        self._warmSize = 0
+        self.evictTimer.stop()
+
+    def _discard(self, flyout):
+        self.evicted += 1
+        flyout.deleteLater()
+
+
+_pools = {}
+
+
+def flyoutPool(cls):
+    # 每种浮层类型一个池，首次使用时创建，确保 QApplication 已经存在
+    pool = _pools.get(cls)
+    if pool is None:
+        pool = _pools[cls] = FlyoutPool(cls)
+    return pool
@@ -1,8 +1,10 @@
 import time
-from math import sqrt
+from math import ceil
+
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import (
     Qt,
+    QEvent,
     QPropertyAnimation,
     QEasingCurve,
     Signal,
@@ -11,13 +13,60 @@ from PySide6.QtCore import (
     QTimer,
     QPoint,
     QPointF,
+    QRectF,
+    QObject,
+    QRunnable,
+    QThreadPool,
 )
-from PySide6.QtGui import QPainter, QColor, QPen
+from PySide6.QtGui import QPainter, QColor, QPen, QPixmap, QPixmapCache
+
+from src.behavior.analyzer import (
+    DEFAULT_PIPELINE,
+    analyzeTrack,
+    buildPipeline,
+    flattenFailures,
+)
+from src.behavior.model import loadModel
+from src.behavior.sampling import InputSampler
+from src.behavior.streaming import StreamingAnalyzer
+from src.behavior.thresholds import loadThresholds
+from src.behavior.verdict import Verdict
+from src.behavior.track import TrackBuffer
+from src.components.dirty import drawDirtyRects, updateMoved
+from src.components.pacing import FramePacer
+
+
+class AnalysisSignals(QObject):
+
+    finished = Signal(int, object)
+
+
+class AnalysisTask(QRunnable):
+    def __init__(self, token, columns, features, pipeline, signals):
+        super().__init__()
+        self.token = token
+        self.columns = columns
+        self.features = features
+        self.pipeline = pipeline
+        self.signals = signals
+
+    def run(self):
+        xs, ys, ts = self.columns
+        verdict = analyzeTrack(
+            xs, ts, ys=ys, features=self.features, pipeline=self.pipeline
+        )
+        try:
+            self.signals.finished.emit(self.token, verdict)
+        except RuntimeError:
+            # 分析期间滑块已被销毁，结果直接丢弃
+            pass
 
 
 class VerificationSlider(QWidget):
 
+    # resultSignal 保持旧版 dict 约定，每次发出独立的副本；verdictSignal 发出同一结果的不可变 Verdict
     resultSignal = Signal(dict)
+    verdictSignal = Signal(object)
     valueChanged = Signal(int)
     sliderPressed = Signal()
     sliderReleased = Signal()
@@ -40,6 +89,13 @@ class VerificationSlider(QWidget):
     ERROR_GROOVE_PEN = QColor(245, 122, 122)
     ERROR_GROOVE_BRUSH = QColor(252, 225, 225)
 
+    GROOVE_BACKGROUND = QColor(247, 249, 250)
+
+    # 滑块、图标和滑槽预渲染为精灵图，所有实例共享 QPixmapCache；
+    # 键中包含颜色和设备像素比，调色板变化时递增代数使旧精灵失效
+    _spriteGeneration = 0
+    FILL_TEMPLATE_WIDTH = 24
+
     def __init__(self, parent=None):
         super(VerificationSlider, self).__init__(parent)
         self.setFixedSize(300, 40)
@@ -49,6 +105,7 @@ class VerificationSlider(QWidget):
         self.isHover = False
         self.isError = False
         self.isSuccess = False
+        self.isPending = False
         self._value = 0
 
         self.minimum = 0
@@ -73,12 +130,28 @@ class VerificationSlider(QWidget):
         self.brushColorAnimation.setDuration(200)
         self.brushColorAnimation.setEasingCurve(QEasingCurve.Type.OutCubic)
 
-        self.moveTrack = []
+        self.moveTrack = TrackBuffer()
         self.startTime = 0
         self.endTime = 0
         self.isBot = False
 
-        self.resultDict = {"result": True, "value": 0, "endTime": 0, "msg": []}
+        self.streamingAnalysis = False
+        self.streamAnalyzer = StreamingAnalyzer()
+        self.sampler = InputSampler(self._appendSample)
+        # 采样按输入频率全量记录，滑块和联动图片的重绘按屏幕刷新率合并
+        self.framePacer = FramePacer(self, self.setValue)
+        self.recorder = None
+        self.pipeline = None
+
+        self.asyncAnalysis = False
+        self._analysisToken = 0
+        self._pendingColumns = None
+        self._analysisSignals = AnalysisSignals(self)
+        self._analysisSignals.finished.connect(
+            self._onAnalysisFinished, Qt.ConnectionType.QueuedConnection
+        )
+
+        self.verdict = None
 
     def getSliderPenColor(self):
         return self._sliderPenColor
@@ -109,7 +182,7 @@ class VerificationSlider(QWidget):
             self._groovePenColor = self.ERROR_GROOVE_PEN
             self._grooveBrushColor = self.ERROR_GROOVE_BRUSH
             self.arrowColor = QColor(255, 255, 255)
-        elif self.isPressed:
+        elif self.isPending or self.isPressed:
             target_pen = self.PRESSED_PEN
             target_brush = self.PRESSED_BRUSH
             self.arrowColor = QColor(255, 255, 255)
@@ -158,7 +231,7 @@ class VerificationSlider(QWidget):
             self._updateStateColors()
 
     def mousePressEvent(self, event):
-        if self.isSuccess or self.isError:
+        if self.isSuccess or self.isError or self.isPending:
             return
         if event.button() == Qt.MouseButton.LeftButton:
             handleX = self.grooveRect.left() + self._value
@@ -173,29 +246,82 @@ class VerificationSlider(QWidget):
                 self.sliderPressed.emit()
 
                 self.startTime = time.time()
-                self.moveTrack = [(event.position().x(), time.time())]
+                self.moveTrack.clear()
+                self.streamAnalyzer.reset()
+                self.sampler.reset()
+                self.framePacer.cancel()
+                self.framePacer.resetStats()
+                pos = event.position()
+                self.sampler.add(pos.x(), pos.y(), event.timestamp())
         super(VerificationSlider, self).mousePressEvent(event)
 
     def mouseReleaseEvent(self, event):
-        if self.isSuccess or self.isError:
-            return
-        if event.button() == Qt.MouseButton.LeftButton and self.isPressed:
-            self.isPressed = False
+        if (
+            not (self.isSuccess or self.isError or self.isPending)
+            and event.button() == Qt.MouseButton.LeftButton
+            and self.isPressed
+        ):
+            self._release()
+        super(VerificationSlider, self).mouseReleaseEvent(event)
 
-            self.endTime = time.time()
+    def _release(self):
+        self.isPressed = False
+        self.framePacer.flush()
 
+        self.endTime = time.time()
+        reason = self.sampler.finish()
+        if reason:
+            self.abortDrag(reason)
+            return
+
+        if self.asyncAnalysis:
+            self._startAnalysis()
+            self.sliderReleased.emit()
+        else:
             self.analyzeBehavior()
-            self.moveTrack = []
+            self.moveTrack.clear()
 
             self.sliderReleased.emit()
-            self._updateStateColors()
-            if not self.isSuccess:
-                self.resetAnimation()
+            self._finishRelease()
+
+    def _finishRelease(self):
+        self._updateStateColors()
+        if not self.isSuccess:
+            self.resetAnimation()
+
+    def _startAnalysis(self):
+        features = None
+        if self.streamingAnalysis:
+            features = self.streamAnalyzer.features()
+        columns = self.moveTrack.snapshot()
+        self.moveTrack.clear()
+
+        self._analysisToken += 1
+        self._pendingColumns = columns
+        self.isPending = True
+        self._updateStateColors()
+
+        task = AnalysisTask(
+            self._analysisToken,
+            columns,
+            features,
+            self.pipeline,
+            self._analysisSignals,
+        )
+        QThreadPool.globalInstance().start(task)
 
-        super(VerificationSlider, self).mouseReleaseEvent(event)
+    def _onAnalysisFinished(self, token, verdict):
+        if token != self._analysisToken or not self.isPending:
+            return
+        columns = self._pendingColumns
+        self._pendingColumns = None
+        self.isPending = False
+
+        self._applyVerdict(verdict, columns)
+        self._finishRelease()
 
     def mouseMoveEvent(self, event):
-        if self.isSuccess or self.isError:
+        if self.isSuccess or self.isError or self.isPending:
             return
         handleX = self.grooveRect.left() + self._value
         handleX = max(
@@ -212,8 +338,12 @@ class VerificationSlider(QWidget):
                 ),
             )
             new_x -= 16
-            self.setValue(int(new_x))
-            self.moveTrack.append((event.position().x(), time.time()))
+            self.framePacer.submit(int(new_x))
+            pos = event.position()
+            reason = self.sampler.add(pos.x(), pos.y(), event.timestamp())
+            if reason:
+                self.abortDrag(reason)
+                return
         else:
             hover = handleRect.contains(event.position().toPoint())
             if hover != self.isHover:
@@ -221,8 +351,61 @@ class VerificationSlider(QWidget):
                 self._updateStateColors()
         super(VerificationSlider, self).mouseMoveEvent(event)
 
+    def _appendSample(self, x, y, timestamp):
+        self.moveTrack.append(x, y, timestamp)
+        if self.streamingAnalysis:
+            return self.streamAnalyzer.push(x, timestamp, y)
+        return None
+
+    def setTrackCapacity(self, capacity):
+        self.moveTrack = TrackBuffer(capacity)
+
+    def setResampleRate(self, rate):
+        # 按固定频率重采样可让分析耗时与鼠标回报率无关，但插值会抹掉停顿特征，默认关闭
+        self.sampler.resampleRate = rate
+
+    def setFramePacing(self, enabled):
+        # 关闭后每个移动事件都立即重绘，便于对比或在低回报率设备上使用
+        self.framePacer.flush()
+        self.framePacer.enabled = enabled
+
+    def loadThresholds(self, path):
+        # 加载校准工具生成的阈值配置，另行注册的规则保留；流式分析使用同一份阈值
+        thresholds = loadThresholds(path)
+        self.pipeline = buildPipeline(thresholds, base=DEFAULT_PIPELINE)
+        self.streamAnalyzer = StreamingAnalyzer(thresholds)
+
+    def loadModel(self, path):
+        # 用训练好的模型替换六条规则的投票，长度、时长等硬性规则保留
+        pipeline = (self.pipeline or DEFAULT_PIPELINE).copy()
+        pipeline.register(loadModel(path).stage())
+        self.pipeline = pipeline
+
+    def setRecorder(self, recorder):
+        self.recorder = recorder
+
+    def _recordTrack(self, columns, result, msg):
+        if self.recorder is not None and len(columns[0]):
+            xs, ys, ts = columns
+            self.recorder.record(xs, ys, ts, result, msg)
+
+    def abortDrag(self, reason):
+        self.isPressed = False
+        self.framePacer.flush()
+        self.endTime = time.time()
+        self.isBot = True
+        track = self.moveTrack
+        self._recordTrack((track.xs, track.ys, track.ts), False, [reason])
+        self.moveTrack.clear()
+
+        self._emitVerdict(Verdict(False, self.mappedValue(), self.endTime, [reason]))
+
+        self.sliderReleased.emit()
+        self._updateStateColors()
+        self.resetAnimation()
+
     def leaveEvent(self, event):
-        if self.isSuccess or self.isError:
+        if self.isSuccess or self.isError or self.isPending:
             return
         if self.isHover:
             self.isHover = False
@@ -233,98 +416,218 @@ class VerificationSlider(QWidget):
         return self._value
 
     def setValue(self, value):
+        oldRect = self.handleRect()
         self._value = max(self.minimum, min(self.maximum, value))
-        self.update()
+        # 滑块移动时填充槽的右端始终藏在滑块下，新旧滑块区域的并集已覆盖所有变化
+        updateMoved(self, oldRect, self.handleRect())
         mapped_value = int(self._value * 300.0 / 266.0)
         self.valueChanged.emit(mapped_value)
 
     value = Property(int, getValue, setValue)
 
+    def handleRect(self):
+        return QRect(self._value, 0, 34, 34).adjusted(-1, -1, 1, 1)
+
+    @classmethod
+    def clearSpriteCache(cls):
+        VerificationSlider._spriteGeneration += 1
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.Type.PaletteChange, QEvent.Type.StyleChange):
+            self.clearSpriteCache()
+            self.update()
+        super(VerificationSlider, self).changeEvent(event)
+
+    def _sprite(self, key, width, height, render):
+        dpr = self.devicePixelRatioF()
+        key = f"VerificationSlider/{self._spriteGeneration}/{dpr}/{key}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap(ceil(width * dpr), ceil(height * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            # 留出 1 像素边距，容纳抗锯齿描边超出矩形的半个像素
+            painter.translate(1, 1)
+            render(painter)
+            painter.end()
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def _grooveSprite(self):
+        width = self.grooveRect.width()
+        height = self.grooveRect.height()
+        color = self.GROOVE_BACKGROUND
+
+        def render(painter):
+            painter.setBrush(color)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.drawRoundedRect(QRect(0, 0, width, height), 3, 3)
+
+        key = f"groove/{width}x{height}/{color.rgba()}"
+        return self._sprite(key, width + 2, height + 2, render)
+
+    def _roundedRectSprite(self, kind, width, height, pen, brush):
+
+        def render(painter):
+            painter.setPen(QPen(pen, 1))
+            painter.setBrush(brush)
+            painter.drawRoundedRect(QRect(0, 0, width, height), 3, 3)
+
+        key = f"{kind}/{width}x{height}/{pen.rgba()}/{brush.rgba()}"
+        return self._sprite(key, width + 2, height + 2, render)
+
+    def _glyphSprite(self, glyph, color):
+        render = getattr(self, f"_draw{glyph}")
+        key = f"glyph/{glyph}/{color.rgba()}"
+        return self._sprite(key, 34, 34, lambda painter: render(painter, color))
+
+    def _drawFilledGroove(self, painter, rect):
+        pen = self._groovePenColor
+        brush = self._grooveBrushColor
+        template = self.FILL_TEMPLATE_WIDTH
+        if rect.width() < template:
+            # 比模板还窄时按实际宽度单独缓存，与拼接结果的左端像素一致
+            sprite = self._roundedRectSprite(
+                "fill", rect.width(), rect.height(), pen, brush
+            )
+            painter.drawPixmap(rect.topLeft() - QPoint(1, 1), sprite)
+            return
+
+        # 三段拼接：左右两端直接取模板的圆角部分，中间拉伸模板正中的一列像素
+        sprite = self._roundedRectSprite("fill", template, rect.height(), pen, brush)
+        dpr = sprite.devicePixelRatio()
+        half = (template + 2) // 2
+        height = rect.height() + 2
+        left = rect.left() - 1
+        right = rect.left() + rect.width() + 1
+        painter.drawPixmap(
+            QRectF(left, rect.top() - 1, half, height),
+            sprite,
+            QRectF(0, 0, half * dpr, height * dpr),
+        )
+        painter.drawPixmap(
+            QRectF(right - half, rect.top() - 1, half, height),
+            sprite,
+            QRectF(half * dpr, 0, half * dpr, height * dpr),
+        )
+        if right - left > 2 * half:
+            painter.drawPixmap(
+                QRectF(left + half, rect.top() - 1, right - left - 2 * half, height),
+                sprite,
+                QRectF(half * dpr - 1, 0, 1, height * dpr),
+            )
+
+    def _glyphs(self):
+        glyphs = []
+        if self.isPending:
+            glyphs.append("Dots")
+        if self.isError:
+            glyphs.append("Cross")
+        if self.isSuccess:
+            glyphs.append("Check")
+        return glyphs or ["Arrow"]
+
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        painter.setBrush(QColor(247, 249, 250))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRoundedRect(self.grooveRect, 3, 3)
+        painter.drawPixmap(
+            self.grooveRect.topLeft() - QPoint(1, 1), self._grooveSprite()
+        )
 
         if self._value > 0:
             filled_width = self._value
             filled_rect = self.grooveRect.adjusted(
                 0, 0, filled_width - self.grooveRect.width() + 5, 0
             )
-            painter.setPen(QPen(self._groovePenColor, 1))
-            painter.setBrush(self._grooveBrushColor)
-            painter.drawRoundedRect(filled_rect, 3, 3)
+            self._drawFilledGroove(painter, filled_rect)
 
-        painter.setPen(QPen(self._sliderPenColor, 1))
-        painter.setBrush(self._sliderBrushColor)
         self.sliderRect = QRect(1 + self._value, 1, 32, 32)
-        painter.drawRoundedRect(self.sliderRect, 3, 3)
-        if not self.sliderRect.isNull() and not self.isError and not self.isSuccess:
+        origin = self.sliderRect.topLeft() - QPoint(1, 1)
+        painter.drawPixmap(
+            origin,
+            self._roundedRectSprite(
+                "handle", 32, 32, self._sliderPenColor, self._sliderBrushColor
+            ),
+        )
+        for glyph in self._glyphs():
+            color = self.arrowColor
+            if glyph in ("Cross", "Check"):
+                color = QColor(255, 255, 255)
+            painter.drawPixmap(origin, self._glyphSprite(glyph, color))
 
-            center = self.sliderRect.center()
+        drawDirtyRects(painter, event)
 
-            arrow_length = 9
-            shaft_length = 9
-            shaft_width = 1.7
-            head_length = 3
+    # 以下图标绘制在 32×32 的滑块坐标系内，只在生成精灵图时调用
 
-            shaft_start_x = center.x() - arrow_length // 2.5
-            shaft_end_x = shaft_start_x + shaft_length
-            shaft_y = center.y()
+    def _drawArrow(self, painter, color):
+        center = QRect(0, 0, 32, 32).center()
 
-            arrow_color = self.arrowColor
-            painter.setPen(QPen(arrow_color, shaft_width, Qt.SolidLine, Qt.RoundCap))
-            painter.setBrush(Qt.NoBrush)
+        arrow_length = 9
+        shaft_length = 9
+        shaft_width = 1.7
+        head_length = 3
 
-            painter.drawLine(
-                QPointF(shaft_start_x, shaft_y), QPointF(shaft_end_x, shaft_y)
-            )
-            painter.drawLine(
-                QPointF(shaft_end_x, shaft_y),
-                QPointF(shaft_end_x - head_length, shaft_y - head_length),
-            )
-            painter.drawLine(
-                QPointF(shaft_end_x, shaft_y),
-                QPointF(shaft_end_x - head_length, shaft_y + head_length),
-            )
+        shaft_start_x = center.x() - arrow_length // 2.5
+        shaft_end_x = shaft_start_x + shaft_length
+        shaft_y = center.y()
 
-        if not self.sliderRect.isNull() and self.isError:
-            center = self.sliderRect.center()
+        painter.setPen(QPen(color, shaft_width, Qt.SolidLine, Qt.RoundCap))
+        painter.setBrush(Qt.NoBrush)
 
-            cross_size = 4
-            line_width = 1.7
+        painter.drawLine(QPointF(shaft_start_x, shaft_y), QPointF(shaft_end_x, shaft_y))
+        painter.drawLine(
+            QPointF(shaft_end_x, shaft_y),
+            QPointF(shaft_end_x - head_length, shaft_y - head_length),
+        )
+        painter.drawLine(
+            QPointF(shaft_end_x, shaft_y),
+            QPointF(shaft_end_x - head_length, shaft_y + head_length),
+        )
 
-            cross_color = QColor(255, 255, 255)
-            painter.setPen(QPen(cross_color, line_width, Qt.SolidLine, Qt.RoundCap))
+    def _drawDots(self, painter, color):
+        center = QRect(0, 0, 32, 32).center()
 
-            painter.drawLine(
-                center.x() - cross_size + 1,
-                center.y() - cross_size,
-                center.x() + cross_size + 1,
-                center.y() + cross_size,
-            )
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(color)
+        for offset in (-5, 0, 5):
+            painter.drawEllipse(QPointF(center.x() + offset + 1, center.y()), 1.5, 1.5)
 
-            painter.drawLine(
-                center.x() - cross_size + 1,
-                center.y() + cross_size,
-                center.x() + cross_size + 1,
-                center.y() - cross_size,
-            )
-        if not self.sliderRect.isNull() and self.isSuccess:
-            center = self.sliderRect.center()
-            line_width = 1.7
+    def _drawCross(self, painter, color):
+        center = QRect(0, 0, 32, 32).center()
+
+        cross_size = 4
+        line_width = 1.7
 
-            check_color = QColor(255, 255, 255)
-            painter.setPen(QPen(check_color, line_width, Qt.SolidLine, Qt.RoundCap))
+        painter.setPen(QPen(color, line_width, Qt.SolidLine, Qt.RoundCap))
 
-            p1 = QPointF(center.x() - 3.5, center.y() - 0.5)
-            p2 = QPointF(center.x(), center.y() + 3)
-            p3 = QPointF(center.x() + 6.3, center.y() - 3)
+        painter.drawLine(
+            center.x() - cross_size + 1,
+            center.y() - cross_size,
+            center.x() + cross_size + 1,
+            center.y() + cross_size,
+        )
+
+        painter.drawLine(
+            center.x() - cross_size + 1,
+            center.y() + cross_size,
+            center.x() + cross_size + 1,
+            center.y() - cross_size,
+        )
 
-            painter.drawLine(p1, p2)
-            painter.drawLine(p2, p3)
+    def _drawCheck(self, painter, color):
+        center = QRect(0, 0, 32, 32).center()
+        line_width = 1.7
+
+        painter.setPen(QPen(color, line_width, Qt.SolidLine, Qt.RoundCap))
+
+        p1 = QPointF(center.x() - 3.5, center.y() - 0.5)
+        p2 = QPointF(center.x(), center.y() + 3)
+        p3 = QPointF(center.x() + 6.3, center.y() - 3)
+
+        painter.drawLine(p1, p2)
+        painter.drawLine(p2, p3)
 
     def resetAnimation(self):
         self.animation = QPropertyAnimation(self, b"value")
@@ -339,163 +642,64 @@ class VerificationSlider(QWidget):
     def _setHoverFalse(self):
         self.isHover = False
 
+    def reset(self):
+        # 浮层回收复用前恢复初始状态；递增令牌使仍在后台运行的分析结果被丢弃
+        if hasattr(self, "animation"):
+            self.animation.stop()
+        self.framePacer.cancel()
+        self.framePacer.resetStats()
+        self._analysisToken += 1
+        self._pendingColumns = None
+        self.moveTrack.clear()
+        self.streamAnalyzer.reset()
+        self.sampler.reset()
+        self.isPressed = False
+        self.isHover = False
+        self.isError = False
+        self.isSuccess = False
+        self.isPending = False
+        self.isBot = False
+        self.verdict = None
+        self._updateStateColors()
+        self.penColorAnimation.stop()
+        self.brushColorAnimation.stop()
+        self._sliderPenColor = self.NORMAL_PEN
+        self._sliderBrushColor = self.NORMAL_BRUSH
+        self.setValue(0)
+
     def analyzeBehavior(self):
 
-        self.isBot = False
         track = self.moveTrack
+        features = None
+        if self.streamingAnalysis:
+            features = self.streamAnalyzer.features()
 
-        if len(track) < 15:
-            self.isBot = True
-            self.resultDict["result"] = False
-            self.resultDict["msg"] = "滑动轨迹过短"
-            self.resultSignal.emit(self.resultDict)
-            return False
-
-        xs = [p[0] for p in track]
-        ts = [p[1] for p in track]
-        start_time = ts[0]
-        end_time = ts[-1]
-        total_time = end_time - start_time
-
-        total_distance = abs(xs[-1] - xs[0])
-        if total_distance < 5:
-            self.isBot = True
-            self.resultDict["result"] = False
-            self.resultDict["msg"] = "滑动距离过短"
-            self.resultSignal.emit(self.resultDict)
-            return False
-
-        if total_time < 0.3 or total_time > 5.0:
-            self.isBot = True
-            self.resultDict["result"] = False
-            self.resultDict["msg"] = "滑动时间异常"
-            self.resultSignal.emit(self.resultDict)
-            return False
-
-        backward_moves = 0
-        for i in range(1, len(xs)):
-            if xs[i] < xs[i - 1]:
-                backward_moves += 1
-        if backward_moves > 0:
-            self.isBot = True
-
-            self.resultDict["result"] = False
-            self.resultDict["msg"] = ["回退滑动异常"]
-            self.resultSignal.emit(self.resultDict)
-
-        speeds = []
-        for i in range(1, len(track)):
-            dt = ts[i] - ts[i - 1]
-            if dt > 0:
-                dx = abs(xs[i] - xs[i - 1])
-                speeds.append(dx / dt)
-            else:
-                speeds.append(0)
-
-        accelerations = []
-        for i in range(1, len(speeds)):
-            dt = ts[i] - ts[i - 1]
-            if dt > 0:
-                acc = (speeds[i] - speeds[i - 1]) / dt
-                accelerations.append(acc)
-            else:
-                accelerations.append(0)
-
-        jerks = []
-        for i in range(1, len(accelerations)):
-            dt = ts[i + 1] - ts[i]
-            if dt > 0:
-                jerk = (accelerations[i] - accelerations[i - 1]) / dt
-                jerks.append(jerk)
-            else:
-                jerks.append(0)
-
-        avg_speed = total_distance / total_time if total_time > 0 else 0
-
-        if len(speeds) > 1:
-            speed_mean = sum(speeds) / len(speeds)
-            speed_var = sum((s - speed_mean) ** 2 for s in speeds) / (len(speeds) - 1)
-            speed_std = sqrt(speed_var) if speed_var > 0 else 0
-        else:
-            speed_std = 0
-
-        if len(accelerations) > 1:
-            acc_mean = sum(accelerations) / len(accelerations)
-            acc_var = sum((a - acc_mean) ** 2 for a in accelerations) / (
-                len(accelerations) - 1
+        verdict = analyzeTrack(
+            track.xs, track.ts, ys=track.ys, features=features, pipeline=self.pipeline
+        )
+        self._applyVerdict(verdict, (track.xs, track.ys, track.ts))
+        return verdict["result"]
+
+    def _applyVerdict(self, verdict, columns):
+
+        # 所有命中的原因合并到同一个判定结果里，每次拖动只发出一次信号
+        self.isBot = not verdict["result"]
+        msg = flattenFailures(verdict["failures"])
+        self._recordTrack(columns, verdict["result"], msg)
+        self._emitVerdict(
+            Verdict(
+                verdict["result"],
+                self.mappedValue(),
+                self.endTime,
+                msg,
+                verdict["features"],
             )
-            acc_std = sqrt(acc_var) if acc_var > 0 else 0
-        else:
-            acc_std = 0
+        )
 
-        if len(jerks) > 1:
-            jerk_mean = sum(jerks) / len(jerks)
-            jerk_var = sum((j - jerk_mean) ** 2 for j in jerks) / (len(jerks) - 1)
-            jerk_std = sqrt(jerk_var) if jerk_var > 0 else 0
-        else:
-            jerk_std = 0
-
-        speed_changes = [abs(speeds[i] - speeds[i - 1]) for i in range(1, len(speeds))]
-        abrupt_changes = sum(1 for change in speed_changes if change > avg_speed * 0.5)
-
-        pauses = 0
-        for i in range(1, len(track)):
-            dt = ts[i] - ts[i - 1]
-            dx = abs(xs[i] - xs[i - 1])
-            if dt > 0.1 and dx < 2:
-                pauses += 1
-
-        if total_distance > 0:
-            deviations = []
-            for i, x in enumerate(xs):
-                t_ratio = (ts[i] - start_time) / total_time if total_time > 0 else 0
-                expected_x = xs[0] + (xs[-1] - xs[0]) * t_ratio
-                dev = abs(x - expected_x)
-                deviations.append(dev)
-            avg_deviation = sum(deviations) / len(deviations)
-        else:
-            avg_deviation = 0
-
-        speed_std_threshold = 10 + total_distance / 50
-        acc_std_threshold = 50 + total_distance / 10
-        jerk_std_threshold = 200 + total_distance / 5
-        pause_threshold = 1 + total_distance / 100
-        avg_dev_threshold = 2 + total_distance / 30
-
-        reasons = []
-        if speed_std < speed_std_threshold:
-            reasons.append(f"速度变化异常")
-        if acc_std < acc_std_threshold:
-            reasons.append(f"加速度变化异常")
-        if jerk_std < jerk_std_threshold:
-            reasons.append(f"加加速度变化异常")
-        if pauses < pause_threshold:
-            reasons.append(f"停顿次数异常")
-        if avg_deviation < avg_dev_threshold:
-            reasons.append(f"轨迹异常")
-        if abrupt_changes < 2:
-            reasons.append(f"速度突变异常")
-
-        if len(reasons) >= 3:
-            self.isBot = True
-
-            self.resultDict["result"] = False
-            self.resultDict["msg"] = reasons
-
-            self.resultSignal.emit(self.resultDict)
-
-        if total_time < 0.8 and avg_deviation < 1 and speed_std < 5:
-            self.isBot = True
-
-            self.resultDict["result"] = False
-            self.resultDict["msg"] = "极速滑动异常"
-
-            self.resultSignal.emit(self.resultDict)
-
-        if not self.isBot:
-            self.resultDict["result"] = True
-            self.resultDict["value"] = self._value * 300 // 266
-            self.resultDict["endTime"] = self.endTime
-            self.resultDict["msg"] = ""
-            self.resultSignal.emit(self.resultDict)
-        return True
+    def _emitVerdict(self, verdict):
+        self.verdict = verdict
+        self.resultSignal.emit(verdict.asDict())
+        self.verdictSignal.emit(verdict)
+
+    def mappedValue(self):
+        return self._value * 300 // 266
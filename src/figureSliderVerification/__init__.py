@@ -1,6 +1,11 @@
+from ..components.flyout import Flyout
+from .verificationCard import VerificationFlyout
 
 
+def __getattr__(name):
+    # 本地图片版的 VerificationImage 只在用到时导入，浮层使用的是 url_image 中的版本
+    if name == "VerificationImage":
+        from .image import VerificationImage
 
-from ..components.flyout import Flyout
-from .image import VerificationImage
-from .verificationCard import VerificationFlyout
+        return VerificationImage
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
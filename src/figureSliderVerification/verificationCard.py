@@ -1,22 +1,12 @@
-from typing import Optional, Union, List
+from typing import Optional
 
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
 )
-from PySide6.QtGui import (
-    QPixmap,
-)
-from PySide6.QtCore import (
-    QTimer,
-    Signal,
-    QPoint,
-)
-from src.components.flyout import (
-    Flyout,
-    FlyoutView,
-    PullUpFlyoutAnimationManager,
-)
+from PySide6.QtCore import Signal
+from src.components.flyout import FlyoutView, PooledFlyout
+from src.behavior.verdict import Verdict
 from src.components.slider import VerificationSlider
 
 from .url_image import VerificationImage
@@ -40,18 +30,18 @@ class VerificationCard(QWidget):
         self.vBoxLayout.addWidget(self.verifySlider)
 
         self.verifySlider.valueChanged.connect(self.verifyImage.setMoveX)
-        self.verifySlider.resultSignal.connect(self.verify)
+        self.verifySlider.verdictSignal.connect(self.verify)
 
         self.tolerance: int = 10
 
         self.attemptCount: int = 0
         self.maxAttempts: int = 5
 
-    def verify(self, resultDict: dict) -> None:
+    def verify(self, verdict: Verdict) -> None:
         self.pixmapValue = self.verifyImage.getMoveX()
         self.correctValue = self.verifyImage.getCorrectValue()
         if (
-            resultDict["result"]
+            verdict.result
             and abs(self.pixmapValue - self.correctValue) <= self.tolerance
         ):
             self.verificationSuccess.emit()
@@ -62,6 +52,10 @@ class VerificationCard(QWidget):
             self.verifySlider.setSuccess(False)
             self.verifySlider.setError(True)
 
+    def reset(self) -> None:
+        self.verifySlider.reset()
+        self.verifyImage.refresh_image()
+
 
 class VerificationFlyoutView(FlyoutView):
 
@@ -83,36 +77,14 @@ class VerificationFlyoutView(FlyoutView):
         self.adjustSize()
 
 
-class VerificationFlyout(Flyout):
-
-    success = Signal()
+class VerificationFlyout(PooledFlyout):
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         view = VerificationFlyoutView()
-        super().__init__(view, parent, isDeleteOnClose=False)
+        super().__init__(view, parent)
         self.view: VerificationFlyoutView = view
         self.view.card.verificationSuccess.connect(self.closeWindow)
 
-    @classmethod
-    def create(
-        cls,
-        target: Optional[Union[QWidget, QPoint]] = None,
-        parent: Optional[QWidget] = None,
-    ) -> "VerificationFlyout":
-
-        flyout = cls(parent)
-        if target is None:
-            return flyout
-
-        flyout.show()
-        if isinstance(target, QWidget):
-            pos = PullUpFlyoutAnimationManager(flyout).position(target)
-        else:
-            pos = target
-
-        flyout.exec(pos)
-        return flyout
-
-    def closeWindow(self) -> None:
-        self.success.emit()
-        QTimer.singleShot(300, self.fadeOut)
+    def resetContent(self) -> None:
+        # 放回池中时换一道新题
+        self.view.card.reset()
@@ -1,14 +1,13 @@
 import random
 import math
-from typing import List, Optional
+from typing import Optional
 
-from PySide6.QtCore import Qt, QPoint, QRect, QSize, Signal
+from PySide6.QtCore import Qt, QPoint, QRect, Signal
 from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import (
     QPainter,
     QColor,
     QPixmap,
-    QFont,
     QPen,
     QBrush,
     QPainterPath,
@@ -1,10 +1,10 @@
-from typing import Optional, Union
+from typing import Optional
 
-from PySide6.QtCore import Qt, QTimer, Signal, QPoint
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 
 from .image import VerificationImage
-from ..components.flyout import Flyout, FlyoutView, PullUpFlyoutAnimationManager
+from ..components.flyout import FlyoutView, PooledFlyout
 
 
 class VerificationCard(QWidget):
@@ -46,6 +46,10 @@ class VerificationCard(QWidget):
 
         self.tipLabel.setText(self.verifyImage.verificationText)
 
+    def reset(self) -> None:
+        self.verifyImage.refreshImage()
+        self.updateTipLabel()
+
 
 class VerificationFlyoutView(FlyoutView):
 
@@ -70,36 +74,14 @@ class VerificationFlyoutView(FlyoutView):
 
 
 
-class VerificationFlyout(Flyout):
-
-    success = Signal()
+class VerificationFlyout(PooledFlyout):
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         view = VerificationFlyoutView()
-        super().__init__(view, parent, isDeleteOnClose=False)
+        super().__init__(view, parent)
         self.view: VerificationFlyoutView = view
         self.view._contentWidget.verificationSuccess.connect(self.closeWindow)
 
-    @classmethod
-    def create(
-        cls,
-        target: Optional[Union[QWidget, QPoint]] = None,
-        parent: Optional[QWidget] = None,
-    ) -> "VerificationFlyout":
-
-        flyout = cls(parent)
-        if target is None:
-            return flyout
-
-        flyout.show()
-        if isinstance(target, QWidget):
-            pos = PullUpFlyoutAnimationManager(flyout).position(target)
-        else:
-            pos = target
-
-        flyout.exec(pos)
-        return flyout
-
-    def closeWindow(self) -> None:
-        self.success.emit()
-        QTimer.singleShot(300, self.fadeOut)
+    def resetContent(self) -> None:
+        # 放回池中时换一道新题
+        self.view._contentWidget.reset()
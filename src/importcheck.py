@@ -0,0 +1,122 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 导入开销回归检查：每个模块在全新的子进程里用 python -X importtime 导入一次，
+# 检查没有带进不该导入的模块，并报告累计耗时；发现回退时以非零状态退出，可直接放进 CI
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+KIND_PACKAGES = (
+    "src.basicSliderVerification",
+    "src.figureSliderVerification",
+    "src.circleSliderVerification",
+    "src.textClickVerification",
+    "src.iconClickVerification",
+)
+
+
+def _others(package: str) -> Tuple[str, ...]:
+    return tuple(other for other in KIND_PACKAGES if other != package)
+
+
+# (被导入的模块, 不允许随之导入的模块)；前缀匹配，"numpy" 同时覆盖 numpy 的子模块
+CHECKS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("src", ("PySide6", "numpy", "src.behavior", "src.components") + KIND_PACKAGES),
+    ("src.behavior.model", ("PySide6", "src.behavior.calibrate", "multiprocessing")),
+    (
+        "src.iconClickVerification",
+        ("PySide6.QtNetwork", "src.behavior", "src.components.slider")
+        + _others("src.iconClickVerification"),
+    ),
+    (
+        "src.textClickVerification",
+        ("src.behavior", "src.components.slider")
+        + _others("src.textClickVerification"),
+    ),
+) + tuple(
+    (
+        package,
+        (f"{package}.image", "src.behavior.calibrate", "multiprocessing")
+        + _others(package),
+    )
+    for package in KIND_PACKAGES[:3]
+)
+
+
+def importProfile(module: str, python: str = sys.executable) -> Dict[str, int]:
+    # 返回 {模块名: 累计导入耗时（微秒）}，只包含这次导入新加载的模块
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        profile[fields[2].strip()] = int(fields[1])
+    return profile
+
+
+def _matches(name: str, forbidden: str) -> bool:
+    return name == forbidden or name.startswith(forbidden + ".")
+
+
+def checkImports(
+    checks: Sequence[Tuple[str, Tuple[str, ...]]] = CHECKS,
+    budget: Optional[float] = None,
+) -> Tuple[List[dict], List[str]]:
+
+    results, failures = [], []
+    for module, forbidden in checks:
+        profile = importProfile(module)
+        total = profile.get(module, 0) / 1e6
+        leaked = sorted(
+            name
+            for name in profile
+            if any(_matches(name, prefix) for prefix in forbidden)
+        )
+        results.append({"module": module, "seconds": total, "leaked": leaked})
+        if leaked:
+            failures.append(f"{module} 导入了 {', '.join(leaked[:5])}")
+        if budget is not None and total > budget:
+            failures.append(f"{module} 导入耗时 {total * 1000:.1f} 毫秒，超出预算")
+    return results, failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.importcheck",
+        description="用 python -X importtime 检查各模块的导入开销是否回退",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="每个模块允许的累计导入耗时（毫秒），默认只检查导入了哪些模块",
+    )
+    args = parser.parse_args(argv)
+
+    budget = args.budget / 1000 if args.budget is not None else None
+    results, failures = checkImports(budget=budget)
+    for result in results:
+        status = "多余导入" if result["leaked"] else "正常"
+        print(f"{result['module']}\t{result['seconds'] * 1000:.1f} 毫秒\t{status}")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import importlib
+from typing import Dict
+
+# 验证码类型名到 "模块:类名" 的映射，类在第一次用到时才导入；
+# 只用一种验证码的程序不会为其余类型的控件、QtNetwork 等付出导入开销
+KINDS: Dict[str, str] = {
+    "basic": "src.basicSliderVerification:VerificationFlyout",
+    "figure": "src.figureSliderVerification:VerificationFlyout",
+    "circle": "src.circleSliderVerification:VerificationFlyout",
+    "textClick": "src.textClickVerification:VerificationFlyout",
+    "iconClick": "src.iconClickVerification:VerificationFlyout",
+}
+
+_classes: Dict[str, type] = {}
+
+
+def registerKind(kind: str, path: str) -> None:
+    # 注册自定义验证码类型，path 形如 "package.module:ClassName"；同名类型会被替换
+    KINDS[kind] = path
+    _classes.pop(kind, None)
+
+
+def flyoutClass(kind: str) -> type:
+    cls = _classes.get(kind)
+    if cls is None:
+        try:
+            path = KINDS[kind]
+        except KeyError:
+            raise ValueError(f"未知的验证码类型: {kind}") from None
+        module, _, name = path.partition(":")
+        cls = _classes[kind] = getattr(importlib.import_module(module), name)
+    return cls
+
+
+def create(kind: str, target=None, parent=None, **kwargs):
+    return flyoutClass(kind).create(target, parent, **kwargs)
+
+
+def prewarm(kind: str, count: int = 1) -> None:
+    flyoutClass(kind).prewarm(count)
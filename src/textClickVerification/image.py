@@ -1,28 +1,22 @@
 import sys
 import random
 from random import randint
-from typing import List, Tuple, Optional
+from typing import List
 
 from PySide6.QtWidgets import (
     QApplication,
     QWidget,
-    QLabel,
     QVBoxLayout,
-    QHBoxLayout,
 )
 from PySide6.QtCore import (
     Qt,
     QPropertyAnimation,
-    QEasingCurve,
     Signal,
     QPoint,
-    QSize,
     QRectF,
     QRect,
-    Property,
 )
 from PySide6.QtGui import (
-    QIcon,
     QPixmap,
     QPainter,
     QColor,
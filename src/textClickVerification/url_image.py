@@ -1,30 +1,16 @@
-import sys
 import random
 from random import randint
-from typing import List, Tuple, Optional
-
-from PySide6.QtWidgets import (
-    QApplication,
-    QWidget,
-    QLabel,
-    QVBoxLayout,
-    QHBoxLayout,
-)
+
+from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import (
     Qt,
     QPropertyAnimation,
-    QEasingCurve,
     Signal,
     QPoint,
-    QSize,
     QRectF,
     QRect,
-    Property,
-    QUrl,
-    QByteArray,
 )
 from PySide6.QtGui import (
-    QIcon,
     QPixmap,
     QPainter,
     QColor,
@@ -34,12 +20,14 @@ from PySide6.QtGui import (
     QMouseEvent,
     QBrush,
 )
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+
+from src.components.images import RANDOM_IMAGE_URL, imagePool
 
 
 class VerificationImage(QWidget):
     clickSignal = Signal(int, int)
     verificationComplete = Signal(bool, list)
+    imageLoaded = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
@@ -65,43 +53,28 @@ class VerificationImage(QWidget):
         self.userClicks = []
         self.verificationText = ""
 
-        self.networkManager = QNetworkAccessManager(self)
-        self.networkManager.finished.connect(self.onImageDownloaded)
-
         self.currentImage = QPixmap(self._width, self._height)
         self.currentImage.fill(QColor(200, 200, 200))
 
         self.loading = True
-        self.loadImageFromUrl("https://api.elaina.cat/random/pc")
+        self.loadImageFromUrl(RANDOM_IMAGE_URL)
 
     def loadImageFromUrl(self, url: str):
         self.loading = True
         self.update()
-        request = QNetworkRequest(QUrl(url))
-        self.networkManager.get(request)
+        imagePool(url).request(self.onImageLoaded)
 
-    def onImageDownloaded(self, reply: QNetworkReply):
-        if reply.error() != QNetworkReply.NetworkError.NoError:
-            print(f"网络错误: {reply.errorString()}，使用灰色背景")
+    def onImageLoaded(self, image, error):
+        if image is None:
+            print(f"{error}，使用灰色背景")
             self.fallbackToLocalImage()
         else:
-            data = reply.readAll()
-            pixmap = QPixmap()
-            if not pixmap.loadFromData(data):
-                print("图片数据解析失败，使用灰色背景")
-                self.fallbackToLocalImage()
-            else:
-                self.currentImage = pixmap.scaled(
-                    self._width,
-                    self._height,
-                    Qt.AspectRatioMode.IgnoreAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                self.loading = False
-                self.generateText()
-                self.update()
-
-        reply.deleteLater()
+            self.currentImage = QPixmap.fromImage(image)
+            self.loading = False
+            self.generateText()
+            self.update()
+
+        self.imageLoaded.emit()
 
     def fallbackToLocalImage(self):
         self.currentImage.fill(QColor(200, 200, 200))
@@ -253,7 +226,7 @@ class VerificationImage(QWidget):
         self.verificationComplete.emit(success, correct)
 
     def reset(self):
-        self.loadImageFromUrl("https://api.elaina.cat/random/pc")
+        self.loadImageFromUrl(RANDOM_IMAGE_URL)
 
     def refreshImage(self):
         if (
@@ -263,4 +236,4 @@ class VerificationImage(QWidget):
             self.animation.stop()
             self.animation.deleteLater()
             delattr(self, "animation")
-        self.loadImageFromUrl("https://api.elaina.cat/random/pc")
+        self.loadImageFromUrl(RANDOM_IMAGE_URL)
@@ -1,9 +1,8 @@
-from typing import Optional, Union
+from typing import Optional
 
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QPushButton,
     QLabel,
 )
 
@@ -12,13 +11,8 @@ from PySide6.QtCore import Qt
 from PySide6.QtCore import (
     QTimer,
     Signal,
-    QPoint,
-)
-from src.components.flyout import (
-    Flyout,
-    FlyoutView,
-    PullUpFlyoutAnimationManager,
 )
+from src.components.flyout import FlyoutView, PooledFlyout
 
 from .url_image import VerificationImage
 
@@ -45,8 +39,7 @@ class VerificationCard(QWidget):
         self.verifyImage.verificationComplete.connect(self.verify)
 
 
-        if hasattr(self.verifyImage, 'networkManager'):
-            self.verifyImage.networkManager.finished.connect(self.onImageLoaded)
+        self.verifyImage.imageLoaded.connect(self.onImageLoaded)
 
     def onImageLoaded(self):
 
@@ -67,6 +60,10 @@ class VerificationCard(QWidget):
 
         self.tipLabel.setText(self.verifyImage.verificationText)
 
+    def reset(self) -> None:
+        self.tipLabel.setText("点击: 加载中...")
+        self.verifyImage.refreshImage()
+
 
 class VerificationFlyoutView(FlyoutView):
 
@@ -88,36 +85,14 @@ class VerificationFlyoutView(FlyoutView):
         self.adjustSize()
 
 
-class VerificationFlyout(Flyout):
-
-    success = Signal()
+class VerificationFlyout(PooledFlyout):
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         view = VerificationFlyoutView()
-        super().__init__(view, parent, isDeleteOnClose=False)
+        super().__init__(view, parent)
         self.view: VerificationFlyoutView = view
         self.view.card.verificationSuccess.connect(self.closeWindow)
 
-    @classmethod
-    def create(
-        cls,
-        target: Optional[Union[QWidget, QPoint]] = None,
-        parent: Optional[QWidget] = None,
-    ) -> "VerificationFlyout":
-
-        flyout = cls(parent)
-        if target is None:
-            return flyout
-
-        flyout.show()
-        if isinstance(target, QWidget):
-            pos = PullUpFlyoutAnimationManager(flyout).position(target)
-        else:
-            pos = target
-
-        flyout.exec(pos)
-        return flyout
-
-    def closeWindow(self) -> None:
-        self.success.emit()
-        QTimer.singleShot(300, self.fadeOut)
+    def resetContent(self) -> None:
+        # 放回池中时换一道新题
+        self.view.card.reset()
@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def spin(qapp):
+    # 处理事件直到 until() 为真或超时，返回 until() 的最终结果
+    def spin(timeout=1.0, until=None):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            qapp.processEvents()
+            if until is not None and until():
+                return True
+            time.sleep(0.005)
+        return until() if until is not None else None
+
+    return spin
@@ -0,0 +1,61 @@
+from src.behavior.analyzer import (
+    RulePipeline,
+    Stage,
+    VoteStage,
+    analyzeTrack,
+    buildPipeline,
+    flattenFailures,
+)
+
+# 回退一步必然带来很大的速度波动，默认阈值下回退和极速规则不会同时命中，这里放宽极速阈值
+PIPELINE = buildPipeline({"extreme_speed_std": 200, "abrupt_min": 4})
+
+
+def robotTrack():
+    # 匀速直线、中途回退一步、0.4 秒完成：回退、极速和投票三类规则同时命中
+    xs = [i * 5.0 for i in range(40)]
+    xs[20] = xs[19] - 1
+    ts = [i * 0.01 for i in range(40)]
+    return xs, ts, [0.0] * 40
+
+
+def test_verdict_lists_every_triggered_reason():
+    xs, ts, ys = robotTrack()
+    verdict = analyzeTrack(xs, ts, ys=ys, pipeline=PIPELINE)
+    msg = flattenFailures(verdict["failures"])
+
+    assert not verdict["result"]
+    assert "回退滑动异常" in msg
+    assert "极速滑动异常" in msg
+    assert {"停顿次数异常", "轨迹异常", "速度突变异常"} <= set(msg)
+
+
+def test_incomplete_evaluation_stops_at_first_failure():
+    xs, ts, ys = robotTrack()
+    complete = analyzeTrack(xs, ts, ys=ys, pipeline=PIPELINE)
+    quick = analyzeTrack(xs, ts, ys=ys, pipeline=PIPELINE, complete=False)
+
+    assert quick["result"] == complete["result"]
+    assert quick["failures"] == complete["failures"][:1]
+
+
+def test_vote_collects_all_fired_rules_only_when_complete():
+    stage = VoteStage(
+        "vote", [(str(i), lambda f: True, ()) for i in range(4)], need=2
+    )
+    pipeline = RulePipeline([stage])
+
+    assert pipeline.evaluate({}, complete=False) == [["0", "1"]]
+    assert pipeline.evaluate({}) == [["0", "1", "2", "3"]]
+
+
+def test_passing_track_has_no_failures():
+    pipeline = RulePipeline([Stage("never", lambda f: None)])
+    assert pipeline.evaluate({}) == []
+
+
+def test_hard_gates_stop_collection():
+    # 轨迹过短时其余特征没有意义，空轨迹也不能让后续阶段出错
+    for xs, ts in (([], []), ([0.0], [0.0]), ([0.0, 1.0], [0.0, 0.01])):
+        verdict = analyzeTrack(xs, ts)
+        assert verdict["failures"] == ["滑动轨迹过短"]
@@ -0,0 +1,123 @@
+import glob
+import multiprocessing
+import os
+import sqlite3
+import time
+
+import pytest
+
+from src.components import diskcache
+from src.components.diskcache import DiskCache
+
+
+def tempFiles(directory):
+    return glob.glob(os.path.join(directory, "*", "*.tmp"))
+
+
+def test_reopen_sweeps_stale_temp_files(tmp_path, monkeypatch):
+    directory = str(tmp_path / "cache")
+    cache = DiskCache(directory)
+    key = cache.put(b"kept", {})
+
+    # 模拟写完临时文件、替换之前进程崩溃
+    def crash(src, dst):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(diskcache.os, "replace", crash)
+        with pytest.raises(KeyboardInterrupt):
+            cache.put(b"lost", {})
+    stale = tempFiles(directory)
+    assert len(stale) == 1
+    old = time.time() - diskcache.STALE_TEMP_SECONDS - 1
+    os.utime(stale[0], (old, old))
+
+    # 刚写的临时文件可能属于另一个正在写入的进程，保留
+    fresh = os.path.join(os.path.dirname(stale[0]), "other.123.456.tmp")
+    with open(fresh, "wb") as f:
+        f.write(b"partial")
+
+    reopened = DiskCache(directory)
+    assert tempFiles(directory) == [fresh]
+    assert reopened.get(key) == b"kept"
+
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    first = cache.put(b"same bytes", {"small.png": b"v"})
+    size = cache.totalBytes()
+    second = cache.put(b"same bytes", {"small.png": b"v"})
+    assert first == second == diskcache.contentKey(b"same bytes")
+    assert len(cache) == 1
+    assert cache.totalBytes() == size
+    files = glob.glob(os.path.join(str(tmp_path / "cache"), "*", first + ".*"))
+    assert len(files) == 2
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(diskcache.time, "time", lambda: float(next(clock)))
+    cache = DiskCache(str(tmp_path / "cache"), maxBytes=300)
+    keys = [cache.put(bytes([i]) * 100, {}) for i in range(3)]
+    # 读一次 keys[0]，最久未用的变成 keys[1]
+    assert cache.get(keys[0]) is not None
+    keys.append(cache.put(b"\xff" * 100, {}))
+
+    assert cache.get(keys[1]) is None
+    assert not os.path.exists(cache.path(keys[1], diskcache.ORIGINAL))
+    assert all(cache.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+    assert cache.totalBytes() == 300
+
+
+def test_index_survives_reopen(tmp_path):
+    directory = str(tmp_path / "cache")
+    cache = DiskCache(directory)
+    key = cache.put(b"persisted", {"32x18.png": b"thumb"})
+    del cache
+
+    reopened = DiskCache(directory)
+    assert len(reopened) == 1
+    assert reopened.get(key) == b"persisted"
+    assert reopened.pick("32x18.png") == (key, b"thumb")
+    assert reopened.totalBytes() == len(b"persisted") + len(b"thumb")
+
+
+def writer(directory, start, count, maxBytes):
+    cache = DiskCache(directory, maxBytes=maxBytes)
+    for i in range(start, start + count):
+        payload = i.to_bytes(4, "big") * 256
+        cache.put(payload, {"small.png": payload[:64]})
+        # 另一个进程写入的条目要么完整可读，要么已被淘汰
+        for j in range(start, i + 1):
+            data = cache.get(diskcache.contentKey(j.to_bytes(4, "big") * 256))
+            assert data is None or data == j.to_bytes(4, "big") * 256
+
+
+def test_concurrent_processes(tmp_path):
+    directory = str(tmp_path / "cache")
+    DiskCache(directory)
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=writer, args=(directory, n * 100, 40, 40 * 1024))
+        for n in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    cache = DiskCache(directory, maxBytes=40 * 1024)
+    db = sqlite3.connect(os.path.join(directory, "index.sqlite"))
+    assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    rows = db.execute("SELECT key, variant, bytes FROM entries").fetchall()
+    db.close()
+    # 索引中的每个文件都存在且大小一致，没有半写的文件或残留的临时文件
+    assert rows
+    for key, variant, size in rows:
+        assert os.path.getsize(cache.path(key, variant)) == size
+    assert cache.totalBytes() <= 40 * 1024
+    assert not tempFiles(directory)
+    indexed = {cache.path(key, variant) for key, variant, _ in rows}
+    stored = set(glob.glob(os.path.join(directory, "*", "*.*")))
+    assert stored == indexed
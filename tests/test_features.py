@@ -0,0 +1,212 @@
+import random
+from math import sqrt
+
+import pytest
+
+from src.behavior.analyzer import analyzeTrack, flattenFailures
+from src.behavior.features import HAS_NUMPY, TrackFeatures
+
+BACKENDS = ["python"] + (["numpy"] if HAS_NUMPY else [])
+
+
+def referenceAnalyze(xs, ts):
+    # 向量化之前 VerificationSlider.analyzeBehavior 的原始循环实现，只把信号换成返回值；
+    # 返回 (是否通过, 全部命中的原因, 特征)
+    if len(xs) < 15:
+        return False, ["滑动轨迹过短"], None
+
+    start_time = ts[0]
+    end_time = ts[-1]
+    total_time = end_time - start_time
+
+    total_distance = abs(xs[-1] - xs[0])
+    if total_distance < 5:
+        return False, ["滑动距离过短"], None
+
+    if total_time < 0.3 or total_time > 5.0:
+        return False, ["滑动时间异常"], None
+
+    isBot = False
+    msg = []
+    backward_moves = 0
+    for i in range(1, len(xs)):
+        if xs[i] < xs[i - 1]:
+            backward_moves += 1
+    if backward_moves > 0:
+        isBot = True
+        msg.append("回退滑动异常")
+
+    speeds = []
+    for i in range(1, len(xs)):
+        dt = ts[i] - ts[i - 1]
+        if dt > 0:
+            dx = abs(xs[i] - xs[i - 1])
+            speeds.append(dx / dt)
+        else:
+            speeds.append(0)
+
+    accelerations = []
+    for i in range(1, len(speeds)):
+        dt = ts[i] - ts[i - 1]
+        if dt > 0:
+            acc = (speeds[i] - speeds[i - 1]) / dt
+            accelerations.append(acc)
+        else:
+            accelerations.append(0)
+
+    jerks = []
+    for i in range(1, len(accelerations)):
+        dt = ts[i + 1] - ts[i]
+        if dt > 0:
+            jerk = (accelerations[i] - accelerations[i - 1]) / dt
+            jerks.append(jerk)
+        else:
+            jerks.append(0)
+
+    avg_speed = total_distance / total_time if total_time > 0 else 0
+
+    def std(values):
+        if len(values) > 1:
+            mean = sum(values) / len(values)
+            var = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+            return sqrt(var) if var > 0 else 0
+        return 0
+
+    speed_std = std(speeds)
+    acc_std = std(accelerations)
+    jerk_std = std(jerks)
+
+    speed_changes = [abs(speeds[i] - speeds[i - 1]) for i in range(1, len(speeds))]
+    abrupt_changes = sum(1 for change in speed_changes if change > avg_speed * 0.5)
+
+    pauses = 0
+    for i in range(1, len(xs)):
+        dt = ts[i] - ts[i - 1]
+        dx = abs(xs[i] - xs[i - 1])
+        if dt > 0.1 and dx < 2:
+            pauses += 1
+
+    deviations = []
+    for i, x in enumerate(xs):
+        t_ratio = (ts[i] - start_time) / total_time if total_time > 0 else 0
+        expected_x = xs[0] + (xs[-1] - xs[0]) * t_ratio
+        deviations.append(abs(x - expected_x))
+    avg_deviation = sum(deviations) / len(deviations)
+
+    reasons = []
+    if speed_std < 10 + total_distance / 50:
+        reasons.append("速度变化异常")
+    if acc_std < 50 + total_distance / 10:
+        reasons.append("加速度变化异常")
+    if jerk_std < 200 + total_distance / 5:
+        reasons.append("加加速度变化异常")
+    if pauses < 1 + total_distance / 100:
+        reasons.append("停顿次数异常")
+    if avg_deviation < 2 + total_distance / 30:
+        reasons.append("轨迹异常")
+    if abrupt_changes < 2:
+        reasons.append("速度突变异常")
+    if len(reasons) >= 3:
+        isBot = True
+        msg.extend(reasons)
+
+    if total_time < 0.8 and avg_deviation < 1 and speed_std < 5:
+        isBot = True
+        msg.append("极速滑动异常")
+
+    features = {
+        "total_time": total_time,
+        "total_distance": total_distance,
+        "backward_moves": backward_moves,
+        "speed_std": speed_std,
+        "acc_std": acc_std,
+        "jerk_std": jerk_std,
+        "abrupt_changes": abrupt_changes,
+        "pauses": pauses,
+        "avg_deviation": avg_deviation,
+    }
+    return not isBot, msg, features
+
+
+def humanTrack(rng, n, gaps=0, repeats=0):
+    # 带噪声的单调拖动；gaps 插入停在原地的长间隔（时长分布在 0.1 秒判定边界两侧），
+    # repeats 插入时间戳相同的采样
+    stops = set(rng.sample(range(1, n), min(gaps, n - 1))) if n > 1 else set()
+    xs, ts = [0.0], [0.0]
+    for i in range(1, n):
+        if i in stops:
+            xs.append(xs[-1] + rng.uniform(0, 3))
+            ts.append(ts[-1] + rng.uniform(0.05, 0.4))
+        else:
+            xs.append(xs[-1] + max(0.0, rng.gauss(3, 2)))
+            ts.append(ts[-1] + rng.uniform(0.004, 0.02))
+    for _ in range(repeats):
+        i = rng.randrange(1, n)
+        ts[i] = ts[i - 1]
+    return xs, ts
+
+
+def robotTrack(rng, n):
+    # 匀速直线，时间间隔固定，偶尔回退一步
+    step = rng.uniform(1, 8)
+    dt = rng.uniform(0.005, 0.03)
+    xs = [i * step for i in range(n)]
+    if rng.random() < 0.3:
+        i = rng.randrange(1, n)
+        xs[i] = xs[i - 1] - 1
+    return xs, [i * dt for i in range(n)]
+
+
+def cases():
+    rng = random.Random(1)
+    tracks = []
+    for n in (0, 1, 2, 3, 14, 15, 16):
+        tracks.append(humanTrack(rng, n) if n else ([], []))
+    for _ in range(60):
+        n = rng.randrange(15, 400)
+        tracks.append(humanTrack(rng, n))
+        tracks.append(humanTrack(rng, n, gaps=rng.randrange(1, 8)))
+        tracks.append(humanTrack(rng, n, repeats=rng.randrange(1, 10)))
+        tracks.append(robotTrack(rng, n))
+    # 全部采样同一时刻、只有一段长间隔、距离为零
+    tracks.append(([float(i) for i in range(30)], [0.0] * 30))
+    tracks.append(([float(i * 10) for i in range(20)], [0.0] * 19 + [2.0]))
+    tracks.append(([5.0] * 40, [i * 0.02 for i in range(40)]))
+    return tracks
+
+
+CASES = cases()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_features_match_reference(backend):
+    checked = 0
+    for xs, ts in CASES:
+        _, _, expected = referenceAnalyze(xs, ts)
+        if expected is None:
+            continue
+        features = TrackFeatures(xs, ts, backend=backend)
+        for name, value in expected.items():
+            assert features[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+        checked += 1
+    assert checked > 200
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_verdicts_match_reference(backend, monkeypatch):
+    # 强制所有轨迹使用指定后端，包括低于 NUMPY_MIN_SAMPLES 的短轨迹
+    monkeypatch.setattr(
+        "src.behavior.analyzer.TrackFeatures",
+        lambda xs, ts, ys=None, values=None: TrackFeatures(
+            xs, ts, ys=ys, backend=backend, values=values
+        ),
+    )
+    bots = 0
+    for xs, ts in CASES:
+        result, msg, _ = referenceAnalyze(xs, ts)
+        verdict = analyzeTrack(xs, ts)
+        assert verdict["result"] == result
+        assert sorted(flattenFailures(verdict["failures"])) == sorted(msg)
+        bots += not result
+    assert 0 < bots < len(CASES)
+
@@ -0,0 +1,155 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PySide6.QtCore import QBuffer, QSize
+from PySide6.QtGui import QImage
+
+from src.components.diskcache import DiskCache
+from src.components import images
+from src.components.images import ImagePool, imagePool, variantName
+
+
+def pngBytes(width=64, height=36):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(0x3366CC)
+    buffer = QBuffer()
+    buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            failing = server.failures > 0
+            if failing:
+                server.failures -= 1
+        time.sleep(server.delay)
+        body = b"" if failing else server.body
+        self.send_response(503 if failing else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(qapp):
+    # 本地图片服务：每个请求延迟 delay 秒，前 failures 个请求返回 503，之后返回同一张 PNG
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.lock = threading.Lock()
+    httpd.requests = 0
+    httpd.failures = 0
+    httpd.delay = 0.0
+    httpd.body = pngBytes()
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/image"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def makePool(url, capacity=3, cache=None):
+    pool = ImagePool(url, capacity=capacity, size=QSize(32, 18), cache=cache)
+    pool.retryDelay = 0.2
+    pool.maxRetryDelay = 0.4
+    return pool
+
+
+def test_offline_requests_stay_bounded(server, spin):
+    server.failures = 10**6
+    pool = makePool(server.url)
+    results = []
+    for _ in range(16):
+        pool.request(lambda image, error: results.append((image, error)))
+        spin(0.05)
+    assert spin(2.0, lambda: len(results) == 16)
+    assert all(image is None and error for image, error in results)
+    # 第一次失败之后不再为每次请求补足，只剩退避的探测请求
+    first = server.requests
+    assert first <= 3 + 16
+    spin(1.0)
+    assert server.requests - first <= 4
+    for _ in range(16):
+        pool.request(lambda image, error: results.append((image, error)))
+    assert len(results) == 32
+    assert server.requests - first <= 5
+
+
+def test_recovers_after_failures(server, spin):
+    server.failures = 5
+    pool = makePool(server.url)
+    results = []
+    pool.refill()
+    assert spin(1.0, lambda: pool.failures > 0)
+    pool.request(lambda image, error: results.append((image, error)))
+    assert results and results[0][0] is None
+    # 探测请求成功后恢复补足
+    assert spin(5.0, lambda: len(pool) == pool.capacity)
+    assert server.requests <= 3 + 5 + pool.capacity
+    pool.request(lambda image, error: results.append((image, error)))
+    assert results[-1][0] is not None and not results[-1][1]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    cache.put(b"original", {variantName(QSize(32, 18)): pngBytes(32, 18)})
+    return cache
+
+
+def test_slow_fallback_only_for_overdue_waiters(server, cache, spin):
+    # 第一个调用方等到了新图，之后才排队的调用方不能被前者的超时提前转去缓存
+    server.delay = 0.25
+    pool = makePool(server.url, capacity=0, cache=cache)
+    pool.slowTimeout = 0.5
+    results = []
+    pool.request(lambda image, error: results.append((image, error)))
+    assert spin(2.0, lambda: len(results) == 1)
+    spin(0.05)
+    pool.request(lambda image, error: results.append((image, error)))
+    assert spin(2.0, lambda: len(results) == 2)
+    spin(0.6)
+    assert pool.cacheHits == 0
+    assert all(image is not None for image, _ in results)
+
+
+def test_slow_fallback_serves_overdue_waiter(server, cache, spin):
+    server.delay = 1.0
+    pool = makePool(server.url, capacity=0, cache=cache)
+    pool.slowTimeout = 0.2
+    results = []
+    started = time.perf_counter()
+    pool.request(lambda image, error: results.append((image, error)))
+    assert spin(0.8, lambda: results)
+    assert time.perf_counter() - started >= 0.2
+    assert pool.cacheHits == 1 and results[0][0] is not None
+
+
+def test_fixed_url_pool_does_not_prefetch(server, spin, monkeypatch):
+    # 固定地址每次返回同一张图，预取只会重复下载；只在有调用方取图时下载
+    monkeypatch.setattr(images, "_pools", {})
+    monkeypatch.setattr(images, "backgroundCache", lambda: None)
+    pool = imagePool(server.url)
+    assert imagePool(server.url) is pool
+    assert pool.capacity == 0
+    spin(0.3)
+    assert server.requests == 0
+
+    results = []
+    for _ in range(2):
+        pool.request(lambda image, error: results.append(image))
+        assert spin(2.0, lambda: len(results) == 1)
+        assert results.pop() is not None
+    spin(0.3)
+    assert server.requests == 2
+    assert len(pool) == 0
@@ -0,0 +1,29 @@
+from src.behavior.features import HAS_NUMPY
+from src.importcheck import checkImports, importProfile
+
+HEAVY = ("numpy", "PySide6.QtNetwork", "src.behavior.model")
+
+
+def test_no_import_regressions():
+    results, failures = checkImports()
+    assert not failures, "\n".join(failures)
+    assert all(result["seconds"] > 0 for result in results)
+
+
+def test_import_src_stays_light():
+    profile = importProfile("src")
+    assert "src" in profile
+    leaked = [
+        name
+        for name in profile
+        if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY)
+    ]
+    assert not leaked
+
+
+def test_leaks_are_reported():
+    # 检查本身要能发现多余导入：features 在有 numpy 时会导入它
+    if not HAS_NUMPY:
+        return
+    _, failures = checkImports((("src.behavior.features", ("numpy",)),))
+    assert failures and "numpy" in failures[0]
@@ -0,0 +1,147 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from src.behavior.features import TrackFeatures
+from src.behavior.model import (
+    DEFAULT_MODEL_FEATURES,
+    MODEL_VERSION,
+    LogisticModel,
+    TreeEnsembleModel,
+    fitLogistic,
+    loadModel,
+    saveModel,
+)
+from src.behavior.synthetic import GENERATORS
+
+
+def tracks(count=40):
+    rng = random.Random(13)
+    names = sorted(GENERATORS)
+    for i in range(count):
+        generator = GENERATORS[names[i % len(names)]]
+        xs, ys, ts = generator(rng.randint(15, 300), rng)
+        yield names[i % len(names)], list(xs), list(ys), list(ts)
+
+
+def padded(samples):
+    # 补齐成等长二维数组，末尾用最后一个采样点填充，填充部分不应影响结果
+    width = max(len(xs) for _, xs, _, _ in samples)
+    columns = ([], [], [])
+    for _, xs, ys, ts in samples:
+        for column, values in zip(columns, (xs, ys, ts)):
+            column.append(values + [values[-1]] * (width - len(values)))
+    lengths = [len(xs) for _, xs, _, _ in samples]
+    return [np.asarray(column) for column in columns] + [np.asarray(lengths)]
+
+
+@pytest.fixture(scope="module")
+def logistic():
+    samples = list(tracks())
+    matrix = [
+        [TrackFeatures(xs, ts, ys=ys)[name] for name in DEFAULT_MODEL_FEATURES]
+        for _, xs, ys, ts in samples
+    ]
+    labels = [name != "human" for name, _, _, _ in samples]
+    model = fitLogistic(matrix, labels, DEFAULT_MODEL_FEATURES, iterations=200)
+    model.threshold = 0.7
+    model.metadata = {"source": "测试"}
+    return model
+
+
+@pytest.fixture(scope="module")
+def trees():
+    features = ("speed_std", "total_time", "y_jitter")
+    return TreeEnsembleModel(
+        features,
+        [
+            {
+                "feature": [0, 1, -1, -1, -1],
+                "threshold": [40.0, 0.8, 0.0, 0.0, 0.0],
+                "left": [1, 3, -1, -1, -1],
+                "right": [2, 4, -1, -1, -1],
+                "value": [0.0, 0.0, -1.5, 2.0, 0.3],
+            },
+            {
+                "feature": [2, -1, -1],
+                "threshold": [0.5, 0.0, 0.0],
+                "left": [1, -1, -1],
+                "right": [2, -1, -1],
+                "value": [0.0, 1.2, -0.8],
+            },
+        ],
+        base=0.1,
+        threshold=0.6,
+    )
+
+
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+@pytest.mark.parametrize("kind", ["logistic", "trees"])
+def test_save_load_round_trip(request, tmp_path, suffix, kind):
+    model = request.getfixturevalue(kind)
+    path = str(tmp_path / f"model{suffix}")
+    saveModel(model, path)
+    loaded = loadModel(path)
+
+    assert type(loaded) is type(model)
+    assert loaded.features == model.features
+    assert loaded.threshold == model.threshold
+    assert loaded.metadata == model.metadata
+    assert loaded.parameters() == model.parameters()
+    for _, xs, ys, ts in tracks(10):
+        features = TrackFeatures(xs, ts, ys=ys)
+        assert loaded.score(features) == model.score(features)
+
+
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+def test_rejects_newer_version(logistic, tmp_path, suffix):
+    path = str(tmp_path / f"model{suffix}")
+    saveModel(logistic, path)
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        config["version"] = MODEL_VERSION + 1
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+    else:
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        config = json.loads(str(arrays.pop("config")))
+        config["version"] = MODEL_VERSION + 1
+        np.savez(path, config=np.asarray(json.dumps(config)), **arrays)
+    with pytest.raises(ValueError, match="不支持的模型版本"):
+        loadModel(path)
+
+
+def test_unknown_type_is_rejected(logistic, tmp_path):
+    path = str(tmp_path / "model.json")
+    saveModel(logistic, path)
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    config["type"] = "forest"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    with pytest.raises(ValueError, match="未知的模型类型"):
+        loadModel(path)
+
+
+@pytest.mark.parametrize("kind", ["logistic", "trees"])
+def test_score_batch_matches_score(request, kind):
+    model = request.getfixturevalue(kind)
+    samples = list(tracks())
+    xs, ys, ts, lengths = padded(samples)
+    batch = model.scoreBatch(xs, ts, lengths, ys)
+    single = [model.score(TrackFeatures(x, t, ys=y)) for _, x, y, t in samples]
+    assert batch.shape == (len(samples),)
+    assert batch.tolist() == pytest.approx(single, rel=1e-9, abs=1e-12)
+    # 两条路径的阈值判定一致，且样本确实覆盖了阈值两侧
+    flags = [p >= model.threshold for p in batch]
+    assert flags == [p >= model.threshold for p in single]
+    assert len(set(flags)) == 2
+
+
+def test_logistic_rejects_mismatched_parameters():
+    with pytest.raises(ValueError):
+        LogisticModel(("speed_std", "total_time"), [1.0])
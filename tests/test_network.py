@@ -0,0 +1,102 @@
+import os
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PySide6.QtNetwork import QSslCertificate, QSslConfiguration
+
+from src.components.network import SharedNetwork
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+CERT = os.path.join(DATA, "localhost.crt")
+KEY = os.path.join(DATA, "localhost.key")
+BODY = b"x" * 4096
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # 每条 TCP 连接调用一次
+        self.server.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    # 本地 HTTPS 替身：自签名证书，HTTP/1.1 keep-alive，统计建立的连接数
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.connections = 0
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(CERT, KEY)
+    httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def trusted(qapp):
+    default = QSslConfiguration.defaultConfiguration()
+    config = QSslConfiguration(default)
+    config.addCaCertificates(QSslCertificate.fromPath(CERT))
+    QSslConfiguration.setDefaultConfiguration(config)
+    yield
+    QSslConfiguration.setDefaultConfiguration(default)
+
+
+def fetch(network, spin, url):
+    results = []
+    network.get(url, lambda data, error: results.append((data, error)))
+    assert spin(5.0, until=lambda: results)
+    return results[0]
+
+
+@pytest.mark.parametrize("ioThread", [False, True])
+def test_sequential_gets_share_one_connection(server, trusted, spin, ioThread):
+    network = SharedNetwork(ioThread=ioThread)
+    url = f"https://127.0.0.1:{server.server_port}/image"
+    try:
+        for _ in range(5):
+            data, error = fetch(network, spin, url)
+            assert error == ""
+            assert data == BODY
+        assert network.requests == 5
+        assert network.handshakes == 1
+        assert server.connections == 1
+    finally:
+        network.shutdown()
+
+
+def test_preconnect_warms_connection_before_first_get(server, trusted, spin):
+    network = SharedNetwork()
+    port = server.server_port
+    network.preconnect(f"https://127.0.0.1:{port}")
+    assert spin(5.0, until=lambda: network.handshakes == 1)
+    # 服务端在握手完成后才在处理线程里计数
+    assert spin(1.0, until=lambda: server.connections == 1)
+    assert network.requests == 0
+
+    data, error = fetch(network, spin, f"https://127.0.0.1:{port}/image")
+    assert data == BODY
+    assert network.handshakes == 1
+    assert server.connections == 1
+
+
+def test_failed_get_reports_error(trusted, spin):
+    network = SharedNetwork()
+    data, error = fetch(network, spin, "https://127.0.0.1:1/image")
+    assert data is None
+    assert error
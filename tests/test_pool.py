@@ -0,0 +1,130 @@
+import pytest
+from PySide6.QtWidgets import QPushButton, QWidget
+
+import src
+
+
+@pytest.fixture
+def host(qapp, spin):
+    window = QWidget()
+    window.resize(600, 400)
+    button = QPushButton("打开", window)
+    window.show()
+    spin(0.05)
+    yield window, button
+    window.close()
+    window.deleteLater()
+
+
+@pytest.mark.parametrize(
+    "modes", [(False, True), (True, False, True), (False, True, False)]
+)
+def test_reuse_across_modes_still_closes(host, spin, modes):
+    window, button = host
+    pool = src.flyoutClass("iconClick").pool()
+    pool.clear()
+    spin(0.05)
+
+    for overlay in modes:
+        flyout = src.create(
+            "iconClick", target=button, parent=window, isOverlay=overlay
+        )
+        assert flyout.isOverlay == overlay
+        spin(0.3)
+        closed = []
+        flyout.closed.connect(lambda: closed.append(True))
+        flyout.close()
+        assert spin(1.0, until=lambda: not flyout.isVisible())
+        assert closed
+        assert any(f is flyout for f, _ in pool._idle)
+
+
+def test_reuse_keeps_mode(host, spin):
+    window, button = host
+    pool = src.flyoutClass("iconClick").pool()
+    pool.clear()
+    spin(0.05)
+
+    first = src.create("iconClick", target=button, parent=window, isOverlay=True)
+    spin(0.3)
+    first.close()
+    spin(0.1)
+    popup = src.create("iconClick", target=button, parent=window)
+    assert popup is not first
+    spin(0.3)
+    popup.close()
+    spin(0.1)
+    overlay = src.create("iconClick", target=button, parent=window, isOverlay=True)
+    assert overlay is first
+    overlay.close()
+    spin(0.1)
+
+
+@pytest.mark.parametrize("kind", sorted(src.KINDS))
+def test_release_resets_shared_state(host, spin, kind):
+    # 共用的淡出、success 断开逻辑在 PooledFlyout 中，各验证码只负责换题
+    from src.components.flyout import PooledFlyout
+
+    window, button = host
+    cls = src.flyoutClass(kind)
+    assert issubclass(cls, PooledFlyout)
+    pool = cls.pool()
+    pool.clear()
+    spin(0.05)
+
+    flyout = src.create(kind, target=button, parent=window)
+    spin(0.2)
+    resets = []
+    flyout.resetContent = lambda: resets.append(True)
+    successes = []
+    flyout.success.connect(lambda: successes.append(True))
+    flyout.closeWindow()
+    assert successes and flyout.fadeTimer.isActive()
+    flyout.close()
+    assert spin(1.0, until=lambda: any(f is flyout for f, _ in pool._idle))
+
+    assert resets
+    assert not flyout.fadeTimer.isActive()
+    assert flyout.getOpacity() == 1
+    flyout.success.emit()
+    assert len(successes) == 1
+
+
+def test_prewarmed_instances_are_reused_then_evicted(host, spin):
+    from src.components.pool import FlyoutPool
+
+    window, button = host
+    pool = FlyoutPool(src.flyoutClass("iconClick"), maxSize=1, idleTimeout=0.6)
+    pool.prewarm(3)
+    assert spin(3.0, until=lambda: len(pool) == 3)
+    assert pool.created == 3 and pool.maxSize == 1
+    warmed = [flyout for flyout, _ in pool._idle]
+
+    # 高峰期取出的预热实例都能放回池中，不会因为超过 maxSize 被销毁
+    flyouts = [pool.acquire(window) for _ in range(3)]
+    assert pool.reused == 3 and pool.created == 3
+    assert {id(f) for f in flyouts} == {id(f) for f in warmed}
+    for flyout in flyouts:
+        pool.release(flyout)
+    assert len(pool) == 3 and pool.evicted == 0
+
+    # 闲置超时后全部回收，之后池的上限恢复为 maxSize
+    assert spin(3.0, until=lambda: len(pool) == 0)
+    assert pool.evicted == 3
+    assert not pool.evictTimer.isActive()
+    flyouts = [pool.acquire(window) for _ in range(2)]
+    for flyout in flyouts:
+        pool.release(flyout)
+    assert len(pool) == 1 and pool.evicted == 4
+    pool.clear()
+
+
+def test_unused_prewarmed_instances_are_evicted(qapp, spin):
+    from src.components.pool import FlyoutPool
+
+    pool = FlyoutPool(src.flyoutClass("iconClick"), idleTimeout=0.4)
+    pool.prewarm(2)
+    assert spin(3.0, until=lambda: len(pool) == 2)
+    assert pool.evictTimer.isActive()
+    assert spin(3.0, until=lambda: len(pool) == 0)
+    assert pool.evicted == 2
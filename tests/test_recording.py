@@ -0,0 +1,145 @@
+import os
+import random
+from math import hypot
+
+import pytest
+
+from src.behavior.recording import (
+    HEADER,
+    TrackReader,
+    TrackRecorder,
+    TrackWriter,
+    simplifyTrack,
+)
+
+
+def randomTrack(rng, n, withY=True):
+    xs, ys, ts = [], [], []
+    x = y = t = 0.0
+    for _ in range(n):
+        t += rng.uniform(0.001, 0.03)
+        x += rng.uniform(-1, 6)
+        y += rng.gauss(0, 0.8)
+        xs.append(x)
+        ys.append(y)
+        ts.append(1000.0 + t)
+    return xs, (ys if withY else None), ts
+
+
+def assertClose(actual, expected, tolerance):
+    assert len(actual) == len(expected)
+    assert all(abs(a - b) <= tolerance for a, b in zip(actual, expected))
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "drags.vtrk")
+    rng = random.Random(1)
+    tracks = [
+        (randomTrack(rng, 50), True, []),
+        (randomTrack(rng, 200, withY=False), False, ["速度变化异常", "轨迹异常"]),
+        (([], None, []), False, ["滑动轨迹过短"]),
+        (randomTrack(rng, 1), True, []),
+    ]
+    with TrackWriter(path) as writer:
+        for (xs, ys, ts), result, msg in tracks:
+            writer.write(xs, ys, ts, result, msg)
+
+    with TrackReader(path) as reader:
+        assert len(reader) == len(tracks)
+        for record, ((xs, ys, ts), result, msg) in zip(reader, tracks):
+            assert record.result == result and record.msg == msg
+            # 默认量化到 0.01 像素、1 微秒
+            assertClose(record.xs, xs, 0.005 + 1e-9)
+            assertClose(record.ts, ts, 0.5e-6 + 1e-9)
+            if ys is None:
+                assert record.ys is None
+            else:
+                assertClose(record.ys, ys, 0.005 + 1e-9)
+
+
+def test_append_keeps_existing_records(tmp_path):
+    path = str(tmp_path / "drags.vtrk")
+    rng = random.Random(2)
+    first, second = randomTrack(rng, 30), randomTrack(rng, 40)
+    with TrackWriter(path) as writer:
+        writer.write(*first, True)
+    with TrackWriter(path) as writer:
+        writer.write(*second, False, ["回退滑动异常"])
+    with TrackReader(path) as reader:
+        assert [len(record.xs) for record in reader] == [30, 40]
+        assert reader[1].msg == ["回退滑动异常"]
+
+
+def test_rebuilds_index_without_footer(tmp_path):
+    # 写入进程没有 close() 就退出：文件头里没有索引位置，最后一条记录只写了一半
+    path = str(tmp_path / "drags.vtrk")
+    rng = random.Random(3)
+    tracks = [randomTrack(rng, n) for n in (20, 35, 50)]
+    writer = TrackWriter(path)
+    for xs, ys, ts in tracks:
+        writer.write(xs, ys, ts, True)
+    writer.flush()
+    size = os.path.getsize(path)
+    writer.file.close()
+    with open(path, "r+b") as f:
+        f.truncate(size - 10)
+
+    with TrackReader(path) as reader:
+        assert len(reader) == 2
+        assert reader.dataEnd > HEADER.size
+        for record, (xs, _, _) in zip(reader, tracks):
+            assertClose(record.xs, xs, 0.005 + 1e-9)
+
+    # 重新打开写入时从完整记录之后继续，并补上索引
+    with TrackWriter(path) as writer:
+        writer.write(*tracks[2], False)
+    with TrackReader(path) as reader:
+        assert [len(record.xs) for record in reader] == [20, 35, 50]
+
+
+def sed(xs, ys, ts, i, first, last):
+    duration = ts[last] - ts[first]
+    ratio = (ts[i] - ts[first]) / duration if duration > 0 else 0
+    dx = xs[i] - xs[first] - (xs[last] - xs[first]) * ratio
+    if ys is None:
+        return abs(dx)
+    return hypot(dx, ys[i] - ys[first] - (ys[last] - ys[first]) * ratio)
+
+
+@pytest.mark.parametrize("withY", [True, False])
+@pytest.mark.parametrize("epsilon", [0.1, 0.5, 2.0, 10.0])
+def test_simplify_tolerance(withY, epsilon):
+    rng = random.Random(4)
+    for n in (3, 10, 300):
+        xs, ys, ts = randomTrack(rng, n, withY)
+        keep = simplifyTrack(xs, ys, ts, epsilon)
+        assert keep[0] == 0 and keep[-1] == n - 1
+        assert keep == sorted(set(keep))
+        # 每个被删掉的采样点与所在简化线段在同一时刻的插值位置相差不超过 epsilon
+        for first, last in zip(keep, keep[1:]):
+            for i in range(first + 1, last):
+                assert sed(xs, ys, ts, i, first, last) <= epsilon
+
+
+def test_simplify_extremes():
+    xs = [float(i) for i in range(20)]
+    ts = [i * 0.01 for i in range(20)]
+    assert simplifyTrack(xs, None, ts, 0.01) == [0, 19]
+    rng = random.Random(5)
+    xs, ys, ts = randomTrack(rng, 50)
+    assert simplifyTrack(xs, ys, ts, 1e6) == [0, 49]
+    assert simplifyTrack(xs, ys, ts, 0.0) == list(range(50))
+
+
+def test_recorder_simplifies_in_background(tmp_path):
+    path = str(tmp_path / "drags.vtrk")
+    rng = random.Random(6)
+    xs, ys, ts = randomTrack(rng, 300)
+    recorder = TrackRecorder(path, simplifyEpsilon=1.0)
+    recorder.record(xs, ys, ts, True)
+    recorder.close()
+    with TrackReader(path) as reader:
+        record = reader[0]
+    keep = simplifyTrack(xs, ys, ts, 1.0)
+    assert len(record.xs) == len(keep) < len(xs)
+    assertClose(record.xs, [xs[i] for i in keep], 0.005 + 1e-9)
@@ -0,0 +1,137 @@
+import pytest
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QMouseEvent
+from PySide6.QtWidgets import QApplication
+
+from src.behavior.analyzer import DEFAULT_PIPELINE, Stage
+from src.behavior.verdict import Verdict
+from src.components.slider import VerificationSlider
+
+
+def send(slider, kind, x, timestamp):
+    button = Qt.MouseButton.LeftButton
+    buttons = Qt.MouseButton.NoButton if kind == QEvent.MouseButtonRelease else button
+    position = QPointF(x, 16)
+    event = QMouseEvent(
+        kind,
+        position,
+        slider.mapToGlobal(position),
+        button,
+        buttons,
+        Qt.KeyboardModifier.NoModifier,
+    )
+    event.setTimestamp(timestamp)
+    QApplication.sendEvent(slider, event)
+    return event
+
+
+def drag(slider, steps, start=1000, xs=None):
+    # 从滑块起点按住，每 20 毫秒右移一步后松开；返回松开事件
+    xs = xs or [17 + 6 * i for i in range(1, steps + 1)]
+    send(slider, QEvent.MouseButtonPress, 17, start)
+    for i, x in enumerate(xs, 1):
+        send(slider, QEvent.MouseMove, x, start + 20 * i)
+    return send(slider, QEvent.MouseButtonRelease, xs[-1], start + 20 * len(xs) + 20)
+
+
+@pytest.fixture
+def slider(qapp):
+    slider = VerificationSlider()
+    slider.show()
+    yield slider
+    slider.close()
+    slider.deleteLater()
+
+
+def test_result_signal_keeps_dict_contract(slider):
+    results, verdicts = [], []
+    slider.resultSignal.connect(results.append)
+    slider.verdictSignal.connect(verdicts.append)
+    drag(slider, 5)
+    assert len(results) == len(verdicts) == 1
+    result = results[0]
+    assert isinstance(result, dict)
+    assert result == {**verdicts[0].asDict()}
+    assert result["msg"] == ["滑动轨迹过短"] and result["result"] is False
+    # 调用方可以随意修改收到的字典，不影响滑块保存的判定结果
+    result["msg"].append("调用方追加")
+    result["result"] = True
+    assert isinstance(slider.verdict, Verdict)
+    assert slider.verdict.msg == ("滑动轨迹过短",)
+
+
+def test_release_always_reaches_base_handler(slider):
+    # QWidget 的默认处理会忽略事件；中止、正常判定和忙碌时都应交给基类
+    slider.streamingAnalysis = True
+    steps = [17 + 6 * i for i in range(1, 20)] + [40]
+    event = drag(slider, 0, xs=steps)
+    assert slider.verdict.msg == ("回退滑动异常",)
+    assert not event.isAccepted()
+
+    slider.reset()
+    slider.streamingAnalysis = False
+    event = drag(slider, 20, start=5000)
+    assert not event.isAccepted()
+
+    slider.isPending = True
+    event = send(slider, QEvent.MouseButtonRelease, 40, 9000)
+    assert not event.isAccepted()
+
+
+def test_stale_async_verdict_is_dropped(slider, spin):
+    # 第一次拖动的分析结果送回界面线程之前就换题并再拖一次，只有第二次的结果被采用
+    analyzed = []
+
+    def probe(f):
+        analyzed.append(len(f.xs))
+        return f"样本 {len(f.xs)}"
+
+    pipeline = DEFAULT_PIPELINE.copy()
+    pipeline.register(Stage("probe", probe, cost=0))
+    slider.pipeline = pipeline
+    slider.asyncAnalysis = True
+    verdicts = []
+    slider.verdictSignal.connect(verdicts.append)
+
+    drag(slider, 19)
+    assert slider.isPending
+    slider.reset()
+    drag(slider, 24, start=5000)
+    assert spin(3.0, until=lambda: len(analyzed) == 2 and verdicts)
+    spin(0.3)
+
+    assert analyzed == [20, 25]
+    assert len(verdicts) == 1
+    assert "样本 25" in verdicts[0].msg
+    assert slider.verdict is verdicts[0]
+    assert not slider.isPending
+
+
+def test_recorder_round_trip(slider, tmp_path):
+    from src.behavior.recording import TrackReader, TrackRecorder
+
+    # 拖动时参与判定的轨迹原样（在量化精度内）写入记录文件
+    analyzed = []
+
+    def probe(f):
+        analyzed.append((list(f.xs), list(f.ys), list(f.ts)))
+
+    pipeline = DEFAULT_PIPELINE.copy()
+    pipeline.register(Stage("probe", probe, cost=0))
+    slider.pipeline = pipeline
+    path = str(tmp_path / "drags.vtrk")
+    recorder = TrackRecorder(path)
+    slider.setRecorder(recorder)
+    drag(slider, 30)
+    recorder.close()
+
+    with TrackReader(path) as reader:
+        assert len(reader) == 1
+        record = reader[0]
+    (xs, ys, ts), = analyzed
+    assert len(record.xs) == len(xs) == 31
+    assert all(abs(a - b) <= 0.005 + 1e-9 for a, b in zip(record.xs, xs))
+    assert all(abs(a - b) <= 0.005 + 1e-9 for a, b in zip(record.ys, ys))
+    assert all(abs(a - b) <= 0.5e-6 + 1e-9 for a, b in zip(record.ts, ts))
+    assert record.result == slider.verdict.result
+    assert record.msg == list(slider.verdict.msg)
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from src.behavior.analyzer import analyzeTrack, buildPipeline
+from src.behavior.features import PUBLIC_FEATURES, TrackFeatures
+from src.behavior.model import DEFAULT_MODEL_FEATURES
+from src.behavior.streaming import StreamingAnalyzer
+from src.behavior.synthetic import GENERATORS
+from src.behavior.thresholds import saveThresholds
+
+
+def jerkyTrack(rng, n=200, dt=0.01):
+    # 忽快忽慢的拖动，速度突变远多于默认的 2 次
+    xs, ts = [0.0], [0.0]
+    for i in range(1, n):
+        xs.append(xs[-1] + (rng.uniform(6, 10) if i % 5 == 0 else rng.uniform(0, 1)))
+        ts.append(i * dt)
+    return xs, ts
+
+
+def stream(analyzer, xs, ts, ys=None):
+    ys = ys if ys is not None else [None] * len(xs)
+    reasons = [analyzer.push(x, t, y) for x, t, y in zip(xs, ts, ys)]
+    return analyzer.features(), next((r for r in reasons if r), None)
+
+
+def tracks():
+    rng = random.Random(9)
+    for name, generator in sorted(GENERATORS.items()):
+        for n in (15, 80, 400):
+            xs, ys, ts = generator(n, rng)
+            yield name, list(xs), list(ys), list(ts)
+    xs, ts = jerkyTrack(rng)
+    yield "jerky", xs, [16.0] * len(xs), ts
+
+
+@pytest.mark.parametrize("name, xs, ys, ts", list(tracks()))
+def test_streamed_features_match_batch(name, xs, ys, ts):
+    # 规则和模型用到的每个特征，带上流式结果后的取值都与纯批量计算一致
+    streamed, _ = stream(StreamingAnalyzer(), xs, ts, ys)
+    merged = TrackFeatures(xs, ts, ys=ys, values=streamed)
+    batch = TrackFeatures(xs, ts, ys=ys)
+    for feature in set(PUBLIC_FEATURES) | set(DEFAULT_MODEL_FEATURES):
+        assert merged[feature] == pytest.approx(
+            batch[feature], rel=1e-9, abs=1e-9
+        ), feature
+
+
+def test_streamed_verdicts_match_batch():
+    pipeline = buildPipeline({"abrupt_min": 6})
+    for _, xs, ys, ts in tracks():
+        streamed, _ = stream(StreamingAnalyzer(), xs, ts, ys)
+        batch = analyzeTrack(xs, ts, ys=ys, pipeline=pipeline)
+        merged = analyzeTrack(xs, ts, ys=ys, features=streamed, pipeline=pipeline)
+        assert merged["result"] == batch["result"]
+        assert merged["failures"] == batch["failures"]
+
+
+def test_abort_uses_max_time():
+    xs = [float(i) for i in range(100)]
+    ts = [i * 0.07 for i in range(100)]
+    _, reason = stream(StreamingAnalyzer(), xs, ts)
+    assert reason == "滑动时间异常"
+    _, reason = stream(StreamingAnalyzer({"max_time": 8.0}), xs, ts)
+    assert reason is None
+
+
+def test_slider_streams_with_loaded_thresholds(qapp, tmp_path):
+    from src.components.slider import VerificationSlider
+
+    path = str(tmp_path / "thresholds.json")
+    saveThresholds({"max_time": 8.0, "abrupt_min": 5}, path)
+    slider = VerificationSlider()
+    slider.loadThresholds(path)
+    assert slider.streamAnalyzer.maxDuration == 8.0
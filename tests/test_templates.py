@@ -0,0 +1,94 @@
+import random
+from math import sqrt
+
+import pytest
+
+from src.behavior import templates
+from src.behavior.synthetic import minimumJerkHuman, randomProfile, replayBot
+from src.behavior.templates import (
+    DEFAULT_MAX_DISTANCE,
+    TemplateLibrary,
+    dtwDistance,
+    normalizeTrack,
+)
+
+BACKENDS = [False] + ([True] if templates.HAS_NUMPY else [])
+
+
+def bruteForce(library, series, maxDistance):
+    # 不做任何剪枝，对每个模板完整计算带约束 DTW
+    distances = [
+        dtwDistance(series, template, library.radius) for template in library.series
+    ]
+    index = min(range(len(distances)), key=distances.__getitem__)
+    distance = sqrt(distances[index] / library.length)
+    return (index, distance) if distance <= maxDistance else None
+
+
+@pytest.fixture(scope="module")
+def library():
+    # 模板数超过 CLUSTER_MIN_TEMPLATES，向量化路径会分簇建索引；
+    # 每条进度曲线重放多次，查询附近有多个距离相近的候选，剪枝出错时最近模板会变
+    rng = random.Random(7)
+    library = TemplateLibrary()
+    for profile in PROFILES:
+        for _ in range(5):
+            xs, _, ts = replayBot(120, rng, profile=profile, noise=1.0)
+            library.add(xs, ts)
+    return library
+
+
+PROFILES = [randomProfile(random.Random(seed)) for seed in range(40)]
+
+
+def queries():
+    rng = random.Random(11)
+    tracks = []
+    for i in range(60):
+        if i % 3 == 0:
+            xs, _, ts = minimumJerkHuman(150, rng)
+        else:
+            xs, _, ts = replayBot(150, rng, profile=rng.choice(PROFILES))
+        tracks.append(normalizeTrack(xs, ts))
+    return tracks
+
+
+@pytest.mark.parametrize("indexed", BACKENDS)
+@pytest.mark.parametrize("maxDistance", [DEFAULT_MAX_DISTANCE, 0.02, 1.0])
+def test_nearest_matches_brute_force(library, monkeypatch, indexed, maxDistance):
+    monkeypatch.setattr(templates, "HAS_NUMPY", indexed)
+    matched = 0
+    for series in queries():
+        expected = bruteForce(library, series, maxDistance)
+        match = library.nearest(series, maxDistance)
+        if expected is None:
+            assert match is None
+            continue
+        assert match is not None
+        assert match.index == expected[0]
+        assert match.distance == pytest.approx(expected[1], rel=1e-9)
+        matched += 1
+    if maxDistance == 1.0:
+        assert matched == 60
+
+
+def test_replays_match_their_template():
+    rng = random.Random(3)
+    profiles = [randomProfile(rng) for _ in range(50)]
+    library = TemplateLibrary()
+    for profile in profiles:
+        xs, _, ts = replayBot(120, rng, profile=profile, noise=0.3)
+        library.add(xs, ts)
+    hits = 0
+    for i, profile in enumerate(profiles):
+        xs, _, ts = replayBot(150, rng, distance=rng.uniform(100, 250), profile=profile)
+        match = library.match(xs, ts)
+        hits += match is not None and match.index == i
+    assert hits >= 0.6 * len(profiles)
+
+
+def test_humans_do_not_match_at_default_distance(library):
+    rng = random.Random(5)
+    for _ in range(100):
+        xs, _, ts = minimumJerkHuman(150, rng)
+        assert library.match(xs, ts) is None
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from src.behavior.features import TrackFeatures
+from src.behavior.synthetic import minimumJerkHuman
+from src.behavior.track import TrackBuffer
+
+
+def fill(buffer, xs, ys, ts):
+    for x, y, t in zip(xs, ys, ts):
+        buffer.append(x, y, t)
+    return buffer
+
+
+def expectedIndices(n, stride):
+    # 保留全局下标为步长整数倍的采样，终点不在步长上时额外保留
+    keep = list(range(0, n, stride))
+    if keep[-1] != n - 1:
+        keep.append(n - 1)
+    return keep
+
+
+@pytest.mark.parametrize(
+    "n, stride",
+    [(4096, 1), (4097, 2), (8191, 2), (8192, 4), (8193, 4), (20000, 8), (50001, 16)],
+)
+def test_downsample_keeps_stride_multiples(n, stride):
+    xs = [float(i) for i in range(n)]
+    ts = [i * 0.001 for i in range(n)]
+    ys = [16.0 + (i % 3) for i in range(n)]
+    buffer = fill(TrackBuffer(), xs, ys, ts)
+
+    assert len(buffer) <= buffer.capacity
+    assert buffer.stride == stride
+    keep = expectedIndices(n, stride)
+    assert list(buffer.xs) == [xs[i] for i in keep]
+    assert list(buffer.ys) == [ys[i] for i in keep]
+    assert list(buffer.ts) == [ts[i] for i in keep]
+    # 起点和终点始终保留
+    assert buffer[0] == (xs[0], ys[0], ts[0])
+    assert buffer[-1] == (xs[-1], ys[-1], ts[-1])
+
+
+def test_downsample_is_deterministic():
+    rng = random.Random(2)
+    xs, ys, ts = minimumJerkHuman(12000, rng)
+    first = fill(TrackBuffer(), xs, ys, ts)
+    second = TrackBuffer()
+    # 复用的缓冲区 clear() 之后与新建的结果一致
+    fill(second, [0.0] * 9000, [0.0] * 9000, [0.0] * 9000)
+    second.clear()
+    assert second.stride == 1
+    fill(second, xs, ys, ts)
+
+    assert first.stride == second.stride == 4
+    assert first.snapshot() == second.snapshot()
+
+
+def test_every_prefix_stays_within_capacity():
+    buffer = TrackBuffer(capacity=16)
+    for i in range(1000):
+        buffer.append(float(i), 0.0, float(i))
+        assert len(buffer) <= 16
+        assert buffer[0][0] == 0.0 and buffer[-1][0] == float(i)
+        keep = expectedIndices(i + 1, buffer.stride)
+        assert list(buffer.xs) == [float(j) for j in keep]
+
+
+def test_features_survive_downsampling():
+    rng = random.Random(3)
+    xs, ys, ts = minimumJerkHuman(10000, rng)
+    buffer = fill(TrackBuffer(), xs, ys, ts)
+    assert buffer.stride > 1
+    full = TrackFeatures(list(xs), list(ts), ys=list(ys))
+    reduced = TrackFeatures(list(buffer.xs), list(buffer.ts), ys=list(buffer.ys))
+
+    # 只由端点或单调性决定的特征完全不变
+    for name in ("total_time", "total_distance", "backward_moves"):
+        assert reduced[name] == pytest.approx(full[name], rel=1e-12), name
+    # 描述轨迹形状的特征在降采样后基本不变
+    assert reduced["avg_deviation"] == pytest.approx(full["avg_deviation"], rel=0.01)
+    assert reduced["y_jitter"] == pytest.approx(full["y_jitter"], rel=0.05)
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_train_cli_runs_without_runpy_warning():
+    # 包的 __init__ 会导入 model；训练入口在单独的模块里，python -m 时不应重复导入
+    result = subprocess.run(
+        [sys.executable, "-W", "error::RuntimeWarning"]
+        + ["-m", "src.behavior.train", "-h"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "RuntimeWarning" not in result.stderr
+    assert "python -m src.behavior.train" in result.stdout